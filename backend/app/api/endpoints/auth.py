@@ -1,10 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
-from ...db.base import get_db
+from ...db.base import get_async_db
 from ...db.models import User
-from ...core.security import get_password_hash, verify_password, create_access_token, SECRET_KEY, ALGORITHM
+from ...services.principal_cache import principal_cache
+from ...core.security import HasherBusy, password_hasher, create_access_token, SECRET_KEY, ALGORITHM
 from jose import JWTError, jwt
 import uuid
 
@@ -27,13 +29,16 @@ class Token(BaseModel):
     token_type: str
     user: dict
 
-# Dependency to get current user
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def resolve_user(token: str, db: AsyncSession) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    user = principal_cache.get(token)
+    if user is not None:
+        return user
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -41,64 +46,88 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-        
-    user = db.query(User).filter(User.email == email).first()
+
+    generation = principal_cache.generation
+    result = await db.execute(select(User).where(User.email == email).limit(1))
+    user = result.scalars().first()
     if user is None:
         raise credentials_exception
+    principal_cache.put(token, user, payload.get("exp"), generation)
     return user
 
+# Dependency to get current user
+# Served from the principal cache; a miss goes through the async session.
+# Every route using it only needs the caller's id (never changes) and
+# profile fields, which may lag another worker's update by the cache TTL.
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    return await resolve_user(token, db)
+
+def hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts in progress, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+def token_response(user: User) -> dict:
+    access_token = create_access_token(data={"sub": user.email})
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user": {
+            "email": user.email,
+            "name": user.full_name,
+            "id": user.id
+        }
+    }
+
+# Hashing runs on password_hasher's pool, so these stay off the event loop
 @router.post("/register", response_model=Token)
-def register(user_in: UserRegister, db: Session = Depends(get_db)):
+async def register(user_in: UserRegister, db: AsyncSession = Depends(get_async_db)):
     # Check if user exists
-    existing_user = db.query(User).filter(User.email == user_in.email).first()
-    if existing_user:
+    result = await db.execute(select(User.id).where(User.email == user_in.email).limit(1))
+    if result.first() is not None:
         raise HTTPException(status_code=400, detail="Email already registered")
     
+    try:
+        hashed_password = await password_hasher.hash(user_in.password)
+    except HasherBusy:
+        raise hasher_busy()
+
     # Create new user
     user = User(
         id=str(uuid.uuid4()),
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         full_name=user_in.full_name,
         is_verified=False
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
-    
-    # Create Token
-    access_token = create_access_token(data={"sub": user.email})
+    await db.commit()
+    await db.refresh(user)
     
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-        "user": {
-            "email": user.email,
-            "name": user.full_name,
-            "id": user.id
-        }
-    }
+    return token_response(user)
 
 @router.post("/login", response_model=Token)
-def login(user_in: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_in.email).first()
+async def login(user_in: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(User).where(User.email == user_in.email).limit(1))
+    user = result.scalars().first()
     if not user or not user.hashed_password:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
         
-    if not verify_password(user_in.password, user.hashed_password):
+    try:
+        valid, new_hash = await password_hasher.verify_and_update(user_in.password, user.hashed_password)
+    except HasherBusy:
+        raise hasher_busy()
+    if not valid:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
+
+    # Stored with an outdated cost factor (BCRYPT_ROUNDS changed): upgrade it
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
     
-    access_token = create_access_token(data={"sub": user.email})
-    
-    return {
-        "access_token": access_token,
-        "token_type": "bearer",
-        "user": {
-            "email": user.email,
-            "name": user.full_name,
-            "id": user.id
-        }
-    }
+    return token_response(user)
     
 @router.get("/me")
 def read_users_me(current_user: User = Depends(get_current_user)):
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session, joinedload
 from typing import List
 from pydantic import BaseModel
 from ...db.base import get_db
 from ...db.models import Favorite, Property, User
+from ...services.insights import INSIGHT_FIELDS, attach_insights
+from ...services.response_cache import cached_json, favorites_tag, property_tag, response_cache
 import uuid
 
 router = APIRouter()
@@ -48,6 +50,7 @@ def add_favorite(fav: FavoriteCreate, db: Session = Depends(get_db)):
     db.add(favorite)
     db.commit()
     db.refresh(favorite)
+    response_cache.invalidate(favorites_tag(fav.user_email))
     return favorite
 
 @router.delete("/remove/{property_id}")
@@ -67,32 +70,48 @@ def remove_favorite(property_id: str, user_email: str, db: Session = Depends(get
     
     db.delete(favorite)
     db.commit()
+    response_cache.invalidate(favorites_tag(user_email))
     return {"message": "Removed from favorites"}
 
 @router.get("/list", response_model=List[dict])
-def get_favorites(user_email: str, db: Session = Depends(get_db)):
-    """Get all favorite properties for user"""
+def get_favorites(user_email: str, request: Request, db: Session = Depends(get_db)):
+    """Get all favorite properties for user (cached until they change)"""
+    def tags(content):
+        return [favorites_tag(user_email)] + [property_tag(p["id"]) for p in content]
+
+    return cached_json(request, tags, lambda: (load_favorites(db, user_email), None))
+
+def load_favorites(db: Session, user_email: str) -> List[dict]:
     user = db.query(User).filter(User.email == user_email).first()
     if not user:
         return []
     
-    favorites = db.query(Favorite).filter(Favorite.user_id == user.id).all()
+    # Single join instead of one lookup per favorite
+    props = (
+        db.query(Property)
+        .options(joinedload(Property.insights))
+        .join(Favorite, Favorite.property_id == Property.id)
+        .filter(Favorite.user_id == user.id)
+        .all()
+    )
+    
+    attach_insights(props)
     
     # Get full property details
     properties = []
-    for fav in favorites:
-        prop = db.query(Property).filter(Property.id == fav.property_id).first()
-        if prop:
-            properties.append({
-                "id": prop.id,
-                "title": prop.title,
-                "price_fiat": prop.price_fiat,
-                "property_type": prop.property_type,
-                "image_urls": prop.image_urls,
-                "latitude": prop.latitude,
-                "longitude": prop.longitude,
-                "area": prop.area,
-                "area_unit": prop.area_unit
-            })
+    for prop in props:
+        item = {
+            "id": prop.id,
+            "title": prop.title,
+            "price_fiat": prop.price_fiat,
+            "property_type": prop.property_type,
+            "image_urls": prop.image_urls,
+            "latitude": prop.latitude,
+            "longitude": prop.longitude,
+            "area": prop.area,
+            "area_unit": prop.area_unit
+        }
+        item.update({field: getattr(prop, field) for field in INSIGHT_FIELDS})
+        properties.append(item)
     
     return properties
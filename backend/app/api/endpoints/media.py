@@ -0,0 +1,30 @@
+import os
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from ...core.config import settings
+from ...services.storage import LocalStorage
+
+router = APIRouter()
+
+media_storage = LocalStorage(settings.MEDIA_ROOT)
+
+@router.get("/{key:path}")
+def get_media(key: str, request: Request):
+    """
+    Serves images stored by the local storage backend. Keys are content
+    hashes, so responses are cacheable forever; Range requests are supported.
+    """
+    path = media_storage.path_for(key)
+    if path is None or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Not found")
+
+    etag = '"' + os.path.splitext(os.path.basename(key))[0] + '"'
+    headers = {
+        "Cache-Control": f"public, max-age={settings.MEDIA_MAX_AGE_SECONDS}, immutable",
+        "ETag": etag,
+    }
+    if request.headers.get("if-none-match") in (etag, "*"):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, headers=headers)
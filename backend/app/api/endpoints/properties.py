@@ -1,9 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, joinedload
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+from types import SimpleNamespace
 from pydantic import BaseModel
-from ...db.base import get_db
-from ...db.models import Property, User, VerificationStatus
+import base64
+import json
+from ...db.base import engine, get_db
+from ...db.models import Property, PropertyInsights, User, VerificationStatus
+from ...services import listing_events
+from ...services.bulk_import import import_format, import_listings
+from ...services.clusters import cluster_index
+from ...services.export import export_lines, gzip_chunks
+from ...services.facets import FacetFilters, facet_counts, filter_properties
+from ...services.geo_index import geo_index
+from ...services.response_cache import LIST_TAG, cached_json, property_tag
+from ...services.search import search_property_ids
+from ...services.serialization import FastJSONResponse, Projection, dumps
+from ...services.similarity import similarity_index
+from ...services.tile_cache import MAX_TILE_ZOOM, tile_cache
+from ...services.uploads import receive_upload
+from ...core.config import settings
+from ...services.insights import INSIGHT_FIELDS, attach_insights
 import uuid
 
 router = APIRouter()
@@ -82,10 +102,37 @@ class PropertyResponse(BaseModel):
     # Universal Tier Features
     is_blockchain_verified: Optional[bool] = False
     contract_address: Optional[str] = None
+
+    # Only set by /nearby
+    distance_km: Optional[float] = None
     
     class Config:
         orm_mode = True
 
+class PropertyCard(BaseModel):
+    """List-view card (?fields=card): the preset's fields and, in the OpenAPI schema, their types. Rows are projected, not validated against it"""
+    id: str
+    title: str
+    property_type: Optional[str] = None
+    price_fiat: float
+    area: Optional[float] = None
+    area_unit: Optional[str] = None
+    latitude: float
+    longitude: float
+    image_urls: Optional[List[str]] = None
+    status: VerificationStatus
+    owner_name: Optional[str] = None
+    owner_is_verified: Optional[bool] = False
+    ai_valuation_verdict: Optional[str] = "Unknown"
+
+    class Config:
+        orm_mode = True
+
+class FacetedResponse(BaseModel):
+    total: int
+    results: List[PropertyResponse]
+    facets: dict
+
 from .auth import get_current_user # Import dependency
 
 @router.post("/", response_model=PropertyResponse)
@@ -106,8 +153,10 @@ def create_property(prop: PropertyCreate, current_user: User = Depends(get_curre
         status=VerificationStatus.PENDING
     )
     db.add(db_prop)
+    listing_events.record_change(db, "created", db_prop)
     db.commit()
     db.refresh(db_prop)
+    listing_events.property_created(db_prop)
     
     # Manually populate owner fields for response
     response_obj = db_prop
@@ -119,120 +168,359 @@ def create_property(prop: PropertyCreate, current_user: User = Depends(get_curre
 
     return response_obj
 
+@router.post("/import")
+async def import_properties(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Default: from the file name"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Bulk-creates listings owned by the caller from an uploaded CSV or NDJSON
+    file (multipart 'file'; columns/keys as in POST /properties/).
+    Returns counts and per-row errors; invalid rows are skipped.
+    """
+    upload = await receive_upload(request, max_bytes=settings.IMPORT_MAX_BYTES)
+    try:
+        return await run_in_threadpool(
+            import_listings, engine, upload.open(), format or import_format(upload.filename),
+            current_user.id, PropertyCreate
+        )
+    finally:
+        upload.close()
+
 
 def calculate_ai_insights(prop: Property):
-    # Mock AI Logic
-    base_price = prop.price_fiat
-    # Deterministic randomness based on ID
-    seed = abs(hash(prop.id)) % 100
-    
-    # 1. Valuation
-    prop.ai_valuation_min = base_price * 0.9
-    prop.ai_valuation_max = base_price * 1.15
-    
-    if prop.price_fiat < prop.ai_valuation_min:
-        prop.ai_valuation_verdict = "Underpriced (Steal!)"
-    elif prop.price_fiat > prop.ai_valuation_max:
-        prop.ai_valuation_verdict = "Overpriced"
-    else:
-        prop.ai_valuation_verdict = "Fair Market Price"
-        
-    # 2. Investment Score (0-10)
-    score = 7.0
-    if prop.property_type in ["Commercial", "Plot"]:
-        score += 1.5
-    if prop.price_fiat < 5000000:
-        score += 1.0
-    prop.investment_score = min(score, 10.0)
-
-    # 3. Neighborhood Stats
-    prop.walk_score = 60 + (seed % 40)
-    prop.safety_index = 7 + (seed % 3)
-    prop.nearby_schools = 2 + (seed % 4)
-    prop.nearby_hospitals = 1 + (seed % 3)
-    prop.nearby_parks = 1 + (seed % 5)
-
-    # 4. Price History
-    y3 = base_price * 0.85
-    y2 = base_price * 0.92
-    y1 = base_price
-    prop.price_history = [
-        {"year": 2023, "price": int(y3)},
-        {"year": 2024, "price": int(y2)},
-        {"year": 2025, "price": int(y1)}
-    ]
-
-    # 5. Infinity Features
-    prop.is_360_ready = base_price > 5000000
-
-    if prop.property_type == "Commercial" and base_price > 10000000:
-        prop.is_fractional = True
-        prop.token_price = 5000
-        prop.total_tokens = int(base_price / 5000)
-        prop.sold_tokens = int(prop.total_tokens * ((seed % 80) / 100))
-        prop.yield_rate = 8.5 + (seed % 40) / 10.0
-
-    if seed % 5 == 0: 
-        prop.is_auction = True
-        prop.current_bid = base_price * 1.05
-        prop.total_bids = 12 + (seed % 20)
-        from datetime import datetime, timedelta
-        prop.auction_end_time = (datetime.utcnow() + timedelta(hours=24)).isoformat()
-
-    # 6. Galactic Features
-    directions = ["North", "North-East", "East", "South-East", "South", "South-West", "West", "North-West"]
-    prop.facing = directions[seed % 8]
-    
-    if prop.facing in ["North", "North-East", "East"]:
-        prop.vastu_score = 9 + (seed % 2)
-    else:
-        prop.vastu_score = 6 + (seed % 4)
-
-    # 7. Cosmic Tier Features
-    if prop.safety_index > 8:
-        prop.noise_level = "Whisper Quiet"
-        prop.decibels = 35 + (seed % 10)
-    elif prop.safety_index > 6:
-        prop.noise_level = "Urban Buzz"
-        prop.decibels = 50 + (seed % 15)
+    """
+    Puts the listing's AI insights on the response object.
+    Insights are persisted on write (services/insights.py); rows that predate
+    that, or were changed outside the ORM, get them computed on the fly.
+    """
+    attach_insights([prop])
+
+# Pagination / projection for list views
+MAX_PAGE_SIZE = 500
+
+# Lean payload for the mobile list cards (?fields=card)
+CARD_FIELDS = list(PropertyCard.model_fields)
+
+# Columns calculate_ai_insights reads when stored insights are missing or stale
+INSIGHT_INPUTS = ["id", "price_fiat", "property_type", "latitude", "longitude"]
+
+OWNER_COLUMNS = {
+    "owner_name": User.full_name,
+    "owner_is_verified": User.is_verified,
+}
+
+def encode_cursor(last_id: str) -> str:
+    raw = json.dumps({"id": last_id}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return json.loads(raw)["id"]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def resolve_fields(fields: str) -> List[str]:
+    """Parses ?fields= into an ordered list of PropertyResponse field names"""
+    if fields == "card":
+        return list(CARD_FIELDS)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in PropertyResponse.model_fields or f == "distance_km"]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    if not requested:
+        raise HTTPException(status_code=400, detail="fields must not be empty")
+    return list(dict.fromkeys(requested))
+
+@lru_cache(maxsize=256)
+def field_projection(fields: Tuple[str, ...]) -> Projection:
+    return Projection(fields)
+
+def project_rows(rows, columns: List[str], fields: List[str]) -> List[dict]:
+    """Turns selected column tuples into dicts holding only the requested fields"""
+    wants_insights = any(f in INSIGHT_FIELDS for f in fields)
+    objs = [SimpleNamespace(**dict(zip(columns, row))) for row in rows]
+    if wants_insights:
+        attach_insights(objs)
+    # resolve_fields only admits columns, owner and insight fields, so every field is on every row
+    return field_projection(tuple(fields)).many(objs)
+
+def load_property_page(db: Session, limit: Optional[int], cursor: Optional[str], selected: Optional[List[str]]):
+    """One keyset page of listings for /all, with the cursor of the next page (or None)"""
+    if selected is None:
+        query = db.query(Property).options(joinedload(Property.owner), joinedload(Property.insights))
     else:
-        prop.noise_level = "Traffic Heavy"
-        prop.decibels = 70 + (seed % 10)
-
-    # 8. Universal Tier Features (Mock)
-    # Most expensive props get Blockchain verification
-    if base_price > 7500000:
-        prop.is_blockchain_verified = True
-        # Mock Eth Address
-        prop.contract_address = f"0x{hash(prop.id):040x}"[:18] + "..." + f"0x{hash(prop.id):040x}"[-4:]
-
-@router.get("/all", response_model=List[PropertyResponse])
-def get_all_properties(db: Session = Depends(get_db)):
-    """Get all properties for Browse/Buy screen"""
-    props = db.query(Property).all()
+        # Only the columns the projection needs
+        columns = [f for f in selected if f in Property.__table__.columns.keys()]
+        wants_insights = any(f in INSIGHT_FIELDS for f in selected)
+        if wants_insights:
+            columns += [c for c in INSIGHT_INPUTS if c not in columns]
+        if "id" not in columns:
+            columns.append("id")
+        owner_fields = [f for f in selected if f in OWNER_COLUMNS]
+        query = db.query(
+            *[getattr(Property, c) for c in columns],
+            *[OWNER_COLUMNS[f] for f in owner_fields],
+            *([PropertyInsights] if wants_insights else [])
+        )
+        if owner_fields:
+            query = query.outerjoin(User, Property.owner_id == User.id)
+        if wants_insights:
+            query = query.outerjoin(PropertyInsights, PropertyInsights.property_id == Property.id)
+        columns += owner_fields + (["insights"] if wants_insights else [])
+
+    query = query.order_by(Property.id)
+    if cursor is not None:
+        query = query.filter(Property.id > decode_cursor(cursor))
+    if limit is not None:
+        query = query.limit(limit + 1)
+    rows = query.all()
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.id)
+
+    if selected is not None:
+        return project_rows(rows, columns, selected), next_cursor
+
     # Enrich with owner info
+    for p in rows:
+        if p.owner:
+            p.owner_name = p.owner.full_name
+            p.owner_is_verified = p.owner.is_verified
+    attach_insights(rows)
+    return [PropertyResponse.model_validate(p, from_attributes=True) for p in rows], next_cursor
+
+# The body is built and cached as JSON by cached_json, so FastAPI never
+# validates it; the schema is documentation only
+@router.get("/all", response_model=None, responses={200: {
+    "model": Union[List[PropertyResponse], List[PropertyCard], List[Dict[str, Any]]],
+    "description": "Full listings; with ?fields=card the card fields, with a field list only those fields",
+}})
+def get_all_properties(
+    request: Request,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get properties for Browse/Buy screen.
+    Keyset-paginated by id when `limit` is given; the next page's cursor is
+    returned in the X-Next-Cursor header. `fields` selects a subset of the
+    response fields (comma separated, or `card` for the list-view preset).
+    Cached with an ETag until a listing is created or deleted.
+    """
+    if limit is not None and not 0 < limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    selected = resolve_fields(fields) if fields is not None else None
+
+    def build():
+        content, next_cursor = load_property_page(db, limit, cursor, selected)
+        return content, ({"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+    return cached_json(request, lambda content: [LIST_TAG], build)
+
+@router.get("/nearby", response_model=List[PropertyResponse])
+def get_nearby_properties(lat: float, long: float, radius_km: float = 5.0, limit: Optional[int] = None, db: Session = Depends(get_db)):
+    """Properties within radius_km of (lat, long), nearest first"""
+    if radius_km <= 0:
+        raise HTTPException(status_code=400, detail="radius_km must be positive")
+    if limit is not None and limit <= 0:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+
+    geo_index.ensure_loaded(db)
+    hits = geo_index.nearby(lat, long, radius_km, limit=limit)
+    if not hits:
+        return []
+
+    distances = dict(hits)
+    ids = list(distances)
+    rows = []
+    # Chunked to stay under the DB's bound-parameter limit for wide radii
+    for i in range(0, len(ids), 500):
+        rows.extend(
+            db.query(Property).options(joinedload(Property.owner), joinedload(Property.insights))
+            .filter(Property.id.in_(ids[i:i + 500])).all()
+        )
+    props = sorted(rows, key=lambda p: distances[p.id])
     for p in props:
+        p.distance_km = round(distances[p.id], 3)
         if p.owner:
             p.owner_name = p.owner.full_name
             p.owner_is_verified = p.owner.is_verified
-        calculate_ai_insights(p)
+    attach_insights(props)
     return props
 
-@router.get("/nearby", response_model=List[PropertyResponse])
-def get_nearby_properties(lat: float, long: float, radius_km: float = 5.0, db: Session = Depends(get_db)):
-    # TODO: Implement Geo-spatial filter
-    # For MVP: Return all to populate the map
-    props = db.query(Property).all()
+@router.get("/search", response_model=List[PropertyResponse])
+def search_properties(
+    q: str,
+    property_type: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    min_area: Optional[float] = None,
+    max_area: Optional[float] = None,
+    area_unit: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text search over title and description, best match first.
+    The last word of `q` matches as a prefix, for type-ahead.
+    """
+    if not 0 < limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="offset must not be negative")
+
+    hits = search_property_ids(
+        db, q, property_type=property_type, min_price=min_price, max_price=max_price,
+        min_area=min_area, max_area=max_area, area_unit=area_unit, limit=limit, offset=offset
+    )
+    if not hits:
+        return []
+
+    order = {prop_id: i for i, (prop_id, _) in enumerate(hits)}
+    rows = (
+        db.query(Property).options(joinedload(Property.owner), joinedload(Property.insights))
+        .filter(Property.id.in_(order.keys())).all()
+    )
+    props = sorted(rows, key=lambda p: order[p.id])
     for p in props:
         if p.owner:
             p.owner_name = p.owner.full_name
             p.owner_is_verified = p.owner.is_verified
-        calculate_ai_insights(p)
+    attach_insights(props)
     return props
 
-@router.get("/{id}", response_model=PropertyResponse)
-def get_property(id: str, db: Session = Depends(get_db)):
-    prop = db.query(Property).filter(Property.id == id).first()
+def facet_filters(property_type, min_price, max_price, min_area, max_area, area_unit, status, verified_owner) -> FacetFilters:
+    """FacetFilters from query params; property_type and status are comma separated"""
+    try:
+        statuses = [VerificationStatus(s.strip()) for s in status.split(",") if s.strip()] if status else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid status")
+    return FacetFilters(
+        property_types=[t.strip() for t in property_type.split(",") if t.strip()] if property_type else None,
+        min_price=min_price, max_price=max_price,
+        min_area=min_area, max_area=max_area, area_unit=area_unit,
+        statuses=statuses, verified_owner=verified_owner,
+    )
+
+@router.get("/filter", response_model=FacetedResponse)
+def filter_with_facets(
+    property_type: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    min_area: Optional[float] = None,
+    max_area: Optional[float] = None,
+    area_unit: Optional[str] = None,
+    status: Optional[str] = None,
+    verified_owner: Optional[bool] = None,
+    limit: int = 20,
+    offset: int = 0,
+    db: Session = Depends(get_db)
+):
+    """
+    Filtered listings plus facet counts (type, status, verified owner, area
+    unit, price and area ranges). property_type and status take comma
+    separated values. Each facet is counted with the other filters applied.
+    """
+    if not 0 < limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="offset must not be negative")
+
+    filters = facet_filters(property_type, min_price, max_price, min_area, max_area, area_unit, status, verified_owner)
+    total, props = filter_properties(db, filters, limit, offset)
+    for p in props:
+        if p.owner:
+            p.owner_name = p.owner.full_name
+            p.owner_is_verified = p.owner.is_verified
+    attach_insights(props)
+    return {"total": total, "results": props, "facets": facet_counts(db, filters)}
+
+@router.get("/export")
+def export_properties(
+    property_type: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    min_area: Optional[float] = None,
+    max_area: Optional[float] = None,
+    area_unit: Optional[str] = None,
+    status: Optional[str] = None,
+    verified_owner: Optional[bool] = None,
+    gzip: bool = False
+):
+    """
+    Every matching listing as NDJSON (one PropertyResponse object per line),
+    streamed from a server-side cursor. Filters are those of /filter;
+    gzip=true sends a .ndjson.gz file instead.
+    """
+    filters = facet_filters(property_type, min_price, max_price, min_area, max_area, area_unit, status, verified_owner)
+    fields = {f: info.default for f, info in PropertyResponse.model_fields.items() if f != "distance_km"}
+    body = export_lines(filters, fields)
+    filename = "listings.ndjson"
+    media_type = "application/x-ndjson"
+    if gzip:
+        body = gzip_chunks(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        body, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/clusters")
+def get_property_clusters(min_lat: float, min_lon: float, max_lat: float, max_lon: float, zoom: int, db: Session = Depends(get_db)):
+    """
+    Map markers for a viewport: clusters (count, centroid, price range, type
+    breakdown) at low zoom, individual listings at high zoom.
+    A viewport crossing the antimeridian has min_lon > max_lon.
+    """
+    if min_lat > max_lat:
+        raise HTTPException(status_code=400, detail="min_lat must not exceed max_lat")
+    cluster_index.ensure_loaded(db)
+    return FastJSONResponse(cluster_index.query(min_lat, min_lon, max_lat, max_lon, zoom))
+
+@router.get("/tiles/{z}/{x}/{y}")
+def get_property_tile(z: int, x: int, y: int, request: Request, db: Session = Depends(get_db)):
+    """
+    Listings in web-mercator tile z/x/y as compact [id, lat, lon, price, type]
+    rows, or cluster aggregates when the tile is crowded.
+    Served from an LRU tile cache with ETags; writes evict only their own tiles.
+    """
+    if not 0 <= z <= MAX_TILE_ZOOM or not (0 <= x < 1 << z and 0 <= y < 1 << z):
+        raise HTTPException(status_code=404, detail="Tile out of range")
+
+    key = (z, x, y)
+    # Cached tiles never expire; apply other processes' listing writes first
+    listing_events.sync_external_changes(db)
+    cached = tile_cache.get(key)
+    if cached is None:
+        generation = tile_cache.generation
+        cluster_index.ensure_loaded(db)
+        tile = cluster_index.tile(z, x, y, settings.TILE_POINT_LIMIT)
+        body = dumps({"z": z, "x": x, "y": y, **tile})
+        cached = tile_cache.put(key, body, generation)
+
+    body, etag = cached
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.TILE_MAX_AGE_SECONDS}"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def load_property(db: Session, id: str) -> PropertyResponse:
+    prop = (
+        db.query(Property)
+        .options(joinedload(Property.owner), joinedload(Property.insights))
+        .filter(Property.id == id)
+        .first()
+    )
     if not prop:
         raise HTTPException(status_code=404, detail="Property not found")
     
@@ -242,31 +530,39 @@ def get_property(id: str, db: Session = Depends(get_db)):
     
     calculate_ai_insights(prop)
     
-    return prop
+    return PropertyResponse.model_validate(prop, from_attributes=True)
+
+@router.get("/{id}", response_model=PropertyResponse)
+def get_property(id: str, request: Request, db: Session = Depends(get_db)):
+    """Single listing, cached with an ETag until it is deleted"""
+    return cached_json(request, lambda content: [property_tag(id)], lambda: (load_property(db, id), None))
 
 @router.get("/{id}/similar", response_model=List[PropertyResponse])
-def get_similar_properties(id: str, db: Session = Depends(get_db)):
-    """Get similar properties based on type and price range"""
-    original = db.query(Property).filter(Property.id == id).first()
-    if not original:
+def get_similar_properties(id: str, limit: int = 3, db: Session = Depends(get_db)):
+    """
+    Closest listings by location, price, area and type, nearest first,
+    from precomputed neighbour lists (services/similarity.py).
+    """
+    if not 0 < limit <= settings.SIMILAR_NEIGHBOURS:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {settings.SIMILAR_NEIGHBOURS}")
+    similarity_index.ensure_loaded(db)
+    ids = [prop_id for prop_id, _ in similarity_index.similar(id, limit)]
+    if not ids:
         return []
-        
-    # Logic: Same Type, Price within +/- 30%
-    min_price = original.price_fiat * 0.7
-    max_price = original.price_fiat * 1.3
-    
-    similar = db.query(Property).filter(
-        Property.property_type == original.property_type,
-        Property.price_fiat >= min_price,
-        Property.price_fiat <= max_price,
-        Property.id != id # Exclude self
-    ).limit(3).all()
-    
+
+    rows = (
+        db.query(Property)
+        .options(joinedload(Property.owner), joinedload(Property.insights))
+        .filter(Property.id.in_(ids))
+        .all()
+    )
+    rank = {prop_id: i for i, prop_id in enumerate(ids)}
+    similar = sorted(rows, key=lambda p: rank[p.id])
     for p in similar:
         if p.owner:
             p.owner_name = p.owner.full_name
             p.owner_is_verified = p.owner.is_verified
-            
+    attach_insights(similar)
     return similar
 
 @router.get("/user/{email}", response_model=List[PropertyResponse])
@@ -302,5 +598,7 @@ def delete_property(id: str, user_email: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=403, detail="You are not authorized to delete this property")
     
     db.delete(prop)
+    listing_events.record_change(db, "deleted", prop)
     db.commit()
+    listing_events.property_deleted(prop)
     return {"message": "Property deleted successfully"}
@@ -1,39 +1,18 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from cloudinary.uploader import upload
-import cloudinary
-from ...core.config import settings
+from fastapi import APIRouter, Depends, HTTPException, Request
+from ...services.image_pool import ImageWorkerCrashed
+from ...services.storage import InvalidImage, get_storage
+from ...services.uploads import SpooledUpload, spooled_upload
 
 router = APIRouter()
 
-# Configure Cloudinary
-cloudinary.config(
-    cloud_name=settings.CLOUDINARY_CLOUD_NAME,
-    api_key=settings.CLOUDINARY_API_KEY,
-    api_secret=settings.CLOUDINARY_API_SECRET
-)
-
 @router.post("/upload-image")
-async def upload_image(file: UploadFile = File(...)):
-    """Upload image to Cloudinary and return URL"""
+async def upload_image(request: Request, image: SpooledUpload = Depends(spooled_upload)):
+    """Upload image (multipart 'file') to the configured storage and return its URLs"""
     try:
-        # Read file content
-        contents = await file.read()
-        
-        # Upload to Cloudinary
-        result = upload(
-            contents,
-            folder="real-estate",  # Organize images in folder
-            resource_type="auto",
-            transformation=[
-                {'width': 1200, 'height': 800, 'crop': 'limit'},  # Max size
-                {'quality': 'auto:good'}  # Auto optimize
-            ]
-        )
-        
-        return {
-            "url": result['secure_url'],
-            "public_id": result['public_id'],
-            "thumbnail": result['secure_url'].replace('/upload/', '/upload/w_300,h_200,c_fill/')
-        }
+        return await get_storage().save(image, str(request.base_url))
+    except InvalidImage as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImageWorkerCrashed as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
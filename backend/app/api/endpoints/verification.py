@@ -1,65 +1,115 @@
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
-from sqlalchemy.orm import Session
-from ...db.base import get_db
-from ...db.models import Property, User, VerificationStatus
-from ...services.verification import verification_engine
+import time
 import uuid
 
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from ...db.base import get_async_db
+from ...db.models import JobStatus, VerificationJob
+from ...services.uploads import SpooledUpload, spooled_upload
+from ...services.verification import verification_engine
+from ...services.verification_jobs import FINISHED, JobQueueFull, job_dict, spool_job_input, verification_jobs
+
 router = APIRouter()
 
+# Longest a request may block waiting for a job (long polling)
+MAX_WAIT_SECONDS = 30.0
+
+def queue_full() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Verification queue is full, please retry shortly",
+        headers={"Retry-After": "5"},
+    )
+
+async def load_job(db: AsyncSession, job_id: str) -> VerificationJob:
+    # populate_existing: the row is updated by worker threads between reads
+    result = await db.execute(
+        select(VerificationJob).where(VerificationJob.id == job_id).execution_options(populate_existing=True)
+    )
+    job = result.scalars().first()
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+async def job_response(db: AsyncSession, job_id: str, wait: float) -> JSONResponse:
+    """The job, after waiting up to `wait` seconds for it to finish. 202 while it is still pending."""
+    deadline = time.monotonic() + min(wait, MAX_WAIT_SECONDS)
+    job = await load_job(db, job_id)
+    while job.status not in FINISHED and time.monotonic() < deadline:
+        await verification_jobs.wait(job_id, deadline - time.monotonic())
+        job = await load_job(db, job_id)
+    status_code = 200 if job.status in FINISHED else 202
+    return JSONResponse(jsonable_encoder(job_dict(job)), status_code=status_code)
+
+async def submit_job(db: AsyncSession, upload: SpooledUpload, kind: str, **fields) -> str:
+    # Refuse before copying the upload anywhere
+    if not verification_jobs.has_capacity():
+        raise queue_full()
+
+    job_id = str(uuid.uuid4())
+    input_path = await run_in_threadpool(spool_job_input, job_id, upload.open())
+    db.add(VerificationJob(id=job_id, kind=kind, status=JobStatus.QUEUED, input_path=input_path, **fields))
+    await db.commit()
+    try:
+        verification_jobs.enqueue(job_id)
+    except JobQueueFull:
+        job = await load_job(db, job_id)
+        job.status = JobStatus.FAILED
+        job.error = "Queue full"
+        job.input_path = None
+        await db.commit()
+        await run_in_threadpool(verification_jobs.discard_input, input_path)
+        raise queue_full()
+    return job_id
+
 @router.post("/upload")
 async def upload_verification_doc(
-    doc_type: str = Form(...), # AADHAAR, PAN, SELFIE
-    id_number: str = Form(...), # The number typed by user
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    upload: SpooledUpload = Depends(spooled_upload),
+    wait: float = Query(0, ge=0, description="Seconds to wait for the result before returning the pending job"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Submits a document for AI Verification.
-    Returns the 'AI Score' immediately.
+    Multipart form: doc_type (AADHAAR, PAN, SELFIE), id_number (the number
+    typed by user) and file.
+    Returns a job right away (202); the 'AI Score' is in its result once
+    done. Poll GET /verification/jobs/{job_id}, or pass wait to long-poll.
     """
+    doc_type = upload.field("doc_type")
+    id_number = upload.field("id_number")
     
-    # 1. Read File
-    contents = await file.read()
-    
-    # 2. Image Quality Check
-    quality_result = verification_engine.check_image_quality(contents)
-    
-    # 3. ID Format Check
-    valid_format = verification_engine.validate_id_format(doc_type, id_number)
-    
-    # 4. Final Scoring Logic
-    final_status = VerificationStatus.PENDING
-    rejection_reason = None
-    
-    if quality_result["score"] < 50:
-        final_status = VerificationStatus.REJECTED
-        rejection_reason = f"Image Quality too low. {quality_result['details']}"
-    elif not valid_format:
-        final_status = VerificationStatus.REJECTED
-        rejection_reason = f"Invalid {doc_type} Number Format."
-    else:
-        # High quality and valid format -> Auto Approve for MVP
-        final_status = VerificationStatus.APPROVED
-        
-    return {
-        "doc_type": doc_type,
-        "masked_id": verification_engine.obscure_id(id_number),
-        "ai_score": quality_result["score"],
-        "quality_details": quality_result,
-        "format_valid": valid_format,
-        "status": final_status,
-        "rejection_reason": rejection_reason
-    }
+    # The ID format check is cheap and needs the raw number, which isn't persisted
+    job_id = await submit_job(
+        db, upload, "document",
+        doc_type=doc_type,
+        masked_id=verification_engine.obscure_id(id_number),
+        format_valid=verification_engine.validate_id_format(doc_type, id_number),
+    )
+    return await job_response(db, job_id, wait)
 
 @router.post("/ocr")
 async def ocr_scan_document(
-    file: UploadFile = File(...)
+    upload: SpooledUpload = Depends(spooled_upload),
+    wait: float = Query(0, ge=0, description="Seconds to wait for the result before returning the pending job"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Simulates scanning a document and extracting the ID number.
-    Returns the extracted ID number.
+    Simulates scanning a document (multipart 'file') and extracting the ID number.
+    Returns a job; the extracted ID number is in its result.
     """
-    contents = await file.read()
-    result = verification_engine.extract_id_from_image(contents)
-    return result
+    job_id = await submit_job(db, upload, "ocr")
+    return await job_response(db, job_id, wait)
+
+@router.get("/jobs/{job_id}")
+async def get_verification_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, description="Long-poll: seconds to wait for the job to finish"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Status and, once finished, result of a verification job."""
+    return await job_response(db, job_id, wait)
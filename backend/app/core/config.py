@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     CLOUDINARY_CLOUD_NAME: str = "demo"
@@ -7,6 +8,84 @@ class Settings(BaseSettings):
     CLOUDINARY_API_SECRET: str = "secret"
     DATABASE_URL: str = "sqlite:///./sql_app.db"
 
+    # Connection pool, per engine (the async engine gets its own pool of the same size)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0 # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800 # Reconnect connections older than this (-1 = never)
+
+    # SQLite pragmas, set on every new connection (the database runs in WAL mode)
+    SQLITE_MMAP_BYTES: int = 256 * 1024 * 1024
+    SQLITE_CACHE_BYTES: int = 64 * 1024 * 1024
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # Image storage: "local" or "cloudinary"; empty picks Cloudinary only when configured
+    STORAGE_BACKEND: str = ""
+    MEDIA_ROOT: str = "./media"
+    MEDIA_BASE_URL: Optional[str] = None # Public origin for /media URLs (defaults to the request's)
+    MEDIA_MAX_AGE_SECONDS: int = 365 * 24 * 3600
+
+    # Map tiles
+    TILE_CACHE_MAX_TILES: int = 4096
+    TILE_POINT_LIMIT: int = 200 # Above this a tile returns clusters instead of listings
+    TILE_MAX_AGE_SECONDS: int = 60
+
+    # GET response cache (/properties/{id}, /properties/all, /favorites/list)
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+
+    # Authenticated-caller cache for get_current_user (0 entries disables it)
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+
+    # Password hashing (bcrypt); older hashes are rehashed at login
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32 # In-flight + queued hashes before 503
+
+    # Uploads are streamed and spooled: in memory up to UPLOAD_MEMORY_BYTES,
+    # then to a temp file in UPLOAD_SPOOL_DIR (system temp dir if unset)
+    MAX_UPLOAD_BYTES: int = 15 * 1024 * 1024
+    UPLOAD_MEMORY_BYTES: int = 1024 * 1024
+    UPLOAD_SPOOL_DIR: Optional[str] = None
+
+    # Bulk listing import (POST /properties/import and the CLI)
+    IMPORT_MAX_BYTES: int = 512 * 1024 * 1024
+    IMPORT_BATCH_SIZE: int = 5000
+
+    # /properties/{id}/similar: neighbours precomputed per listing (the most a
+    # request can ask for) and the grid cell size of the neighbour search
+    SIMILAR_NEIGHBOURS: int = 10
+    SIMILAR_CELL_DEG: float = 0.02
+
+    # How often (at most) the in-process listing indexes and tile cache replay
+    # listing writes made by other processes (other API workers, the
+    # bulk_import CLI) from the listing_changes log; 0 turns the replay off.
+    # Log entries are pruned after LISTING_CHANGES_RETENTION_SECONDS.
+    LISTINGS_SYNC_SECONDS: float = 5.0
+    LISTING_CHANGES_RETENTION_SECONDS: float = 24 * 3600
+
+    # Rows fetched per round trip by GET /properties/export
+    EXPORT_BATCH_SIZE: int = 2000
+
+    # Processes for image analysis and thumbnails (0 = threadpool in the API process)
+    IMAGE_WORKERS: int = 2
+
+    # Verification job queue: worker threads, and where their image stages run
+    # ("processes" = the image pool above, "threads" = on the worker thread)
+    VERIFICATION_WORKERS: int = 2
+    VERIFICATION_EXECUTOR: str = "processes"
+    VERIFICATION_QUEUE_LIMIT: int = 100 # Waiting jobs before submits get 503
+    VERIFICATION_JOB_DIR: Optional[str] = None # Job inputs (system temp dir if unset)
+    VERIFICATION_JOB_TIMEOUT_SECONDS: float = 300 # RUNNING longer than this = its process died; marked FAILED
+
+    # Aadhaar OTPs: "database" works across API workers, "memory" only with one
+    OTP_STORE: str = "database"
+    OTP_TTL_SECONDS: int = 300
+    OTP_MAX_ATTEMPTS: int = 5
+    OTP_MAX_ENTRIES: int = 100000 # Memory store only; database rows are bounded by the TTL
+
     class Config:
         # env_file = ".env" # Disabled to avoid permission issues, using system env vars
         extra = "ignore" # Ignore other env vars if present
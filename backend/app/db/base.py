@@ -1,8 +1,11 @@
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import create_engine
+from starlette.concurrency import run_in_threadpool
 import os
 
+from .pool import apply_sqlite_pragmas, pool_args
+
 # Check for PostgreSQL database URL from environment
 # If not found, fall back to SQLite (for local development)
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sql_app.db")
@@ -22,16 +25,21 @@ try:
             DATABASE_URL,
             connect_args={"sslmode": "require"},
             pool_pre_ping=True, # Handles dropped connections
-            pool_size=5,
-            max_overflow=10
+            **pool_args(DATABASE_URL)
         )
     else:
         # SQLite - needs check_same_thread
-        engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+        engine = create_engine(
+            DATABASE_URL, connect_args={"check_same_thread": False}, **pool_args(DATABASE_URL)
+        )
 except Exception as e:
     db_startup_error = str(e)
     print(f"DB CONNECTION FAILED, FALLING BACK TO SQLITE: {e}")
-    engine = create_engine("sqlite:///./fallback.db", connect_args={"check_same_thread": False})
+    engine = create_engine(
+        "sqlite:///./fallback.db", connect_args={"check_same_thread": False}, **pool_args("sqlite:///./fallback.db")
+    )
+
+apply_sqlite_pragmas(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -43,3 +51,83 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async engine for endpoints that would otherwise block the event loop
+# (asyncpg for PostgreSQL, aiosqlite for SQLite). DB_ASYNC=0 turns it off;
+# get_async_db then runs a sync session in the threadpool instead.
+DB_ASYNC = os.getenv("DB_ASYNC", "1").lower() not in ("0", "false", "no")
+
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def async_database_url(url):
+    """The sync engine's URL with its async driver (asyncpg takes SSL via connect_args, not sslmode)."""
+    return url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()]).difference_update_query(["sslmode"])
+
+async_engine = None
+AsyncSessionLocal = None
+
+if DB_ASYNC and engine.dialect.name in ASYNC_DRIVERS:
+    try:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        if engine.dialect.name == "postgresql":
+            async_engine = create_async_engine(
+                async_database_url(engine.url),
+                connect_args={"ssl": "require"},
+                pool_pre_ping=True,
+                **pool_args(engine.url, asyncio=True)
+            )
+        else:
+            async_engine = create_async_engine(async_database_url(engine.url), **pool_args(engine.url, asyncio=True))
+            apply_sqlite_pragmas(async_engine.sync_engine)
+        # Loaded objects stay readable after commit and after the session closes
+        AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+    except ImportError as e:
+        # aiosqlite / asyncpg / greenlet not installed
+        print(f"Async DB driver unavailable, using threadpool sessions: {e}")
+        async_engine = None
+
+
+class ThreadpoolSession:
+    """
+    The subset of AsyncSession the async endpoints use, backed by a sync
+    Session whose calls run in the threadpool. Used when DB_ASYNC is off.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    async def execute(self, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, *args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, *args, **kwargs)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def refresh(self, instance):
+        await run_in_threadpool(self.sync_session.refresh, instance)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+
+async def get_async_db():
+    """Session for async endpoints: AsyncSession, or ThreadpoolSession without an async driver."""
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+    db = ThreadpoolSession(SessionLocal(expire_on_commit=False))
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Float, Enum as SqEnum, JSON
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Float, Enum as SqEnum, JSON, Index, DateTime
 from sqlalchemy.orm import relationship
 import uuid
 import enum
+from datetime import datetime
 from .base import Base
 
 class VerificationStatus(str, enum.Enum):
@@ -10,6 +11,12 @@ class VerificationStatus(str, enum.Enum):
     REJECTED = "REJECTED"
     NEEDS_REVIEW = "NEEDS_REVIEW"
 
+class JobStatus(str, enum.Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
 class User(Base):
     __tablename__ = "users"
     
@@ -42,6 +49,58 @@ class Property(Base):
     status = Column(SqEnum(VerificationStatus), default=VerificationStatus.PENDING)
     
     owner = relationship("User", back_populates="properties")
+    insights = relationship("PropertyInsights", uselist=False, back_populates="property", cascade="all, delete-orphan")
+
+    # Filter/facet access paths (services/facets.py, /similar, /user/{email})
+    __table_args__ = (
+        Index("ix_properties_type_price", "property_type", "price_fiat"),
+        Index("ix_properties_price", "price_fiat"),
+        Index("ix_properties_status_type", "status", "property_type"),
+        Index("ix_properties_unit_area", "area_unit", "area"),
+        Index("ix_properties_owner", "owner_id"),
+    )
+
+class PropertyInsights(Base):
+    """
+    Derived AI insights for a listing, computed on write (see services/insights.py).
+    The input_* columns record what the row was computed from so it is only
+    recomputed when price, type or location change.
+    """
+    __tablename__ = "property_insights"
+
+    property_id = Column(String, ForeignKey("properties.id", ondelete="CASCADE"), primary_key=True)
+    input_price = Column(Float)
+    input_type = Column(String, nullable=True)
+    input_latitude = Column(Float, nullable=True)
+    input_longitude = Column(Float, nullable=True)
+
+    ai_valuation_min = Column(Float)
+    ai_valuation_max = Column(Float)
+    ai_valuation_verdict = Column(String)
+    investment_score = Column(Float)
+    walk_score = Column(Integer)
+    safety_index = Column(Integer)
+    nearby_schools = Column(Integer)
+    nearby_hospitals = Column(Integer)
+    nearby_parks = Column(Integer)
+    price_history = Column(JSON)
+    is_360_ready = Column(Boolean)
+    is_fractional = Column(Boolean)
+    token_price = Column(Float)
+    total_tokens = Column(Integer)
+    sold_tokens = Column(Integer)
+    yield_rate = Column(Float)
+    is_auction = Column(Boolean)
+    current_bid = Column(Float)
+    total_bids = Column(Integer)
+    facing = Column(String)
+    vastu_score = Column(Integer)
+    noise_level = Column(String)
+    decibels = Column(Integer)
+    is_blockchain_verified = Column(Boolean)
+    contract_address = Column(String, nullable=True)
+
+    property = relationship("Property", back_populates="insights")
 
 class Favorite(Base):
     __tablename__ = "favorites"
@@ -49,3 +108,53 @@ class Favorite(Base):
     id = Column(String, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"))
     property_id = Column(String, ForeignKey("properties.id"))
+
+    __table_args__ = (
+        Index("ix_favorites_user_property", "user_id", "property_id"),
+    )
+
+class VerificationJob(Base):
+    """A document check or OCR scan run by the verification job queue."""
+    __tablename__ = "verification_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = Column(String)  # document, ocr
+    status = Column(SqEnum(JobStatus), default=JobStatus.QUEUED, index=True)
+    # Inputs; the raw ID number is never stored
+    doc_type = Column(String, nullable=True)
+    masked_id = Column(String, nullable=True)
+    format_valid = Column(Boolean, nullable=True)
+    input_path = Column(String, nullable=True)  # Removed once the job finishes
+
+    result = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+class OTPCode(Base):
+    """One outstanding OTP for the database OTP store (key and code are HMACs, never raw)."""
+    __tablename__ = "otp_codes"
+
+    key = Column(String, primary_key=True)
+    otp_hash = Column(String)
+    attempts = Column(Integer, default=0)
+    created_at = Column(Float)
+    expires_at = Column(Float, index=True)  # Unix time
+
+class ListingChange(Base):
+    """
+    Log of listing writes, replayed by every API process into its in-process
+    indexes (listing_events.sync_external_changes). seq only ever grows.
+    """
+    __tablename__ = "listing_changes"
+    __table_args__ = {"sqlite_autoincrement": True}  # Never reuse a seq, even after pruning
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String)  # created, deleted
+    property_id = Column(String)
+    # Where the listing was, for cache invalidation after it is gone
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    origin = Column(String)  # listing_events.PROCESS_ID of the writer
+    created_at = Column(Float, index=True)  # Unix time
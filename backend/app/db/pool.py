@@ -0,0 +1,106 @@
+"""
+Connection pool settings, SQLite pragmas and pool statistics for /api/health.
+"""
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from ..core.config import settings
+
+
+class TimedPoolMixin:
+    """Counts checkouts, how long they waited for a connection, and pool timeouts."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds += waited
+                self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            checkouts, wait = self.checkouts, self.wait_seconds
+            return {
+                "size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "max_overflow": self._max_overflow,
+                "timeout_seconds": self._timeout,
+                "checkouts": checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(wait * 1000 / checkouts, 3) if checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+            }
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_args(url, asyncio: bool = False) -> dict:
+    """create_engine() pool arguments from Settings (none for in-memory SQLite, which keeps one connection)."""
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": TimedAsyncQueuePool if asyncio else TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def apply_sqlite_pragmas(engine) -> None:
+    """
+    WAL lets readers run alongside the (single) writer; synchronous=NORMAL
+    is durable in WAL mode except across power loss. Set on every new
+    connection, before the pool hands it out.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_BYTES)}")
+            # Negative cache_size is in KiB
+            cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_BYTES) // 1024}")
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        finally:
+            cursor.close()
+
+
+def pool_stats(engine) -> dict:
+    pool = engine.pool
+    if isinstance(pool, TimedPoolMixin):
+        return pool.stats()
+    return {"pool": type(pool).__name__, "status": pool.status()}
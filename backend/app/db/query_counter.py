@@ -0,0 +1,64 @@
+from contextlib import contextmanager
+from typing import List, Optional
+
+from sqlalchemy import event
+
+from .base import engine as default_engine
+
+
+class QueryCounter:
+    """
+    Counts SQL statements executed on an engine while active.
+    Meant for tests and benchmarks, e.g. to check that a list endpoint issues
+    the same number of queries for 1 row as for 100 (no N+1 lazy loads).
+
+        with QueryCounter() as qc:
+            client.get("/properties/all")
+        assert qc.count <= 2, qc.statements
+    """
+
+    def __init__(self, bind=None):
+        self.bind = bind if bind is not None else default_engine
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.bind, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.bind, "before_cursor_execute", self._on_execute)
+        return False
+
+
+@contextmanager
+def assert_max_queries(limit: int, bind=None):
+    """Fails if the block runs more than `limit` SQL statements."""
+    with QueryCounter(bind) as qc:
+        yield qc
+    if qc.count > limit:
+        listing = "\n".join(qc.statements)
+        raise AssertionError(f"Expected at most {limit} queries, got {qc.count}:\n{listing}")
+
+
+def assert_constant_queries(call, grow, sizes=(1, 10), bind=None) -> Optional[int]:
+    """
+    Fails if the statement count of `call()` changes with result size.
+    `grow(n)` must bring the data set to n rows before each measurement.
+    Returns the (constant) statement count.
+    """
+    counts = []
+    for n in sizes:
+        grow(n)
+        with QueryCounter(bind) as qc:
+            call()
+        counts.append(qc.count)
+    if len(set(counts)) > 1:
+        raise AssertionError(f"Query count grows with result size: {dict(zip(sizes, counts))}")
+    return counts[0] if counts else None
@@ -7,6 +7,31 @@ try:
     models.Base.metadata.create_all(bind=engine)
 except Exception as e:
     print(f"Startup DB Error: {e}")
+
+# create_all skips indexes added to tables that already exist
+for _table in models.Base.metadata.sorted_tables:
+    for _index in _table.indexes:
+        try:
+            _index.create(bind=engine, checkfirst=True)
+        except Exception as e:
+            print(f"Index {_index.name} not created: {e}")
+
+from .db.base import SessionLocal
+from .services.insights import backfill_insights
+from .services.search import setup_search_index
+
+# Listings created before insights were persisted
+try:
+    with SessionLocal() as _db:
+        backfill_insights(_db)
+except Exception as e:
+    print(f"Insights backfill skipped: {e}")
+
+# Full-text index for /properties/search
+try:
+    setup_search_index(engine)
+except Exception as e:
+    print(f"Search index setup failed, using LIKE search: {e}")
 from .api.endpoints import auth
 
 app = FastAPI(
@@ -22,8 +47,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Request, SQL and stage metrics for GET /metrics
+from .db.base import async_engine
+from .services.metrics import MetricsMiddleware, instrument_engine
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine)
+
 from .api.endpoints import properties, upload, favorites, auth
 
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -38,9 +72,33 @@ app.include_router(verification.router, prefix="/verification", tags=["old_verif
 
 app.include_router(upload.router, prefix="/api", tags=["upload"])
 
+from .api.endpoints import media
+app.include_router(media.router, prefix="/media", tags=["media"])
+
 from .api.endpoints import favorites
 app.include_router(favorites.router, prefix="/favorites", tags=["favorites"])
 
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    from .db.base import async_engine
+    if async_engine is not None:
+        await async_engine.dispose()
+
+@app.on_event("startup")
+def start_verification_workers():
+    from .services.verification_jobs import verification_jobs
+    try:
+        verification_jobs.start()
+    except Exception as e:
+        print(f"Verification workers not started: {e}")
+
+@app.on_event("shutdown")
+def stop_worker_pools():
+    from .services.verification_jobs import verification_jobs
+    verification_jobs.stop()
+    from .services.image_pool import shutdown_image_pool
+    shutdown_image_pool()
+
 @app.get("/")
 def read_root():
     return {"message": "AI Real Estate Engine is Running", "status": "active"}
@@ -50,9 +108,16 @@ from .db.base import get_db
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
+from .core.security import password_hasher
+from .services.principal_cache import principal_cache
+from .services.response_cache import response_cache
+from .services.verification_jobs import verification_jobs
+from .services.tile_cache import tile_cache
+
 @app.get("/api/health")
 def health_check(db: Session = Depends(get_db)):
-    from .db.base import db_startup_error, engine
+    from .db.base import async_engine, db_startup_error, engine
+    from .db.pool import pool_stats
     
     status = "healthy"
     db_status = "connected"
@@ -74,5 +139,42 @@ def health_check(db: Session = Depends(get_db)):
             "database": db_status, 
             "verification_engine": "ready",
             "backend_version": "v2_safe_mode"
+        },
+        "db_pool": {
+            "sync": pool_stats(engine),
+            "async": pool_stats(async_engine.sync_engine) if async_engine is not None else None
+        },
+        "password_hasher": password_hasher.stats(),
+        "verification_jobs": verification_jobs.stats(),
+        "caches": {
+            "principals": principal_cache.stats(),
+            "responses": response_cache.stats(),
+            "tiles": tile_cache.stats()
         }
     }
+
+from fastapi.responses import PlainTextResponse
+from .services import metrics
+
+def _pool_metrics():
+    from .db.base import async_engine, engine
+    from .db.pool import pool_stats
+    engines = [("sync", engine)] + ([("async", async_engine.sync_engine)] if async_engine is not None else [])
+    stats = [(name, pool_stats(e)) for name, e in engines]
+    return [
+        (f"db_pool_{key}", kind, help, [({"engine": name}, s[key]) for name, s in stats if key in s])
+        for key, kind, help in [
+            ("checked_out", "gauge", "Connections in use."),
+            ("overflow", "gauge", "Connections open beyond the pool size."),
+            ("checkouts", "counter", "Connection checkouts."),
+            ("timeouts", "counter", "Checkouts that timed out waiting for a connection."),
+            ("max_wait_ms", "gauge", "Longest wait for a connection."),
+        ]
+    ]
+
+metrics.registry.collectors.append(_pool_metrics)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    """Prometheus text exposition of this process's metrics"""
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
@@ -1,14 +1,12 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 import asyncio
 import random
+from ..services.otp_store import OTPResult, otp_store
 
 router = APIRouter()
 
-# In-memory store for OTPs (For demo purposes only)
-# In production, use Redis or a database
-otp_store = {}
-
 class AadhaarRequest(BaseModel):
     aadhaar_number: str
 
@@ -31,7 +29,7 @@ async def send_aadhaar_otp(request: AadhaarRequest):
     # 3. Generate Mock OTP
     # For demo, we fix it to 1234 or random
     mock_otp = "1234" 
-    otp_store[request.aadhaar_number] = mock_otp
+    await run_in_threadpool(otp_store.put, request.aadhaar_number, mock_otp)
 
     return {
         "status": "success",
@@ -46,14 +44,17 @@ async def verify_aadhaar_otp(request: OTPVerifyRequest):
     """
     await asyncio.sleep(1.0) # Simulate check
 
-    stored_otp = otp_store.get(request.aadhaar_number)
+    # Expiry, attempt counting and clearing a used OTP happen in the store
+    outcome = await run_in_threadpool(otp_store.verify, request.aadhaar_number, request.otp)
     
-    if not stored_otp:
+    if outcome == OTPResult.MISSING:
          raise HTTPException(status_code=400, detail="OTP expired or not requested.")
 
-    if request.otp == stored_otp:
+    if outcome == OTPResult.LOCKED:
+        raise HTTPException(status_code=429, detail="Too many incorrect attempts. Please request a new OTP.")
+
+    if outcome == OTPResult.OK:
         # Success
-        del otp_store[request.aadhaar_number] # Clear OTP
         return {
             "status": "verified",
             "message": "Aadhaar Verified Successfully",
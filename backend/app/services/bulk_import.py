@@ -0,0 +1,223 @@
+"""
+Bulk listing import from CSV or NDJSON.
+
+Rows are streamed, validated one by one with the PropertyCreate schema,
+and written in batches, each batch in its own transaction: executemany
+in general, COPY on PostgreSQL (psycopg2). A bad row is reported and
+skipped; it doesn't abort the import.
+
+    cd backend && python -m app.services.bulk_import listings.csv --owner broker@example.com
+
+Every imported listing is also written to the listing_changes log, in
+its batch's transaction. Running API servers (the CLI's bulk-change event
+only reaches its own process) replay the log within LISTINGS_SYNC_SECONDS:
+listing by listing for small imports, by rebuilding their in-process
+indexes when there are more than MAX_REPLAYED_CHANGES new entries.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import time
+import uuid
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from . import listing_events
+from .insights import insight_mappings
+from ..core.config import settings
+from ..db.models import ListingChange, Property, PropertyInsights, VerificationStatus
+
+# Per-row errors returned in the report; the rest are only counted
+MAX_REPORTED_ERRORS = 1000
+
+FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+def import_format(filename: Optional[str], default: str = "csv") -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    return FORMATS.get(ext, default)
+
+
+def _csv_value(value: Optional[str]):
+    if value is None or value.strip() == "":
+        return None
+    return value
+
+
+def _csv_image_urls(value: Optional[str]):
+    # A JSON array, or URLs separated by '|'
+    if not value:
+        return None
+    if value.lstrip().startswith("["):
+        return json.loads(value)
+    return [url.strip() for url in value.split("|") if url.strip()]
+
+
+def read_records(source: BinaryIO, fmt: str) -> Iterator[Tuple[int, object]]:
+    """(row number, raw dict) per record; the dict is an exception if the line can't be parsed."""
+    text = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    if fmt == "ndjson":
+        for number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError as e:
+                yield number, e
+    else:
+        # Row 1 is the header
+        for number, raw in enumerate(csv.DictReader(text), start=2):
+            try:
+                record = {k: _csv_value(v) for k, v in raw.items() if k}
+                record["image_urls"] = _csv_image_urls(record.get("image_urls"))
+                yield number, record
+            except ValueError as e:
+                yield number, e
+    text.detach()
+
+
+def property_row(item, owner_id: str) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "owner_id": owner_id,
+        "title": item.title,
+        "description": item.description,
+        "property_type": item.property_type,
+        "price_fiat": item.price,
+        "area": item.area,
+        "area_unit": item.area_unit,
+        "latitude": item.latitude,
+        "longitude": item.longitude,
+        "mobile": item.mobile,
+        "image_urls": item.image_urls,
+        "status": VerificationStatus.PENDING,
+    }
+
+
+def _copy_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, VerificationStatus):
+        return value.value
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+def _copy(conn, table, rows: List[dict]) -> None:
+    """COPY ... FROM STDIN for one batch, on the transaction's own connection."""
+    columns = list(rows[0])
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow([_copy_value(row[c]) for c in columns])
+    buf.seek(0)
+    cursor = conn.connection.driver_connection.cursor()
+    cursor.copy_expert(
+        f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buf
+    )
+
+
+def _write_batch(engine, rows: List[dict]) -> None:
+    insights = insight_mappings([
+        (r["id"], r["price_fiat"], r["property_type"], r["latitude"], r["longitude"]) for r in rows
+    ])
+    changes = [listing_events.change_row("created", r["id"], r["latitude"], r["longitude"]) for r in rows]
+    use_copy = engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2"
+    with engine.begin() as conn:
+        for table, batch in ((Property.__table__, rows), (PropertyInsights.__table__, insights)):
+            if use_copy:
+                _copy(conn, table, batch)
+            else:
+                conn.execute(table.insert(), batch)
+        # Logged in the same transaction, so a failed batch leaves no entries
+        conn.execute(ListingChange.__table__.insert(), changes)
+
+
+def import_listings(engine, source: BinaryIO, fmt: str, owner_id: str, schema, batch_size: Optional[int] = None) -> dict:
+    """
+    Imports every valid record in source for owner_id. Returns counts and
+    per-row errors ({"row", "error"}; a failed batch reports its row range).
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    started = time.perf_counter()
+    imported = failed = 0
+    errors: List[dict] = []
+
+    def report(error: dict) -> None:
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append(error)
+
+    def flush(batch: List[dict], numbers: List[int]) -> None:
+        nonlocal imported, failed
+        try:
+            _write_batch(engine, batch)
+            imported += len(batch)
+        except Exception as e:
+            failed += len(batch)
+            report({"row": numbers[0], "to_row": numbers[-1], "error": f"Batch not written: {e}"})
+
+    batch: List[dict] = []
+    numbers: List[int] = []
+    for number, record in read_records(source, fmt):
+        if isinstance(record, Exception):
+            failed += 1
+            report({"row": number, "error": f"Unreadable row: {record}"})
+            continue
+        try:
+            item = schema.model_validate(record)
+        except ValidationError as e:
+            failed += 1
+            report({"row": number, "error": "; ".join(
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+            )})
+            continue
+        batch.append(property_row(item, owner_id))
+        numbers.append(number)
+        if len(batch) >= batch_size:
+            flush(batch, numbers)
+            batch, numbers = [], []
+    if batch:
+        flush(batch, numbers)
+
+    if imported:
+        listing_events.properties_bulk_changed()
+    return {
+        "imported": imported,
+        "failed": failed,
+        "errors": errors,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def main():
+    from ..api.endpoints.properties import PropertyCreate
+    from ..db.base import SessionLocal, engine
+    from ..db.models import User
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--owner", required=True, help="email of the user who will own the listings")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        owner = db.query(User.id).filter(User.email == args.owner).first()
+    if owner is None:
+        parser.error(f"no user with email {args.owner}")
+
+    with open(args.path, "rb") as source:
+        result = import_listings(
+            engine, source, args.format or import_format(args.path), owner.id, PropertyCreate, args.batch_size
+        )
+    for error in result["errors"]:
+        print(f"row {error['row']}: {error['error']}")
+    print(f"imported {result['imported']}, failed {result['failed']} in {result['seconds']} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+import math
+import threading
+from collections import Counter
+from typing import Dict, Iterator, Tuple
+
+from . import listing_events
+
+MAX_MERCATOR_LAT = 85.05112878
+
+# A cluster cell at map zoom z is a web-mercator tile at level z + CELL_SHIFT,
+# i.e. a 64px square on a 256px tile.
+CELL_SHIFT = 2
+MAX_CLUSTER_ZOOM = 16
+# From this zoom up the endpoint returns individual listings
+POINT_ZOOM = 15
+
+
+def mercator_cell(lat: float, lon: float, level: int) -> Tuple[int, int]:
+    """Web-mercator tile (x, y) containing the point at the given level."""
+    n = 1 << level
+    lat = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, lat))
+    x = int((lon + 180.0) / 360.0 * n)
+    rad = math.radians(lat)
+    y = int((1.0 - math.log(math.tan(rad) + 1.0 / math.cos(rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+class ClusterCell:
+    """Running aggregate of the listings inside one cell."""
+
+    __slots__ = ("count", "sum_lat", "sum_lon", "price_min", "price_max", "types", "dirty")
+
+    def __init__(self):
+        self.count = 0
+        self.sum_lat = 0.0
+        self.sum_lon = 0.0
+        self.price_min = math.inf
+        self.price_max = -math.inf
+        self.types = Counter()
+        self.dirty = False
+
+    def add(self, lat: float, lon: float, price: float, ptype: str) -> None:
+        self.count += 1
+        self.sum_lat += lat
+        self.sum_lon += lon
+        self.price_min = min(self.price_min, price)
+        self.price_max = max(self.price_max, price)
+        self.types[ptype] += 1
+
+    def remove(self, lat: float, lon: float, price: float, ptype: str) -> None:
+        self.count -= 1
+        self.sum_lat -= lat
+        self.sum_lon -= lon
+        self.types[ptype] -= 1
+        if self.types[ptype] <= 0:
+            del self.types[ptype]
+        # Min/max can't be decremented; rebuilt from the children on next read
+        if price <= self.price_min or price >= self.price_max:
+            self.dirty = True
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "latitude": self.sum_lat / self.count,
+            "longitude": self.sum_lon / self.count,
+            "price_min": self.price_min,
+            "price_max": self.price_max,
+            "types": dict(self.types),
+        }
+
+
+class ClusterIndex:
+    """
+    Hierarchical grid of listing aggregates, one level per map zoom.
+    Each level doubles the resolution of the one above, so a cell's children
+    are the four cells below it. The finest level also keeps its members,
+    which is what individual points and min/max rebuilds are read from.
+    Built lazily from the DB and updated incrementally on create/delete.
+    """
+
+    def __init__(self, max_zoom: int = MAX_CLUSTER_ZOOM, shift: int = CELL_SHIFT):
+        self.min_level = shift
+        self.max_level = max_zoom + shift
+        self._levels: Dict[int, Dict[Tuple[int, int], ClusterCell]] = {
+            level: {} for level in range(self.min_level, self.max_level + 1)
+        }
+        self._members: Dict[Tuple[int, int], Dict[str, Tuple[float, float, float, str]]] = {}
+        self._points: Dict[str, Tuple[float, float, float, str]] = {}
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def ensure_loaded(self, db) -> None:
+        """Builds the index from the properties table on first use (and after outside writes)."""
+        listing_events.sync_external_changes(db)
+        if self._loaded:
+            return
+        from ..db.models import Property
+
+        with self._lock:
+            if self._loaded:
+                return
+            rows = db.query(
+                Property.id, Property.latitude, Property.longitude, Property.price_fiat, Property.property_type
+            ).all()
+            for prop_id, lat, lon, price, ptype in rows:
+                self._insert(prop_id, lat, lon, price, ptype)
+            self._loaded = True
+
+    def reset(self) -> None:
+        with self._lock:
+            for cells in self._levels.values():
+                cells.clear()
+            self._members.clear()
+            self._points.clear()
+            self._loaded = False
+
+    def _insert(self, prop_id, lat, lon, price, ptype) -> None:
+        if lat is None or lon is None:
+            return
+        if prop_id in self._points:
+            self._remove(prop_id)
+        point = (lat, lon, price or 0.0, ptype or "Unknown")
+        self._points[prop_id] = point
+        for level, cells in self._levels.items():
+            key = mercator_cell(lat, lon, level)
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = ClusterCell()
+            cell.add(*point)
+        leaf = mercator_cell(lat, lon, self.max_level)
+        self._members.setdefault(leaf, {})[prop_id] = point
+
+    def _remove(self, prop_id: str) -> None:
+        point = self._points.pop(prop_id, None)
+        if point is None:
+            return
+        lat, lon = point[0], point[1]
+        for level, cells in self._levels.items():
+            key = mercator_cell(lat, lon, level)
+            cell = cells.get(key)
+            if cell is None:
+                continue
+            cell.remove(*point)
+            if cell.count <= 0:
+                del cells[key]
+        leaf = mercator_cell(lat, lon, self.max_level)
+        members = self._members.get(leaf)
+        if members is not None:
+            members.pop(prop_id, None)
+            if not members:
+                del self._members[leaf]
+
+    def add(self, prop_id: str, lat, lon, price, ptype) -> None:
+        # Nothing to sync until the index has been built; the build reads the row.
+        # Checked under the lock: a build in progress holds it, so an event for a
+        # row its snapshot may have missed waits for it and is applied after.
+        with self._lock:
+            if self._loaded:
+                self._insert(prop_id, lat, lon, price, ptype)
+
+    def remove(self, prop_id: str) -> None:
+        with self._lock:
+            if self._loaded:
+                self._remove(prop_id)
+
+    def _clean(self, level: int, key: Tuple[int, int], cell: ClusterCell) -> None:
+        """Recomputes a dirty cell's price range from its children (or members at the leaf)."""
+        if not cell.dirty:
+            return
+        if level == self.max_level:
+            prices = [p[2] for p in self._members.get(key, {}).values()]
+        else:
+            prices = []
+            child_cells = self._levels[level + 1]
+            x, y = key
+            for child_key in ((2 * x, 2 * y), (2 * x + 1, 2 * y), (2 * x, 2 * y + 1), (2 * x + 1, 2 * y + 1)):
+                child = child_cells.get(child_key)
+                if child is not None:
+                    self._clean(level + 1, child_key, child)
+                    prices += [child.price_min, child.price_max]
+        cell.price_min = min(prices) if prices else math.inf
+        cell.price_max = max(prices) if prices else -math.inf
+        cell.dirty = False
+
+    def _cells_in_range(self, x_ranges, y0: int, y1: int, cells) -> Iterator[Tuple[Tuple[int, int], object]]:
+        span = sum(b - a + 1 for a, b in x_ranges) * (y1 - y0 + 1)
+
+        # A large area covers more cells than are occupied; walk the occupied ones instead.
+        if span > len(cells):
+            for key, cell in cells.items():
+                if y0 <= key[1] <= y1 and any(a <= key[0] <= b for a, b in x_ranges):
+                    yield key, cell
+            return
+        for a, b in x_ranges:
+            for x in range(a, b + 1):
+                for y in range(y0, y1 + 1):
+                    cell = cells.get((x, y))
+                    if cell is not None:
+                        yield (x, y), cell
+
+    def _cells_in_bbox(self, level: int, min_lat, min_lon, max_lat, max_lon, cells) -> Iterator[Tuple[Tuple[int, int], object]]:
+        x0, y0 = mercator_cell(max_lat, min_lon, level)
+        x1, y1 = mercator_cell(min_lat, max_lon, level)
+        x_ranges = [(x0, x1)] if x0 <= x1 else [(x0, (1 << level) - 1), (0, x1)]  # antimeridian
+        return self._cells_in_range(x_ranges, y0, y1, cells)
+
+    def _leaves(self, level: int, key: Tuple[int, int]) -> Iterator[Tuple[int, int]]:
+        """Occupied leaf cells below a cell, following only non-empty children."""
+        if level == self.max_level:
+            yield key
+            return
+        x, y = key
+        child_cells = self._levels[level + 1]
+        for child_key in ((2 * x, 2 * y), (2 * x + 1, 2 * y), (2 * x, 2 * y + 1), (2 * x + 1, 2 * y + 1)):
+            if child_key in child_cells:
+                yield from self._leaves(level + 1, child_key)
+
+    def tile(self, z: int, x: int, y: int, point_limit: int) -> dict:
+        """
+        Contents of web-mercator tile z/x/y (z up to max_level): the listings
+        themselves when there are at most point_limit of them (or from
+        POINT_ZOOM up), otherwise the cluster cells inside the tile.
+        """
+        with self._lock:
+            if z <= self.max_level - self.min_level:
+                level = z + self.min_level
+                side = 1 << self.min_level
+                sub = list(self._cells_in_range(
+                    [(x * side, x * side + side - 1)], y * side, y * side + side - 1, self._levels[level]
+                ))
+                total = sum(cell.count for _, cell in sub)
+                if total > point_limit and z < POINT_ZOOM:
+                    for key, cell in sub:
+                        self._clean(level, key, cell)
+                    return {"count": total, "clusters": [cell.to_dict() for _, cell in sub], "points": []}
+                leaves = [leaf for key, _ in sub for leaf in self._leaves(level, key)]
+            else:
+                side = 1 << (self.max_level - z)
+                leaves = [key for key, _ in self._cells_in_range(
+                    [(x * side, x * side + side - 1)], y * side, y * side + side - 1, self._members
+                )]
+
+            points = []
+            for leaf in leaves:
+                for prop_id, (lat, lon, price, ptype) in self._members[leaf].items():
+                    points.append([prop_id, lat, lon, price, ptype])
+            return {"count": len(points), "clusters": [], "points": points}
+
+    def query(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float, zoom: int) -> dict:
+        """
+        Clusters for a viewport at a map zoom level; individual listings
+        instead once zoom reaches POINT_ZOOM.
+        """
+        zoom = max(0, min(int(zoom), self.max_level - self.min_level))
+        with self._lock:
+            if zoom >= POINT_ZOOM:
+                points = []
+                for _, members in self._cells_in_bbox(self.max_level, min_lat, min_lon, max_lat, max_lon, self._members):
+                    for prop_id, (lat, lon, price, ptype) in members.items():
+                        if min_lat <= lat <= max_lat and (
+                            min_lon <= lon <= max_lon if min_lon <= max_lon else (lon >= min_lon or lon <= max_lon)
+                        ):
+                            points.append({
+                                "id": prop_id, "latitude": lat, "longitude": lon,
+                                "price_fiat": price, "property_type": ptype,
+                            })
+                return {"zoom": zoom, "clusters": [], "points": points}
+
+            level = zoom + self.min_level
+            clusters = []
+            for key, cell in self._cells_in_bbox(level, min_lat, min_lon, max_lat, max_lon, self._levels[level]):
+                self._clean(level, key, cell)
+                clusters.append(cell.to_dict())
+            return {"zoom": zoom, "clusters": clusters, "points": []}
+
+
+cluster_index = ClusterIndex()
+
+
+@listing_events.on_created
+def _index_created(prop):
+    cluster_index.add(prop.id, prop.latitude, prop.longitude, prop.price_fiat, prop.property_type)
+
+
+@listing_events.on_deleted
+def _index_deleted(prop):
+    cluster_index.remove(prop.id)
+
+
+@listing_events.on_bulk_change
+def _index_bulk_change():
+    cluster_index.reset()
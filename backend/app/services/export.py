@@ -0,0 +1,74 @@
+"""
+Streaming NDJSON export of listings (GET /properties/export).
+
+Rows come off a server-side cursor (yield_per) in EXPORT_BATCH_SIZE
+partitions and are written out one partition at a time, optionally through
+a streaming gzip compressor, so memory stays flat whatever the table size.
+"""
+import json
+import zlib
+from types import SimpleNamespace
+from typing import Dict, Iterator, Optional
+
+from sqlalchemy import select
+
+from ..core.config import settings
+from ..db.base import SessionLocal
+from ..db.models import Property, PropertyInsights, User
+from .facets import FacetFilters, apply_filters
+from .insights import attach_insights
+
+PROPERTY_COLUMNS = [c.key for c in Property.__table__.columns]
+INSIGHT_COLUMNS = [c.key for c in PropertyInsights.__table__.columns]
+
+_encoder = json.JSONEncoder(separators=(",", ":"), default=str)
+
+
+def _statement(filters: FacetFilters):
+    stmt = select(
+        *Property.__table__.columns,
+        User.full_name.label("owner_name"),
+        User.is_verified.label("owner_is_verified"),
+        *[c.label(f"insights_{c.key}") for c in PropertyInsights.__table__.columns],
+    ).outerjoin(PropertyInsights, PropertyInsights.property_id == Property.id)
+    return apply_filters(stmt, filters, join_owner=True).order_by(Property.id)
+
+
+def _listing(row) -> SimpleNamespace:
+    values = row._mapping
+    prop = SimpleNamespace(**{c: values[c] for c in PROPERTY_COLUMNS})
+    prop.owner_name = values["owner_name"]
+    prop.owner_is_verified = values["owner_is_verified"]
+    prop.insights = (
+        SimpleNamespace(**{c: values[f"insights_{c}"] for c in INSIGHT_COLUMNS})
+        if values["insights_property_id"] is not None else None
+    )
+    return prop
+
+
+def export_lines(filters: FacetFilters, fields: Dict[str, object], batch_size: Optional[int] = None) -> Iterator[bytes]:
+    """
+    NDJSON for every listing matching filters, one chunk per batch. `fields`
+    maps each output field to its default. Runs on its own session, since
+    the response outlives the request's.
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    with SessionLocal() as db:
+        result = db.execute(_statement(filters), execution_options={"yield_per": batch_size})
+        for rows in result.partitions():
+            props = [_listing(row) for row in rows]
+            attach_insights(props)
+            yield "".join(
+                _encoder.encode({f: getattr(p, f, default) for f, default in fields.items()}) + "\n"
+                for p in props
+            ).encode()
+
+
+def gzip_chunks(chunks: Iterator[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compresses a stream of chunks into one gzip member without buffering it."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
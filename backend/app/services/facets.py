@@ -0,0 +1,116 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session, joinedload
+
+from ..db.models import Property, User, VerificationStatus
+
+# Bucket edges for the range facets (price in INR, area in the listing's own unit)
+PRICE_BUCKETS = [2500000, 5000000, 10000000, 20000000, 50000000]
+AREA_BUCKETS = [500, 1000, 2000, 5000]
+
+
+class FacetFilters(BaseModel):
+    property_types: Optional[List[str]] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    min_area: Optional[float] = None
+    max_area: Optional[float] = None
+    area_unit: Optional[str] = None
+    statuses: Optional[List[VerificationStatus]] = None
+    verified_owner: Optional[bool] = None
+
+
+def _owner_verified():
+    # Listings without an owner row count as unverified
+    return func.coalesce(User.is_verified, False)
+
+
+def _clauses(f: FacetFilters, exclude: Optional[str] = None) -> list:
+    """SQL filters for every active facet except `exclude` (multi-select semantics)."""
+    out = []
+    if f.property_types and exclude != "property_type":
+        out.append(Property.property_type.in_(f.property_types))
+    if exclude != "price":
+        if f.min_price is not None:
+            out.append(Property.price_fiat >= f.min_price)
+        if f.max_price is not None:
+            out.append(Property.price_fiat <= f.max_price)
+    if exclude != "area":
+        if f.min_area is not None:
+            out.append(Property.area >= f.min_area)
+        if f.max_area is not None:
+            out.append(Property.area <= f.max_area)
+    if f.area_unit is not None and exclude != "area_unit":
+        out.append(Property.area_unit == f.area_unit)
+    if f.statuses and exclude != "status":
+        out.append(Property.status.in_(f.statuses))
+    if f.verified_owner is not None and exclude != "verified_owner":
+        out.append(_owner_verified() == f.verified_owner)
+    return out
+
+
+def apply_filters(query, f: FacetFilters, exclude: Optional[str] = None, join_owner: bool = False):
+    if join_owner or (f.verified_owner is not None and exclude != "verified_owner"):
+        query = query.outerjoin(User, Property.owner_id == User.id)
+    return query.filter(*_clauses(f, exclude))
+
+
+def _bucket_expr(column, edges: List[float]):
+    return case(*[(column < edge, i) for i, edge in enumerate(edges)], else_=len(edges))
+
+
+def _bucket_labels(edges: List[float]) -> List[dict]:
+    bounds = [None] + list(edges) + [None]
+    return [{"min": bounds[i], "max": bounds[i + 1]} for i in range(len(edges) + 1)]
+
+
+def _group_counts(db: Session, f: FacetFilters, facet: str, key, join_owner: bool = False, where=None) -> dict:
+    """GROUP BY count for one facet, with every other facet's filter applied."""
+    query = db.query(key.label("key"), func.count().label("n")).select_from(Property)
+    query = apply_filters(query, f, exclude=facet, join_owner=join_owner)
+    if where is not None:
+        query = query.filter(where)
+    return {k: n for k, n in query.group_by(key).all()}
+
+
+def facet_counts(db: Session, f: FacetFilters) -> dict:
+    """Counts per value of each facet, computed in the database with GROUP BY."""
+    facets = {}
+
+    types = _group_counts(db, f, "property_type", Property.property_type)
+    facets["property_type"] = {str(k): n for k, n in types.items()}
+
+    statuses = _group_counts(db, f, "status", Property.status)
+    facets["status"] = {(k.value if k is not None else "UNKNOWN"): n for k, n in statuses.items()}
+
+    verified = _group_counts(db, f, "verified_owner", _owner_verified(), join_owner=True)
+    # SQLite returns 1/0 here, which hash like True/False
+    facets["verified_owner"] = {"true": verified.get(True, 0), "false": verified.get(False, 0)}
+
+    units = _group_counts(db, f, "area_unit", Property.area_unit)
+    facets["area_unit"] = {(k or "unknown"): n for k, n in units.items()}
+
+    for facet, column, edges in (("price", Property.price_fiat, PRICE_BUCKETS), ("area", Property.area, AREA_BUCKETS)):
+        counts = _group_counts(db, f, facet, _bucket_expr(column, edges), where=column.isnot(None))
+        facets[facet] = [
+            {**label, "count": counts.get(i, 0)}
+            for i, label in enumerate(_bucket_labels(edges))
+        ]
+
+    return facets
+
+
+def filter_properties(db: Session, f: FacetFilters, limit: int, offset: int):
+    """Total match count and one page of matching listings (owner and insights preloaded)."""
+    total = apply_filters(db.query(func.count(Property.id)), f).scalar()
+    rows = (
+        apply_filters(db.query(Property), f)
+        .options(joinedload(Property.owner), joinedload(Property.insights))
+        .order_by(Property.id)
+        .limit(limit)
+        .offset(offset)
+        .all()
+    )
+    return total, rows
@@ -0,0 +1,184 @@
+import heapq
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from . import listing_events
+
+EARTH_RADIUS_KM = 6371.0088
+# Widens the box by a hair so rounding never drops a point haversine_km accepts
+BOX_PADDING = 1e-9
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    p1 = math.radians(lat1)
+    p2 = math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Returns (min_lat, min_lon, max_lat, max_lon) enclosing the circle, on the
+    same sphere as haversine_km. The longitude span widens towards the poles
+    and covers the whole globe once the circle contains one.
+    """
+    angle = radius_km / EARTH_RADIUS_KM * (1 + BOX_PADDING)
+    dlat = math.degrees(angle)
+    if lat - dlat <= -90.0 or lat + dlat >= 90.0:
+        return max(-90.0, lat - dlat), -180.0, min(90.0, lat + dlat), 180.0
+
+    # Half-width in longitude; the circle's tangent meridians touch it poleward of lat
+    dlon = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(lat)))))
+    return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+
+
+class GeoGridIndex:
+    """
+    In-process uniform grid over (latitude, longitude).
+    Each cell holds the ids of the listings inside it, so a radius query only
+    visits the cells overlapping the search bounding box.
+    Built lazily from the DB and kept in sync on create/delete.
+    """
+
+    def __init__(self, cell_deg: float = 0.05):
+        self.cell_deg = cell_deg
+        self._cells: Dict[Tuple[int, int], Dict[str, Tuple[float, float]]] = {}
+        self._points: Dict[str, Tuple[float, float]] = {}
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lon / self.cell_deg))
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def ensure_loaded(self, db) -> None:
+        """Builds the index from the properties table on first use (and after outside writes)."""
+        listing_events.sync_external_changes(db)
+        if self._loaded:
+            return
+        from ..db.models import Property
+
+        with self._lock:
+            if self._loaded:
+                return
+            rows = db.query(Property.id, Property.latitude, Property.longitude).all()
+            for prop_id, lat, lon in rows:
+                self._insert(prop_id, lat, lon)
+            self._loaded = True
+
+    def reset(self) -> None:
+        """Drops all entries; the next query reloads from the DB."""
+        with self._lock:
+            self._cells.clear()
+            self._points.clear()
+            self._loaded = False
+
+    def _insert(self, prop_id: str, lat: Optional[float], lon: Optional[float]) -> None:
+        if lat is None or lon is None:
+            return
+        if prop_id in self._points:
+            self._remove(prop_id)
+        self._points[prop_id] = (lat, lon)
+        self._cells.setdefault(self._cell(lat, lon), {})[prop_id] = (lat, lon)
+
+    def _remove(self, prop_id: str) -> None:
+        point = self._points.pop(prop_id, None)
+        if point is None:
+            return
+        key = self._cell(*point)
+        bucket = self._cells.get(key)
+        if bucket is not None:
+            bucket.pop(prop_id, None)
+            if not bucket:
+                del self._cells[key]
+
+    def add(self, prop_id: str, lat: Optional[float], lon: Optional[float]) -> None:
+        # Nothing to sync until the index has been built; the build reads the row.
+        # Checked under the lock: a build in progress holds it, so an event for a
+        # row its snapshot may have missed waits for it and is applied after.
+        with self._lock:
+            if self._loaded:
+                self._insert(prop_id, lat, lon)
+
+    def remove(self, prop_id: str) -> None:
+        with self._lock:
+            if self._loaded:
+                self._remove(prop_id)
+
+    def _bbox_buckets(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float):
+        lat0, lon0 = self._cell(min_lat, min_lon)
+        lat1, lon1 = self._cell(max_lat, max_lon)
+        span = (lat1 - lat0 + 1) * (lon1 - lon0 + 1)
+
+        # A huge box touches more cells than are occupied; walk the occupied ones instead.
+        if span > len(self._cells):
+            for (ci, cj), bucket in self._cells.items():
+                if lat0 <= ci <= lat1 and lon0 <= cj <= lon1:
+                    yield bucket
+            return
+
+        for ci in range(lat0, lat1 + 1):
+            for cj in range(lon0, lon1 + 1):
+                bucket = self._cells.get((ci, cj))
+                if bucket:
+                    yield bucket
+
+    def within_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> List[Tuple[str, float, float]]:
+        """Returns (id, lat, lon) for every listing inside the box."""
+        with self._lock:
+            found = []
+            for bucket in self._bbox_buckets(min_lat, min_lon, max_lat, max_lon):
+                for prop_id, (plat, plon) in bucket.items():
+                    if min_lat <= plat <= max_lat and min_lon <= plon <= max_lon:
+                        found.append((prop_id, plat, plon))
+            return found
+
+    def nearby(self, lat: float, lon: float, radius_km: float, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Returns (id, distance_km) pairs within radius_km, nearest first.
+        Bounding-box prefilter on the grid, then an exact haversine check.
+        """
+        min_lat, min_lon, max_lat, max_lon = bounding_box(lat, lon, radius_km)
+
+        boxes = [(min_lat, min_lon, max_lat, max_lon)]
+        # Split boxes that wrap around the antimeridian
+        if min_lon < -180.0:
+            boxes = [(min_lat, min_lon + 360.0, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon)]
+        elif max_lon > 180.0:
+            boxes = [(min_lat, min_lon, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon - 360.0)]
+
+        hits = []
+        for box in boxes:
+            for prop_id, plat, plon in self.within_bbox(*box):
+                dist = haversine_km(lat, lon, plat, plon)
+                if dist <= radius_km:
+                    hits.append((prop_id, dist))
+
+        if limit is not None:
+            return heapq.nsmallest(limit, hits, key=lambda h: h[1])
+        hits.sort(key=lambda h: h[1])
+        return hits
+
+
+geo_index = GeoGridIndex()
+
+
+@listing_events.on_created
+def _index_created(prop):
+    geo_index.add(prop.id, prop.latitude, prop.longitude)
+
+
+@listing_events.on_deleted
+def _index_deleted(prop):
+    geo_index.remove(prop.id)
+
+
+@listing_events.on_bulk_change
+def _index_bulk_change():
+    geo_index.reset()
@@ -0,0 +1,74 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from ..core.config import settings
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class ImageWorkerCrashed(Exception):
+    """An image worker died running the job (e.g. OOM on a huge upload); the input is not retried."""
+
+    def __init__(self):
+        super().__init__("Image processing failed: the image may be too large or corrupt")
+
+
+def image_pool() -> ProcessPoolExecutor:
+    """Process pool for CPU-heavy image work (analysis, thumbnails), started on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn: forking a server process that already runs threads isn't safe
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.IMAGE_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+async def run_image_job(fn, *args):
+    """
+    Runs fn(*args) in the image worker pool (or the threadpool with
+    IMAGE_WORKERS=0). fn must be a module-level function and args
+    picklable; pass file paths rather than large byte strings.
+    """
+    if settings.IMAGE_WORKERS <= 0:
+        return await run_in_threadpool(fn, *args)
+    loop = asyncio.get_running_loop()
+    pool = image_pool()
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool as e:
+        # The input may be what killed the worker, so it is not rerun here in
+        # the API process; start a fresh pool for the next job
+        shutdown_image_pool(pool)
+        raise ImageWorkerCrashed() from e
+
+
+def run_image_job_sync(fn, *args):
+    """run_image_job() for callers already on a worker thread, with the same broken-pool handling."""
+    if settings.IMAGE_WORKERS <= 0:
+        return fn(*args)
+    pool = image_pool()
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool as e:
+        shutdown_image_pool(pool)
+        raise ImageWorkerCrashed() from e
+
+
+def shutdown_image_pool(pool: Optional[ProcessPoolExecutor] = None) -> None:
+    """Shuts the pool down; given `pool`, only if it is still the current one (another caller may have replaced it)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None and (pool is None or pool is _pool):
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
@@ -0,0 +1,302 @@
+from datetime import datetime, timedelta
+from operator import attrgetter, itemgetter
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..db.models import Property, PropertyInsights
+from .metrics import timed
+
+DIRECTIONS = ["North", "North-East", "East", "South-East", "South", "South-West", "West", "North-West"]
+
+# Insight fields of PropertyResponse
+INSIGHT_FIELDS = [
+    "ai_valuation_min", "ai_valuation_max", "ai_valuation_verdict", "investment_score",
+    "walk_score", "safety_index", "nearby_schools", "nearby_hospitals", "nearby_parks",
+    "price_history", "is_360_ready", "is_fractional", "token_price", "total_tokens",
+    "sold_tokens", "yield_rate", "is_auction", "auction_end_time", "current_bid",
+    "total_bids", "facing", "vastu_score", "noise_level", "decibels",
+    "is_blockchain_verified", "contract_address",
+]
+
+# Stored on PropertyInsights. Auctions run in back-to-back AUCTION_WINDOWs
+# (UTC days), so auction_end_time is derived from is_auction when read,
+# never stored.
+STORED_FIELDS = [f for f in INSIGHT_FIELDS if f != "auction_end_time"]
+AUCTION_WINDOW = timedelta(hours=24)
+EPOCH = datetime(1970, 1, 1)
+
+
+def auction_end_time(now: Optional[datetime] = None) -> str:
+    """
+    ISO end time of an auction shown at `now`: the end of the current
+    AUCTION_WINDOW. Every read within a window gets the same value, so an
+    unchanged listing serializes (and ETags) the same on every worker.
+    """
+    windows = ((now or datetime.utcnow()) - EPOCH) // AUCTION_WINDOW
+    return (EPOCH + (windows + 1) * AUCTION_WINDOW).isoformat()
+
+
+# 64-bit FNV-1a
+FNV_PRIME = 0x100000001b3
+FNV_BASIS = 0xcbf29ce484222325
+
+HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+
+def stable_hashes(prop_ids: Sequence[str]) -> np.ndarray:
+    """Process-independent 64-bit FNV-1a hashes of listing ids (unlike the salted builtin hash()), one byte column per step."""
+    n = len(prop_ids)
+    h = np.full(n, FNV_BASIS, dtype=np.uint64)
+    if n == 0:
+        return h
+    raw = np.array([pid.encode("utf-8") for pid in prop_ids])
+    columns = np.ascontiguousarray(raw.view(np.uint8).reshape(n, raw.itemsize).T).astype(np.uint64)
+    prime = np.uint64(FNV_PRIME)
+    for col in columns:
+        step = (h ^ col) * prime
+        # Shorter ids are NUL padded; padding bytes leave the hash untouched
+        h = step if col.all() else np.where(col != 0, step, h)
+    return h
+
+
+def _hex(values: np.ndarray, digits: int) -> np.ndarray:
+    """Fixed-width lowercase hex of uint64 values as a bytes array."""
+    shifts = np.arange(digits - 1, -1, -1, dtype=np.uint64) * np.uint64(4)
+    nibbles = (values[:, None] >> shifts) & np.uint64(0xF)
+    return np.ascontiguousarray(HEX_DIGITS[nibbles]).view(f"S{digits}").ravel()
+
+
+def compute_insights_batch(prop_ids: Sequence[str], prices: Sequence[Optional[float]],
+                           property_types: Sequence[Optional[str]],
+                           latitudes: Optional[Sequence[float]] = None,
+                           longitudes: Optional[Sequence[float]] = None) -> Dict[str, np.ndarray]:
+    """
+    Mock AI logic for N listings at once, using NumPy array operations
+    instead of per-row branching. Deterministic for a given id/price/type,
+    so any worker computes the same values; writes use it with N = 1.
+    Returns one array per insight field (price_history is an N x 3 array of
+    yearly prices); insight_rows() turns them into per-listing dicts.
+    """
+    n = len(prop_ids)
+    price = np.array(prices, dtype=np.float64).reshape(n)
+    price = np.nan_to_num(price, nan=0.0)
+    ptype = np.array(property_types, dtype=object).reshape(n)
+    hashes = stable_hashes(prop_ids)
+    seed = (hashes % np.uint64(100)).astype(np.int64)
+    out = {}
+
+    # 1. Valuation
+    val_min = price * 0.9
+    val_max = price * 1.15
+    out["ai_valuation_min"] = val_min
+    out["ai_valuation_max"] = val_max
+    out["ai_valuation_verdict"] = np.select(
+        [price < val_min, price > val_max],
+        ["Underpriced (Steal!)", "Overpriced"],
+        default="Fair Market Price"
+    )
+
+    # 2. Investment Score (0-10)
+    score = 7.0 + np.where((ptype == "Commercial") | (ptype == "Plot"), 1.5, 0.0) + np.where(price < 5000000, 1.0, 0.0)
+    out["investment_score"] = np.minimum(score, 10.0)
+
+    # 3. Neighborhood Stats
+    safety = 7 + seed % 3
+    out["walk_score"] = 60 + seed % 40
+    out["safety_index"] = safety
+    out["nearby_schools"] = 2 + seed % 4
+    out["nearby_hospitals"] = 1 + seed % 3
+    out["nearby_parks"] = 1 + seed % 5
+
+    # 4. Price History
+    out["price_history"] = np.trunc(price[:, None] * np.array([0.85, 0.92, 1.0])).astype(np.int64)
+
+    # 5. Infinity Features
+    out["is_360_ready"] = price > 5000000
+
+    fractional = (ptype == "Commercial") & (price > 10000000)
+    total_tokens = np.trunc(price / 5000).astype(np.int64)
+    out["is_fractional"] = fractional
+    out["token_price"] = np.where(fractional, 5000.0, 0.0)
+    out["total_tokens"] = np.where(fractional, total_tokens, 1000)
+    out["sold_tokens"] = np.where(fractional, np.trunc(total_tokens * ((seed % 80) / 100)).astype(np.int64), 0)
+    out["yield_rate"] = np.where(fractional, 8.5 + (seed % 40) / 10.0, 0.0)
+
+    auction = seed % 5 == 0
+    out["is_auction"] = auction
+    out["current_bid"] = np.where(auction, price * 1.05, 0.0)
+    out["total_bids"] = np.where(auction, 12 + seed % 20, 0)
+
+    # 6. Galactic Features
+    facing_idx = seed % 8
+    out["facing"] = np.array(DIRECTIONS)[facing_idx]
+    out["vastu_score"] = np.where(facing_idx <= 2, 9 + seed % 2, 6 + seed % 4)
+
+    # 7. Cosmic Tier Features
+    quiet = safety > 8
+    buzz = ~quiet & (safety > 6)
+    out["noise_level"] = np.select([quiet, buzz], ["Whisper Quiet", "Urban Buzz"], default="Traffic Heavy")
+    out["decibels"] = np.select([quiet, buzz], [35 + seed % 10, 50 + seed % 15], default=70 + seed % 10)
+
+    # 8. Universal Tier Features (Mock)
+    chain = price > 7500000
+    out["is_blockchain_verified"] = chain
+    addresses = np.full(n, None, dtype=object)
+    idx = np.flatnonzero(chain)
+    if idx.size:
+        h = hashes[idx]
+        head = _hex(h, 16)
+        tail = _hex((h * np.uint64(FNV_PRIME)) >> np.uint64(48), 4)
+        addresses[idx] = np.char.add(np.char.add(np.char.add(b"0x", head), b"..."), tail).astype(str)
+    out["contract_address"] = addresses
+
+    return out
+
+
+def _plain_columns(columns: Dict[str, np.ndarray]) -> Dict[str, list]:
+    """compute_insights_batch() output as lists of plain Python values, one per field."""
+    values = {k: v.tolist() for k, v in columns.items()}
+    values["price_history"] = [
+        [{"year": 2023, "price": a}, {"year": 2024, "price": b}, {"year": 2025, "price": c}]
+        for a, b, c in values["price_history"]
+    ]
+    return values
+
+
+def insight_rows(columns: Dict[str, np.ndarray]) -> List[dict]:
+    """Turns compute_insights_batch() output into one dict of plain values per listing."""
+    values = _plain_columns(columns)
+    names = list(values)
+    return [dict(zip(names, row)) for row in zip(*values.values())]
+
+
+def assign_insights(props: Sequence, columns: Dict[str, np.ndarray], ends_at: Optional[str] = None) -> None:
+    """
+    Sets compute_insights_batch() output on the objects, with no dict per
+    row. Insight fields are plain instance attributes (not mapped columns),
+    so one __dict__ update per object sets them all.
+    """
+    values = _plain_columns(columns)
+    ends_at = ends_at or auction_end_time()
+    values["auction_end_time"] = [ends_at if a else None for a in values["is_auction"]]
+    names = list(values)
+    for prop, row in zip(props, zip(*values.values())):
+        vars(prop).update(zip(names, row))
+
+
+def is_stale(insights: Optional[PropertyInsights], prop: Property) -> bool:
+    """True when there are no stored insights or their inputs no longer match the listing."""
+    if insights is None:
+        return True
+    return _loaded(insights, _item_inputs, _read_inputs) != _listing_inputs(prop)
+
+
+def refresh_insights(prop: Property) -> PropertyInsights:
+    """(Re)computes the stored insights for a listing in place."""
+    values = insight_rows(compute_insights_batch(
+        [prop.id], [prop.price_fiat], [prop.property_type], [prop.latitude], [prop.longitude]
+    ))[0]
+    insights = prop.insights
+    if insights is None:
+        insights = PropertyInsights(property_id=prop.id)
+        prop.insights = insights
+    insights.input_price = prop.price_fiat
+    insights.input_type = prop.property_type
+    insights.input_latitude = prop.latitude
+    insights.input_longitude = prop.longitude
+    for field, value in values.items():
+        setattr(insights, field, value)
+    return insights
+
+
+def insight_mappings(batch: Sequence[tuple]) -> List[dict]:
+    """property_insights rows for (id, price, type, latitude, longitude) tuples."""
+    ids, prices, types, lats, lons = zip(*batch)
+    rows = insight_rows(compute_insights_batch(ids, prices, types, lats, lons))
+    for row, (pid, price, ptype, lat, lon) in zip(rows, batch):
+        row.update(property_id=pid, input_price=price, input_type=ptype, input_latitude=lat, input_longitude=lon)
+    return rows
+
+
+def backfill_insights(db: Session, batch_size: int = 2000) -> int:
+    """Persists insights for listings that have none yet. Returns the number filled."""
+    filled = 0
+    while True:
+        batch = (
+            db.query(Property.id, Property.price_fiat, Property.property_type, Property.latitude, Property.longitude)
+            .outerjoin(PropertyInsights, PropertyInsights.property_id == Property.id)
+            .filter(PropertyInsights.property_id.is_(None))
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            return filled
+        db.bulk_insert_mappings(PropertyInsights, insight_mappings(batch))
+        db.commit()
+        filled += len(batch)
+
+
+INPUT_COLUMNS = ("input_price", "input_type", "input_latitude", "input_longitude")
+_read_inputs = attrgetter(*INPUT_COLUMNS)
+_item_inputs = itemgetter(*INPUT_COLUMNS)
+# Inputs then stored values, in one call per listing on the read path
+_read_checked = attrgetter(*INPUT_COLUMNS, *STORED_FIELDS)
+_item_checked = itemgetter(*INPUT_COLUMNS, *STORED_FIELDS)
+_listing_inputs = attrgetter("price_fiat", "property_type", "latitude", "longitude")
+
+
+def _loaded(insights, items, attrs) -> tuple:
+    # Loaded column values sit in the instance dict; reading them there
+    # skips SQLAlchemy's attribute instrumentation (several times faster)
+    try:
+        return items(vars(insights))
+    except KeyError:
+        # Expired or deferred attributes load through the instrumentation
+        return attrs(insights)
+
+
+def attach_insights(props: Sequence) -> None:
+    """
+    Puts insights on each response object (ORM row or namespace with an
+    optional `insights` attribute). Stored values are used when fresh; the
+    rest are computed in one compute_insights_batch() call.
+
+    Fresh stored values cost one getter call and one __dict__ update per
+    listing. That per-object work is what's left: at 50k listings this is
+    about 6x faster than computing insights per object, and about 4x when
+    all of them are computed (benchmarks/bench_insights.py).
+    """
+    with timed("insights"):
+        ends_at = auction_end_time()
+        n_inputs = len(INPUT_COLUMNS)
+        stale = []
+        for prop in props:
+            insights = getattr(prop, "insights", None)
+            if insights is None:
+                stale.append(prop)
+                continue
+            row = _loaded(insights, _item_checked, _read_checked)
+            if row[:n_inputs] != _listing_inputs(prop):
+                stale.append(prop)
+                continue
+            values = vars(prop)
+            values.update(zip(STORED_FIELDS, row[n_inputs:]))
+            values["auction_end_time"] = ends_at if values["is_auction"] else None
+        if not stale:
+            return
+        columns = compute_insights_batch(
+            [p.id for p in stale], [p.price_fiat for p in stale], [p.property_type for p in stale],
+            [p.latitude for p in stale], [p.longitude for p in stale]
+        )
+        assign_insights(stale, columns, ends_at)
+
+
+@event.listens_for(Session, "before_flush")
+def _maintain_insights(session, flush_context, instances):
+    # Recompute only for new listings and ones whose price/type/location changed
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Property) and obj.id is not None and is_stale(obj.insights, obj):
+            refresh_insights(obj)
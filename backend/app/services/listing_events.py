@@ -0,0 +1,187 @@
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+# In-process indexes (geo grid, clusters, ...) subscribe here so the
+# endpoints that write listings only have to announce the change once.
+_created: List[Callable] = []
+_deleted: List[Callable] = []
+_bulk: List[Callable] = []
+
+# Writes also go to the listing_changes log so other processes can replay
+# them; a process skips the entries it wrote itself.
+PROCESS_ID = uuid.uuid4().hex
+# More outside changes than this in one sync: rebuild instead of replaying
+MAX_REPLAYED_CHANGES = 1000
+# How long a skipped seq is looked for again (a write whose seq was taken
+# but which committed after a later one, or rolled back)
+GAP_WAIT_SECONDS = 60.0
+
+_last_seq: Optional[int] = None  # Highest seq replayed; None until the first sync
+_gaps: Dict[int, float] = {}  # Skipped seq -> monotonic time to stop looking
+_synced_at = 0.0
+_next_sync = 0.0
+_next_prune = 0.0
+_sync_lock = threading.Lock()
+
+
+def on_created(handler: Callable) -> Callable:
+    """Registers handler(prop) to run after a listing is committed."""
+    _created.append(handler)
+    return handler
+
+
+def on_deleted(handler: Callable) -> Callable:
+    """Registers handler(prop) to run after a listing's deletion is committed."""
+    _deleted.append(handler)
+    return handler
+
+
+def on_bulk_change(handler: Callable) -> Callable:
+    """
+    Registers handler() to run after many listings changed at once (a bulk
+    import). Handlers drop their state; indexes rebuild lazily on next use.
+    """
+    _bulk.append(handler)
+    return handler
+
+
+def property_created(prop) -> None:
+    for handler in _created:
+        handler(prop)
+
+
+def property_deleted(prop) -> None:
+    for handler in _deleted:
+        handler(prop)
+
+
+def properties_bulk_changed() -> None:
+    for handler in _bulk:
+        handler()
+
+
+def change_row(kind: str, property_id: str, latitude: Optional[float], longitude: Optional[float]) -> dict:
+    """A listing_changes row (kind "created" or "deleted") written by this process."""
+    return {
+        "kind": kind,
+        "property_id": property_id,
+        "latitude": latitude,
+        "longitude": longitude,
+        "origin": PROCESS_ID,
+        "created_at": time.time(),
+    }
+
+
+def record_change(db, kind: str, prop) -> None:
+    """Adds the write to the change log in db's transaction; commit it with the write."""
+    from ..db.models import ListingChange
+
+    db.add(ListingChange(**change_row(kind, prop.id, prop.latitude, prop.longitude)))
+
+
+def _prune(before: float) -> None:
+    """Drops log entries older than before (Unix time), in a session of its own."""
+    from ..db.base import SessionLocal
+    from ..db.models import ListingChange
+
+    with SessionLocal() as db:
+        db.query(ListingChange).filter(ListingChange.created_at < before).delete(synchronize_session=False)
+        db.commit()
+
+
+def sync_external_changes(db) -> None:
+    """
+    Replays listing writes made by other processes (other API workers, the
+    bulk_import CLI), which fire no events here, at most every
+    LISTINGS_SYNC_SECONDS. Each one runs the same handlers as a local
+    write, so indexes and caches are updated incrementally; only more than
+    MAX_REPLAYED_CHANGES at once, or a log pruned past this process's
+    position, falls back to the bulk-change handlers.
+    """
+    from sqlalchemy import func, or_
+
+    from ..core.config import settings
+    from ..db.models import ListingChange, Property
+
+    global _last_seq, _synced_at, _next_sync, _next_prune
+    interval = settings.LISTINGS_SYNC_SECONDS
+    if interval <= 0:
+        return
+    now = time.monotonic()
+    if now < _next_sync or not _sync_lock.acquire(blocking=False):
+        return
+    try:
+        if now < _next_sync:
+            return
+        _next_sync = now + interval
+
+        retention = settings.LISTING_CHANGES_RETENTION_SECONDS
+        if now >= _next_prune:
+            _next_prune = now + retention / 10
+            _prune(time.time() - retention)
+
+        def skip_to_end(rebuild: bool) -> None:
+            global _last_seq, _synced_at
+            _last_seq = db.query(func.max(ListingChange.seq)).scalar() or 0
+            _gaps.clear()
+            _synced_at = now
+            if rebuild:
+                properties_bulk_changed()
+
+        if _last_seq is None:
+            # Indexes are built after this, so they start out current
+            skip_to_end(rebuild=False)
+            return
+        if now - _synced_at > retention / 2:
+            # Entries we haven't replayed may have been pruned
+            skip_to_end(rebuild=True)
+            return
+
+        for seq, give_up in list(_gaps.items()):
+            if give_up <= now:
+                del _gaps[seq]
+        wanted = ListingChange.seq > _last_seq
+        if _gaps:
+            wanted = or_(wanted, ListingChange.seq.in_(list(_gaps)))
+        changes = (
+            db.query(ListingChange.seq, ListingChange.kind, ListingChange.property_id,
+                     ListingChange.latitude, ListingChange.longitude, ListingChange.origin)
+            .filter(wanted)
+            .order_by(ListingChange.seq)
+            .limit(MAX_REPLAYED_CHANGES + 1)
+            .all()
+        )
+        if len(changes) > MAX_REPLAYED_CHANGES:
+            skip_to_end(rebuild=True)
+            return
+        _synced_at = now
+        if not changes:
+            return
+
+        seen = {c.seq for c in changes}
+        for seq in seen:
+            _gaps.pop(seq, None)
+        top = max(_last_seq, changes[-1].seq)
+        for seq in range(_last_seq + 1, top):
+            if seq not in seen:
+                _gaps[seq] = now + GAP_WAIT_SECONDS
+        _last_seq = top
+
+        outside = [c for c in changes if c.origin != PROCESS_ID]
+        created_ids = [c.property_id for c in outside if c.kind == "created"]
+        props = {}
+        if created_ids:
+            props = {p.id: p for p in db.query(Property).filter(Property.id.in_(created_ids))}
+        for change in outside:
+            if change.kind == "deleted":
+                property_deleted(SimpleNamespace(
+                    id=change.property_id, latitude=change.latitude, longitude=change.longitude
+                ))
+            elif change.property_id in props:
+                # Not found: deleted since, and its own entry follows
+                property_created(props[change.property_id])
+    finally:
+        _sync_lock.release()
@@ -0,0 +1,235 @@
+"""
+In-process metrics in the Prometheus text format (GET /metrics).
+
+MetricsMiddleware records per-route latency, status counts and requests in
+flight. Engine events add each statement's count and time to the current
+request through a context variable, and timed() wraps internal stages
+(insights, verification). Values are per process: with several API
+workers, scrape each one.
+"""
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped)) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, value: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_labels(self.labels, k)} {v}" for k, v in values]
+        return lines
+
+
+class Gauge(Counter):
+    def dec(self, *labels: str, value: float = 1.0) -> None:
+        self.inc(*labels, value=-value)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    """Fixed buckets; one observe() is a bisect and a few additions under a lock."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (+Inf last), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((k, (list(counts), total)) for k, (counts, total) in self._series.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.labels + ("le",)
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f"{self.name}_bucket{_labels(names, key + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: list = []
+        # Called at scrape time; each returns (name, type, help, [(labels dict, value)])
+        self.collectors: List[Callable[[], list]] = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines += metric.render()
+        for collect in self.collectors:
+            for name, kind, help, samples in collect():
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                lines += [f"{name}{_labels(list(l), list(l.values()))} {v}" for l, v in samples]
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.add(Counter(
+    "http_requests_total", "HTTP responses by route and status.", ["method", "route", "status"]))
+http_latency = registry.add(Histogram(
+    "http_request_duration_seconds", "Time to the last byte of the response.", ["method", "route"]))
+http_in_flight = registry.add(Gauge(
+    "http_requests_in_flight", "Requests being handled."))
+db_queries = registry.add(Histogram(
+    "http_request_db_queries", "SQL statements executed per request.", ["route"], QUERY_COUNT_BUCKETS))
+db_time = registry.add(Histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per request.", ["route"]))
+db_statements = registry.add(Counter(
+    "db_statements_total", "SQL statements executed, including outside requests."))
+db_statement_seconds = registry.add(Counter(
+    "db_statement_seconds_total", "Time spent in SQL statements, including outside requests."))
+stage_latency = registry.add(Histogram(
+    "app_stage_duration_seconds", "Time spent in instrumented internal stages.", ["stage"], STAGE_BUCKETS))
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# Set per request by the middleware; the object is shared with the
+# threadpool and greenlet contexts the request's queries run in
+_request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("request_stats", default=None)
+
+
+@contextmanager
+def timed(stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_latency.observe(time.perf_counter() - started, stage)
+
+
+def instrument_engine(engine) -> None:
+    """Counts statements and their time, globally and for the current request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_started
+        db_statements.inc()
+        db_statement_seconds.inc(value=elapsed)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+
+
+def route_template(scope) -> str:
+    """
+    The matched route's path template, e.g. /properties/{id}. Routes of an
+    included router may carry only their own part of the path; the prefix
+    is then whatever precedes that part in the request path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    try:
+        rendered = template.format(**{k: str(v) for k, v in scope.get("path_params", {}).items()})
+    except (KeyError, IndexError, ValueError):
+        return template
+    path = scope["path"]
+    if path.endswith(rendered):
+        return path[:len(path) - len(rendered)] + template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (no per-request task or body buffering). Routes
+    are labelled by their path template, so /properties/{id} is one series.
+    """
+
+    def __init__(self, app, skip: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.skip = set(skip)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status = 500
+        started = time.perf_counter()
+        http_in_flight.inc()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_in_flight.dec()
+            _request_stats.reset(token)
+            path = route_template(scope)
+            method = scope["method"]
+            http_requests.inc(method, path, str(status))
+            http_latency.observe(elapsed, method, path)
+            db_queries.observe(stats.queries, path)
+            db_time.observe(stats.db_seconds, path)
@@ -0,0 +1,151 @@
+import enum
+import hashlib
+import hmac
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import select
+
+from ..core.config import settings
+from ..core.security import SECRET_KEY
+from ..db.base import SessionLocal
+from ..db.models import OTPCode
+
+
+class OTPResult(str, enum.Enum):
+    OK = "ok"
+    MISMATCH = "mismatch"
+    MISSING = "missing"  # Never sent, expired, or already used
+    LOCKED = "locked"  # Too many wrong attempts; a new OTP is needed
+
+
+def _digest(value: str) -> str:
+    # Keys (Aadhaar numbers) and codes are only kept as HMACs
+    return hmac.new(SECRET_KEY.encode(), value.encode(), hashlib.sha256).hexdigest()
+
+
+class OTPStore(ABC):
+    """
+    Outstanding OTPs with a TTL, a cap on how many are held (memory store), and a
+    per-OTP attempt counter. Sending again replaces the code and resets
+    the counter; a correct code is consumed.
+    """
+
+    def __init__(self, ttl: float, max_attempts: int, max_entries: int):
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self.max_entries = max_entries
+
+    @abstractmethod
+    def put(self, key: str, otp: str) -> None:
+        ...
+
+    @abstractmethod
+    def verify(self, key: str, otp: str) -> OTPResult:
+        ...
+
+
+class MemoryOTPStore(OTPStore):
+    """Per-process store; only correct with a single API worker."""
+
+    def __init__(self, ttl: float, max_attempts: int, max_entries: int):
+        super().__init__(ttl, max_attempts, max_entries)
+        # key -> [otp_hash, expires_at, attempts], oldest first
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _purge(self, now: float) -> None:
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            # Every entry has the same TTL, so insertion order is expiry order
+            if entry[1] > now and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[key]
+
+    def put(self, key: str, otp: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._entries.pop(_digest(key), None)
+            self._entries[_digest(key)] = [_digest(otp), now + self.ttl, 0]
+            self._purge(now)
+
+    def verify(self, key: str, otp: str) -> OTPResult:
+        key = _digest(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                self._entries.pop(key, None)
+                return OTPResult.MISSING
+            if hmac.compare_digest(entry[0], _digest(otp)):
+                del self._entries[key]
+                return OTPResult.OK
+            entry[2] += 1
+            if entry[2] >= self.max_attempts:
+                del self._entries[key]
+                return OTPResult.LOCKED
+            return OTPResult.MISMATCH
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DatabaseOTPStore(OTPStore):
+    """
+    Store in the otp_codes table, shared by every API worker. Rows are
+    bounded by the TTL rather than max_entries: each send deletes up to
+    EXPIRED_SWEEP expired rows (through the expires_at index), which keeps
+    ahead of the one row it adds.
+    """
+
+    EXPIRED_SWEEP = 100
+
+    def put(self, key: str, otp: str) -> None:
+        now = time.time()
+        with SessionLocal() as db:
+            expired = select(OTPCode.key).where(OTPCode.expires_at <= now).limit(self.EXPIRED_SWEEP)
+            db.query(OTPCode).filter(OTPCode.key.in_(expired)).delete(synchronize_session=False)
+            db.merge(OTPCode(key=_digest(key), otp_hash=_digest(otp), attempts=0, created_at=now, expires_at=now + self.ttl))
+            db.commit()
+
+    def verify(self, key: str, otp: str) -> OTPResult:
+        key = _digest(key)
+        now = time.time()
+        with SessionLocal() as db:
+            row = db.get(OTPCode, key)
+            if row is None or row.expires_at <= now:
+                return OTPResult.MISSING
+            if hmac.compare_digest(row.otp_hash, _digest(otp)):
+                # Conditional delete: of two concurrent correct guesses only one wins
+                used = (
+                    db.query(OTPCode)
+                    .filter(OTPCode.key == key, OTPCode.otp_hash == row.otp_hash)
+                    .delete(synchronize_session=False)
+                )
+                db.commit()
+                return OTPResult.OK if used else OTPResult.MISSING
+            # Count the attempt in SQL so concurrent guesses on other workers add up
+            db.query(OTPCode).filter(OTPCode.key == key).update(
+                {OTPCode.attempts: OTPCode.attempts + 1}, synchronize_session=False
+            )
+            attempts = db.query(OTPCode.attempts).filter(OTPCode.key == key).scalar()
+            if attempts is None:
+                db.commit()
+                return OTPResult.MISSING
+            if attempts >= self.max_attempts:
+                db.query(OTPCode).filter(OTPCode.key == key).delete(synchronize_session=False)
+                db.commit()
+                return OTPResult.LOCKED
+            db.commit()
+            return OTPResult.MISMATCH
+
+
+def create_otp_store(backend: Optional[str] = None) -> OTPStore:
+    backend = backend or settings.OTP_STORE
+    store = MemoryOTPStore if backend == "memory" else DatabaseOTPStore
+    return store(settings.OTP_TTL_SECONDS, settings.OTP_MAX_ATTEMPTS, settings.OTP_MAX_ENTRIES)
+
+
+otp_store = create_otp_store()
@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.models import User
+
+
+class PrincipalCache:
+    """
+    Bounded TTL cache of authenticated callers, keyed by bearer token.
+    A hit skips both the JWT decode and the user lookup. Entries never
+    outlive the token's own expiry and are dropped when the user row is
+    written (see the session hooks below).
+
+    Cached users are detached instances shared between requests: read
+    their columns, don't modify them or add them to a session.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[User, float]]" = OrderedDict()
+        self._by_subject: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        # Bumped on invalidation so a lookup that raced a write isn't stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _drop(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._by_subject.get(entry[0].email)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_subject[entry[0].email]
+
+    def get(self, token: str) -> Optional[User]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[1] < time.time():
+                if entry is not None:
+                    self._drop(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, token: str, user: User, token_exp: Optional[float], generation: int) -> None:
+        if self.max_entries <= 0:
+            return
+        expires = time.time() + self.ttl
+        if token_exp is not None:
+            expires = min(expires, token_exp)
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._drop(token)
+            self._entries[token] = (user, expires)
+            self._by_subject.setdefault(user.email, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, *subjects: str) -> None:
+        with self._lock:
+            self.generation += 1
+            for subject in subjects:
+                for token in list(self._by_subject.get(subject, ())):
+                    self._drop(token)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._by_subject.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_MAX_ENTRIES, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+# Invalidate on ORM writes to a user row (AsyncSession runs these hooks too).
+# Bulk query.update() bypasses them; call principal_cache.invalidate() there.
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    subjects = session.info.setdefault("principal_subjects", set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            subjects.add(obj.email)
+            # Tokens issued for the old address must stop resolving too
+            subjects.update(inspect(obj).attrs.email.history.deleted or ())
+    if subjects:
+        # Drop now as well, so this request's own later reads are fresh
+        principal_cache.invalidate(*subjects)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    subjects = session.info.pop("principal_subjects", None)
+    if subjects:
+        principal_cache.invalidate(*subjects)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session):
+    session.info.pop("principal_subjects", None)
@@ -0,0 +1,183 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from . import listing_events
+from .serialization import dumps
+from ..core.config import settings
+
+LIST_TAG = "properties:list"
+
+
+def property_tag(prop_id: str) -> str:
+    return f"property:{prop_id}"
+
+
+def favorites_tag(email: str) -> str:
+    return f"favorites:{email}"
+
+
+class CachedResponse:
+    __slots__ = ("body", "etag", "headers", "tags", "expires")
+
+    def __init__(self, body: bytes, etag: str, headers: Dict[str, str], tags: Tuple[str, ...], expires: float):
+        self.body = body
+        self.etag = etag
+        self.headers = headers
+        self.tags = tags
+        self.expires = expires
+
+
+class ResponseCache:
+    """
+    Bounded LRU of serialized GET responses with a TTL.
+    Entries carry tags (a listing id, the listing index, a user's favorites)
+    and write handlers invalidate exactly the tags they touch.
+    The cache is per process; other workers catch up within the TTL.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._by_tag: Dict[str, set] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a response built before a write isn't stored after it
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= len(entry.body)
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, body: bytes, tags: Iterable[str], headers: Dict[str, str], generation: int) -> CachedResponse:
+        # Headers such as X-Next-Cursor are part of the representation
+        digest = hashlib.sha1(body)
+        for name, value in sorted(headers.items()):
+            digest.update(f"\n{name}:{value}".encode())
+        entry = CachedResponse(
+            body, '"' + digest.hexdigest() + '"', headers, tuple(tags), time.monotonic() + self.ttl
+        )
+        if len(body) > self.max_bytes:
+            return entry
+        with self._lock:
+            if generation != self.generation:
+                return entry
+            self._drop(key)
+            self._entries[key] = entry
+            self._bytes += len(body)
+            for tag in entry.tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+        return entry
+
+    def invalidate(self, *tags: str) -> None:
+        with self._lock:
+            self.generation += 1
+            for tag in tags:
+                for key in list(self._by_tag.get(tag, ())):
+                    self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._by_tag.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+response_cache = ResponseCache(
+    settings.RESPONSE_CACHE_MAX_ENTRIES,
+    settings.RESPONSE_CACHE_MAX_BYTES,
+    settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def cache_key(request: Request) -> str:
+    """Route path plus sorted query parameters."""
+    params = sorted(request.query_params.multi_items())
+    return request.url.path + "?" + "&".join(f"{k}={v}" for k, v in params)
+
+
+def cached_json(request: Request, tags: Callable[[object], Iterable[str]], build: Callable[[], tuple]) -> Response:
+    """
+    Serves a JSON GET response from the cache, building it on a miss.
+    `build()` returns (content, headers); `tags(content)` names what the
+    response depends on. Handles ETag / If-None-Match -> 304.
+    """
+    key = cache_key(request)
+    entry = response_cache.get(key)
+    if entry is None:
+        generation = response_cache.generation
+        content, headers = build()
+        body = dumps(content)
+        entry = response_cache.put(key, body, tags(content), headers or {}, generation)
+
+    headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+@listing_events.on_created
+def _invalidate_created(prop):
+    response_cache.invalidate(LIST_TAG)
+
+
+@listing_events.on_deleted
+def _invalidate_deleted(prop):
+    # Favorites lists holding the listing are tagged with it too
+    response_cache.invalidate(LIST_TAG, property_tag(prop.id))
+
+
+@listing_events.on_bulk_change
+def _invalidate_bulk_change():
+    response_cache.invalidate(LIST_TAG)
@@ -0,0 +1,164 @@
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Title matches weigh more than description matches
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS properties_fts USING fts5(
+        title, description,
+        content='properties', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS properties_fts_ai AFTER INSERT ON properties BEGIN
+        INSERT INTO properties_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS properties_fts_ad AFTER DELETE ON properties BEGIN
+        INSERT INTO properties_fts(properties_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS properties_fts_au AFTER UPDATE OF title, description ON properties BEGIN
+        INSERT INTO properties_fts(properties_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+        INSERT INTO properties_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+    END
+    """,
+]
+
+# Must match the expression used in search queries for the GIN index to apply
+POSTGRES_DOCUMENT = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+POSTGRES_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_properties_search ON properties USING GIN (({POSTGRES_DOCUMENT}))",
+]
+
+# Set by setup_search_index(): "fts5", "postgres" or "like"
+search_backend = "like"
+
+
+def setup_search_index(engine) -> str:
+    """
+    Creates the full-text index for the configured database:
+    SQLite FTS5 (an external-content table kept in sync by triggers) or a
+    Postgres tsvector GIN index. Anything else falls back to LIKE scans.
+    """
+    global search_backend
+    dialect = engine.dialect.name
+
+    if dialect == "sqlite":
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'properties_fts'")
+            ).first()
+            for ddl in SQLITE_DDL:
+                conn.execute(text(ddl))
+            if not exists:
+                # Index listings that were written before the FTS table existed
+                conn.execute(text("INSERT INTO properties_fts(properties_fts) VALUES ('rebuild')"))
+        search_backend = "fts5"
+    elif dialect == "postgresql":
+        with engine.begin() as conn:
+            for ddl in POSTGRES_DDL:
+                conn.execute(text(ddl))
+        search_backend = "postgres"
+    else:
+        search_backend = "like"
+    return search_backend
+
+
+def rebuild_search_index(engine) -> None:
+    """
+    Re-indexes every listing. Needed on SQLite after a VACUUM, which may
+    renumber the rowids the FTS table points at.
+    """
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO properties_fts(properties_fts) VALUES ('rebuild')"))
+
+
+def tokenize(q: str) -> List[str]:
+    return re.findall(r"\w+", q.lower())
+
+
+def _fts5_query(tokens: List[str]) -> str:
+    # Every term must match; the last one as a prefix for type-ahead
+    terms = [f'"{t}"' for t in tokens[:-1]] + [f'"{tokens[-1]}"*']
+    return " ".join(terms)
+
+
+def _tsquery(tokens: List[str]) -> str:
+    return " & ".join(tokens[:-1] + [tokens[-1] + ":*"])
+
+
+def search_property_ids(
+    db: Session,
+    q: str,
+    property_type: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    min_area: Optional[float] = None,
+    max_area: Optional[float] = None,
+    area_unit: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[Tuple[str, float]]:
+    """
+    Ranked (id, score) pairs for listings matching every word of `q`
+    (last word as a prefix) and the optional filters. Higher score is better.
+    """
+    tokens = tokenize(q)
+    if not tokens:
+        return []
+
+    params = {"limit": limit, "offset": offset}
+    filters = []
+    for column, op, name, value in (
+        ("p.property_type", "=", "property_type", property_type),
+        ("p.price_fiat", ">=", "min_price", min_price),
+        ("p.price_fiat", "<=", "max_price", max_price),
+        ("p.area", ">=", "min_area", min_area),
+        ("p.area", "<=", "max_area", max_area),
+        ("p.area_unit", "=", "area_unit", area_unit),
+    ):
+        if value is not None:
+            filters.append(f"{column} {op} :{name}")
+            params[name] = value
+    where = "".join(f" AND {f}" for f in filters)
+
+    if search_backend == "fts5":
+        params["match"] = _fts5_query(tokens)
+        sql = f"""
+            SELECT p.id, -bm25(properties_fts, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}) AS score
+            FROM properties_fts JOIN properties p ON p.rowid = properties_fts.rowid
+            WHERE properties_fts MATCH :match{where}
+            ORDER BY score DESC LIMIT :limit OFFSET :offset
+        """
+    elif search_backend == "postgres":
+        params["tsquery"] = _tsquery(tokens)
+        sql = f"""
+            SELECT p.id, ts_rank({POSTGRES_DOCUMENT}, to_tsquery('simple', :tsquery)) AS score
+            FROM properties p
+            WHERE ({POSTGRES_DOCUMENT}) @@ to_tsquery('simple', :tsquery){where}
+            ORDER BY score DESC LIMIT :limit OFFSET :offset
+        """
+    else:
+        # No text index available: every token must appear in title or description
+        for i, token in enumerate(tokens):
+            params[f"t{i}"] = f"%{token}%"
+            where += f" AND (lower(p.title) LIKE :t{i} OR lower(p.description) LIKE :t{i})"
+        sql = f"SELECT p.id, 0.0 AS score FROM properties p WHERE 1 = 1{where} ORDER BY p.id LIMIT :limit OFFSET :offset"
+
+    return [(row[0], float(row[1] or 0.0)) for row in db.execute(text(sql), params)]
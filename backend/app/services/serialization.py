@@ -0,0 +1,69 @@
+"""
+Fast JSON for hand-built responses (the response cache, map tiles).
+
+dumps() encodes with orjson when it is installed and falls back to the
+standard library otherwise; both give the same compact output. Pydantic
+models are dumped as FastAPI would, and anything else orjson does not know
+goes through jsonable_encoder. Routes with a response_model don't need
+this: FastAPI already serializes those with pydantic-core.
+
+Projection is the precompiled row -> dict step behind ?fields= and the
+list-view card: one attrgetter call per row and no model validation, for
+rows that come straight from our own tables.
+"""
+import json
+from operator import attrgetter
+from typing import Any, Sequence
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    return jsonable_encoder(obj)
+
+
+if orjson is not None:
+    def dumps(content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+else:
+    _encoder = json.JSONEncoder(separators=(",", ":"), default=_default)
+
+    def dumps(content: Any) -> bytes:
+        return _encoder.encode(content).encode()
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with dumps()."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class Projection:
+    """Builds {field: value} dicts from objects in one attrgetter call, keys in `fields` order."""
+
+    def __init__(self, fields: Sequence[str]):
+        self.fields = tuple(fields)
+        getter = attrgetter(*self.fields)
+        if len(self.fields) == 1:
+            # attrgetter of one name returns the value itself, not a tuple
+            self._get = lambda obj: (getter(obj),)
+        else:
+            self._get = getter
+
+    def __call__(self, obj) -> dict:
+        return dict(zip(self.fields, self._get(obj)))
+
+    def many(self, objs) -> list:
+        return [dict(zip(self.fields, self._get(obj))) for obj in objs]
@@ -0,0 +1,385 @@
+"""
+Exact k-nearest-neighbour lists for /properties/{id}/similar, kept in
+memory and patched on every create and delete.
+"""
+import math
+import threading
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import listing_events
+from .geo_index import EARTH_RADIUS_KM
+from ..core.config import settings
+
+# Square feet per area unit. Bigha and biswa differ between states; these
+# are the common north Indian values (1 bigha = 20 biswa).
+AREA_UNIT_SQFT = {
+    "sqft": 1.0, "sqyd": 9.0, "sqm": 10.7639, "acre": 43560.0, "hectare": 107639.0,
+    "bigha": 27000.0, "biswa": 1350.0, "biswaa": 1350.0, "gunta": 1089.0, "cent": 435.6,
+    "marla": 272.25, "kanal": 5445.0,
+}
+
+# Scale of each feature: one unit of distance is GEO_SCALE_KM on the ground,
+# one standard deviation of log price or of log area (in sqft), and a
+# different property type counts as TYPE_DISTANCE units.
+GEO_SCALE_KM = 5.0
+TYPE_DISTANCE = 3.0
+
+# Rows per distance-matrix block
+MEMBER_CHUNK = 512
+# Cells with fewer listings than DENSE_CELL are searched together, per
+# TILE x TILE square of cells
+DENSE_CELL = 64
+TILE = 4
+
+
+def area_sqft(area: Optional[float], unit: Optional[str]) -> Optional[float]:
+    factor = AREA_UNIT_SQFT.get((unit or "sqft").strip().lower())
+    if area is None or factor is None or area <= 0:
+        return None
+    return area * factor
+
+
+def _log_mean_sd(values) -> Tuple[float, float]:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        logs = np.log(np.array(values, dtype=float))
+    logs = logs[np.isfinite(logs)]
+    if not len(logs):
+        return 0.0, 1.0
+    return float(logs.mean()), float(logs.std()) or 1.0
+
+
+class SimilarityIndex:
+    """
+    Precomputed k nearest neighbours of every listing over normalised
+    feature vectors: position on the globe, log price, log area in sqft
+    and a one-hot property type. Neighbour lists are found on a lat/lon
+    grid: each cell is compared against the cells around it, and the ring
+    widens only for listings whose k-th neighbour could still lie outside
+    it, so the lists are exact. Built lazily from the DB; creates and
+    deletes patch only the lists they change, and lookups are a row read.
+    """
+
+    def __init__(self, k: int = 10, cell_deg: float = 0.02):
+        self.k = k
+        self.cell_deg = cell_deg
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._clear()
+
+    def _clear(self) -> None:
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        # Occupied cell columns per cell row, sorted
+        self._columns: Dict[int, List[int]] = {}
+        self._cell_of: List[Tuple[int, int]] = []
+        self._types: Dict[str, int] = {}
+        self._stats = (0.0, 1.0, 0.0, 1.0)  # log price mean/sd, log area mean/sd
+        self._centre = np.zeros(3)
+        self._features = np.zeros((0, 0))
+        self._alive = np.zeros(0, dtype=bool)
+        self._nbr = np.zeros((0, self.k), dtype=np.int64)
+        self._nbr_dist = np.zeros((0, self.k))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # Features
+
+    def _vectors(self, prices, areas, lats, lons, types) -> np.ndarray:
+        lat = np.radians(np.asarray(lats, dtype=float))
+        lon = np.radians(np.asarray(lons, dtype=float))
+        geo = np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=1)
+        geo = geo * (EARTH_RADIUS_KM / GEO_SCALE_KM) - self._centre
+
+        price_mu, price_sd, area_mu, area_sd = self._stats
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price = (np.log(np.asarray(prices, dtype=float)) - price_mu) / price_sd
+            area = (np.log(np.asarray(areas, dtype=float)) - area_mu) / area_sd
+        # Missing or invalid price/area sit at the mean
+        price = np.where(np.isfinite(price), price, 0.0)
+        area = np.where(np.isfinite(area), area, 0.0)
+
+        # Unknown types share the last column
+        onehot = np.zeros((len(lat), len(self._types) + 1))
+        cols = [self._types.get(t, len(self._types)) for t in types]
+        onehot[np.arange(len(lat)), cols] = TYPE_DISTANCE / math.sqrt(2)
+        return np.column_stack([geo, price, area, onehot])
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lon / self.cell_deg))
+
+    # Neighbour search
+
+    def _block(self, key: Tuple[int, int], span: int, r: int) -> Tuple[np.ndarray, bool]:
+        """
+        Rows within r cells of the span x span square of cells starting at
+        key, and whether that is every occupied cell.
+        """
+        ci, cj = key
+        lists = []
+        for i in range(ci - r, ci + span + r):
+            cols = self._columns.get(i)
+            if cols:
+                for j in cols[bisect_left(cols, cj - r):bisect_right(cols, cj + span - 1 + r)]:
+                    lists.append(self._cells[(i, j)])
+        rows = np.array(list(chain.from_iterable(lists)), dtype=np.int64)
+        return rows, len(lists) == len(self._cells)
+
+    def _bound(self, key: Tuple[int, int], span: int, r: int) -> float:
+        """Feature distance every listing outside the block is at least this far away (geo alone)."""
+        km = r * self._cell_km(key, span, r)
+        # Features hold chord length, which is a little shorter than the arc
+        chord = 2 * EARTH_RADIUS_KM * math.sin(min(km / EARTH_RADIUS_KM, math.pi) / 2)
+        return chord / GEO_SCALE_KM
+
+    def _cell_km(self, key: Tuple[int, int], span: int, r: int) -> float:
+        """Narrowest cell width in km inside the block (east-west, at its highest latitude)."""
+        lo, hi = (key[0] - r) * self.cell_deg, (key[0] + span + r) * self.cell_deg
+        widest = min(90.0, max(abs(lo), abs(hi)))
+        return EARTH_RADIUS_KM * math.radians(self.cell_deg) * math.cos(math.radians(widest))
+
+    def _knn(self, members: np.ndarray, candidates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """k nearest candidates of each member (itself excluded), padded with -1 / inf."""
+        k = self.k
+        idx = np.full((len(members), k), -1, dtype=np.int64)
+        dist = np.full((len(members), k), np.inf)
+        if len(candidates) == 0:
+            return idx, dist
+        cand = self._features[candidates]
+        cand_sq = np.einsum("ij,ij->i", cand, cand)
+        take = min(k, len(candidates))
+        for start in range(0, len(members), MEMBER_CHUNK):
+            chunk = members[start:start + MEMBER_CHUNK]
+            vecs = self._features[chunk]
+            d2 = vecs @ cand.T
+            d2 *= -2.0
+            d2 += cand_sq
+            d2 += np.einsum("ij,ij->i", vecs, vecs)[:, None]
+            d2[chunk[:, None] == candidates] = np.inf
+            lines = np.arange(len(chunk))[:, None]
+            if take < len(candidates):
+                part = np.argpartition(d2, take - 1, axis=1)[:, :take]
+            else:
+                part = np.broadcast_to(np.arange(take), (len(chunk), take))
+            part_d2 = d2[lines, part]
+            order = np.argsort(part_d2, axis=1)
+            part, part_d2 = part[lines, order], part_d2[lines, order]
+            np.maximum(part_d2, 0.0, out=part_d2)
+            idx[start:start + len(chunk), :take] = np.where(np.isfinite(part_d2), candidates[part], -1)
+            dist[start:start + len(chunk), :take] = np.sqrt(part_d2)
+        return idx, dist
+
+    def _fill(self, members: np.ndarray, key: Tuple[int, int], span: int = 1) -> None:
+        """
+        Exact neighbour lists for members, which all lie in the span x span
+        square of cells starting at key. The ring around the square widens
+        until each member's k-th neighbour is provably inside it.
+        """
+        r = 1
+        pending = members
+        while len(pending):
+            candidates, everything = self._block(key, span, r)
+            idx, dist = self._knn(pending, candidates)
+            kth = dist[:, -1]
+            done = np.full(len(pending), everything) | (kth <= self._bound(key, span, r))
+            self._nbr[pending[done]] = idx[done]
+            self._nbr_dist[pending[done]] = dist[done]
+            pending, kth = pending[~done], kth[~done]
+            # Jump to the ring that must hold the k-th neighbour found so far
+            reach = kth[np.isfinite(kth)]
+            wanted = 2 * r
+            if len(reach):
+                cell_km = self._cell_km(key, span, 2 * r)
+                if cell_km > 0:
+                    wanted = max(wanted, math.ceil(float(reach.max()) * GEO_SCALE_KM / cell_km) + 1)
+            r = wanted
+
+    def _fill_cells(self, by_cell: Dict[Tuple[int, int], List[int]]) -> None:
+        """
+        _fill for rows grouped by cell. Sparse cells are batched per
+        TILE x TILE square so the per-call overhead is paid once per tile.
+        """
+        tiles: Dict[Tuple[int, int], List[int]] = {}
+        for key, rows in by_cell.items():
+            if len(rows) >= DENSE_CELL:
+                self._fill(np.array(rows, dtype=np.int64), key)
+            else:
+                tiles.setdefault((key[0] // TILE * TILE, key[1] // TILE * TILE), []).extend(rows)
+        for key, rows in tiles.items():
+            self._fill(np.array(rows, dtype=np.int64), key, TILE)
+
+    # Build and incremental updates
+
+    def ensure_loaded(self, db) -> None:
+        """Builds the index and every neighbour list on first use (and after outside writes)."""
+        listing_events.sync_external_changes(db)
+        if self._loaded:
+            return
+        from ..db.models import Property
+
+        with self._lock:
+            if self._loaded:
+                return
+            rows = (
+                db.query(Property.id, Property.price_fiat, Property.area, Property.area_unit,
+                         Property.latitude, Property.longitude, Property.property_type)
+                .filter(Property.latitude.isnot(None), Property.longitude.isnot(None))
+                .all()
+            )
+            self._build(rows)
+            self._loaded = True
+
+    def _build(self, rows: Sequence[tuple]) -> None:
+        self._clear()
+        if not rows:
+            return
+        ids, prices, areas, units, lats, lons, types = zip(*rows)
+        sqft = [area_sqft(a, u) for a, u in zip(areas, units)]
+        self._stats = _log_mean_sd(prices) + _log_mean_sd(sqft)
+        self._types = {t: i for i, t in enumerate(sorted({t for t in types if t}))}
+
+        features = self._vectors(prices, sqft, lats, lons, types)
+        self._centre = features[:, :3].mean(axis=0)
+        features[:, :3] -= self._centre
+        self._features = features
+        self._alive = np.ones(len(ids), dtype=bool)
+        self._nbr = np.full((len(ids), self.k), -1, dtype=np.int64)
+        self._nbr_dist = np.full((len(ids), self.k), np.inf)
+        self._ids = list(ids)
+        self._rows = {prop_id: row for row, prop_id in enumerate(ids)}
+        for row, (lat, lon) in enumerate(zip(lats, lons)):
+            key = self._cell(lat, lon)
+            self._cell_of.append(key)
+            self._cells.setdefault(key, []).append(row)
+        for i, j in self._cells:
+            self._columns.setdefault(i, []).append(j)
+        for cols in self._columns.values():
+            cols.sort()
+        self._fill_cells(self._cells)
+
+    def reset(self) -> None:
+        """Drops everything; the next query rebuilds from the DB."""
+        with self._lock:
+            self._clear()
+            self._loaded = False
+
+    def _grow(self) -> None:
+        size = max(16, 2 * len(self._features))
+        extra = size - len(self._features)
+        self._features = np.vstack([self._features, np.zeros((extra, self._features.shape[1]))])
+        self._alive = np.concatenate([self._alive, np.zeros(extra, dtype=bool)])
+        self._nbr = np.vstack([self._nbr, np.full((extra, self.k), -1, dtype=np.int64)])
+        self._nbr_dist = np.vstack([self._nbr_dist, np.full((extra, self.k), np.inf)])
+
+    def _refill(self, rows: np.ndarray) -> None:
+        by_cell: Dict[Tuple[int, int], List[int]] = {}
+        for row in rows.tolist():
+            by_cell.setdefault(self._cell_of[row], []).append(row)
+        self._fill_cells(by_cell)
+
+    def add(self, prop) -> None:
+        if prop.latitude is None or prop.longitude is None:
+            return
+        # Nothing to sync until the index has been built; the build reads the row.
+        # Checked under the lock: a build in progress holds it, so an event for a
+        # row its snapshot may have missed waits for it and is applied after.
+        with self._lock:
+            if not self._loaded:
+                return
+            if prop.id in self._rows:
+                self._remove(prop.id)
+            if not self._rows:
+                # Nothing to normalise against yet
+                self._loaded = False
+                return
+            row = len(self._ids)
+            if row >= len(self._features):
+                self._grow()
+            vector = self._vectors(
+                [prop.price_fiat], [area_sqft(prop.area, prop.area_unit)],
+                [prop.latitude], [prop.longitude], [prop.property_type]
+            )[0]
+            self._features[row] = vector
+            self._alive[row] = True
+            key = self._cell(prop.latitude, prop.longitude)
+            self._ids.append(prop.id)
+            self._rows[prop.id] = row
+            self._cell_of.append(key)
+            if key not in self._cells:
+                self._cells[key] = []
+                insort(self._columns.setdefault(key[0], []), key[1])
+            self._cells[key].append(row)
+            self._fill(np.array([row], dtype=np.int64), key)
+
+            # Listings the new one is closer to than their current k-th neighbour
+            n = row
+            dist = np.sqrt(((self._features[:n] - vector) ** 2).sum(axis=1))
+            closer = np.nonzero(self._alive[:n] & (dist < self._nbr_dist[:n, -1]))[0]
+            for other in closer.tolist():
+                pos = int(np.searchsorted(self._nbr_dist[other], dist[other]))
+                self._nbr[other, pos + 1:] = self._nbr[other, pos:-1].copy()
+                self._nbr_dist[other, pos + 1:] = self._nbr_dist[other, pos:-1].copy()
+                self._nbr[other, pos] = row
+                self._nbr_dist[other, pos] = dist[other]
+
+    def _remove(self, prop_id: str) -> None:
+        row = self._rows.pop(prop_id, None)
+        if row is None:
+            return
+        self._alive[row] = False
+        key = self._cell_of[row]
+        members = self._cells.get(key)
+        if members is not None:
+            members.remove(row)
+            if not members:
+                del self._cells[key]
+                cols = self._columns[key[0]]
+                cols.remove(key[1])
+                if not cols:
+                    del self._columns[key[0]]
+        self._nbr[row] = -1
+        self._nbr_dist[row] = np.inf
+        # Listings that had it as a neighbour get a fresh list
+        n = len(self._ids)
+        affected = np.nonzero(self._alive[:n] & (self._nbr[:n] == row).any(axis=1))[0]
+        self._refill(affected)
+
+    def remove(self, prop_id: str) -> None:
+        with self._lock:
+            if self._loaded:
+                self._remove(prop_id)
+
+    def similar(self, prop_id: str, limit: int) -> List[Tuple[str, float]]:
+        """(id, feature distance) of the closest listings, nearest first."""
+        with self._lock:
+            row = self._rows.get(prop_id)
+            if row is None:
+                return []
+            return [
+                (self._ids[other], float(d))
+                for other, d in zip(self._nbr[row, :limit].tolist(), self._nbr_dist[row, :limit].tolist())
+                if other >= 0
+            ]
+
+
+similarity_index = SimilarityIndex(settings.SIMILAR_NEIGHBOURS, settings.SIMILAR_CELL_DEG)
+
+
+@listing_events.on_created
+def _index_created(prop):
+    similarity_index.add(prop)
+
+
+@listing_events.on_deleted
+def _index_deleted(prop):
+    similarity_index.remove(prop.id)
+
+
+@listing_events.on_bulk_change
+def _index_bulk_change():
+    similarity_index.reset()
@@ -0,0 +1,195 @@
+import hashlib
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageOps
+from starlette.concurrency import run_in_threadpool
+
+from ..core.config import settings
+from .image_pool import run_image_job
+from .uploads import SpooledUpload
+
+# name -> (width, height, crop). crop=True fills the box (like Cloudinary c_fill),
+# otherwise the image is only shrunk to fit inside it (c_limit).
+VARIANTS: Dict[str, Tuple[int, int, bool]] = {
+    "thumbnail": (300, 200, True),
+    "large": (1200, 800, False),
+}
+
+# Extension stored for each format Pillow detects
+FORMATS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp", "GIF": "gif"}
+
+# <2-char shard>/<sha256>[_<variant>].<ext>
+MEDIA_KEY = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{64}(_[a-z]+)?\.[a-z]+$")
+
+
+class InvalidImage(Exception):
+    pass
+
+
+def make_variants(original: str, digest: str, directory: str) -> Dict[str, str]:
+    """
+    Writes every size in VARIANTS for one original (skipping any that
+    already exist) and returns their file names. Runs in the image pool.
+    """
+    names = {name: f"{digest}_{name}.jpg" for name in VARIANTS}
+    missing = [name for name in VARIANTS if not os.path.exists(os.path.join(directory, names[name]))]
+    if not missing:
+        return names
+
+    with Image.open(original) as img:
+        if img.format == "JPEG":
+            # Decode at reduced scale; the largest variant is still covered
+            largest = max(max(w, h) for w, h, _ in VARIANTS.values())
+            img.draft("RGB", (largest, largest))
+        img = ImageOps.exif_transpose(img).convert("RGB")
+        for name in missing:
+            width, height, crop = VARIANTS[name]
+            if crop:
+                variant = ImageOps.fit(img, (width, height), Image.LANCZOS)
+            else:
+                variant = img.copy()
+                variant.thumbnail((width, height), Image.LANCZOS)
+            # Write then rename so a concurrent reader never sees half a file
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".part")
+            with os.fdopen(fd, "wb") as out:
+                variant.save(out, "JPEG", quality=85, optimize=True, progressive=True)
+            os.replace(tmp, os.path.join(directory, names[name]))
+    return names
+
+
+class StorageBackend(ABC):
+    """Where uploaded listing images go. save() returns url, public_id, thumbnail and variants."""
+
+    name = "base"
+
+    @abstractmethod
+    async def save(self, upload: SpooledUpload, base_url: str) -> dict:
+        ...
+
+
+class LocalStorage(StorageBackend):
+    """
+    Content-addressed files under MEDIA_ROOT, served by /media. The key is
+    the SHA-256 of the bytes, so re-uploading a photo stores nothing new,
+    and variants are generated only once per original.
+    """
+
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def path_for(self, key: str) -> Optional[str]:
+        """Filesystem path for a media key, or None if the key isn't one of ours."""
+        if not MEDIA_KEY.match(key):
+            return None
+        return os.path.join(self.root, key)
+
+    def _ingest(self, upload: SpooledUpload) -> Tuple[str, str, str]:
+        """Hashes and stores the original; returns (digest, shard directory, file name)."""
+        src = upload.open()
+        try:
+            with Image.open(src) as img:
+                ext = FORMATS.get(img.format)
+        except Exception:
+            ext = None
+        if ext is None:
+            raise InvalidImage("Unsupported image format")
+
+        os.makedirs(self.root, exist_ok=True)
+        src.seek(0)
+        sha = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                    sha.update(chunk)
+                    out.write(chunk)
+            digest = sha.hexdigest()
+            directory = os.path.join(self.root, digest[:2])
+            os.makedirs(directory, exist_ok=True)
+            filename = f"{digest}.{ext}"
+            target = os.path.join(directory, filename)
+            if os.path.exists(target):
+                os.unlink(tmp)  # Already stored
+            else:
+                os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return digest, directory, filename
+
+    async def save(self, upload: SpooledUpload, base_url: str) -> dict:
+        digest, directory, filename = await run_in_threadpool(self._ingest, upload)
+        variants = await run_image_job(make_variants, os.path.join(directory, filename), digest, directory)
+        prefix = (settings.MEDIA_BASE_URL or base_url).rstrip("/") + "/media/" + digest[:2] + "/"
+        return {
+            "url": prefix + filename,
+            "public_id": digest,
+            "thumbnail": prefix + variants["thumbnail"],
+            "variants": {name: prefix + f for name, f in variants.items()},
+        }
+
+
+class CloudinaryStorage(StorageBackend):
+    """Uploads to Cloudinary; sizes are Cloudinary delivery transformations."""
+
+    name = "cloudinary"
+
+    def __init__(self):
+        import cloudinary
+
+        cloudinary.config(
+            cloud_name=settings.CLOUDINARY_CLOUD_NAME,
+            api_key=settings.CLOUDINARY_API_KEY,
+            api_secret=settings.CLOUDINARY_API_SECRET
+        )
+
+    async def save(self, upload: SpooledUpload, base_url: str) -> dict:
+        from cloudinary.uploader import upload as cloudinary_upload
+        from cloudinary.utils import cloudinary_url
+
+        result = await run_in_threadpool(
+            cloudinary_upload,
+            upload.open(),
+            folder="real-estate",  # Organize images in folder
+            resource_type="auto",
+            transformation=[
+                {'width': 1200, 'height': 800, 'crop': 'limit'},  # Max size
+                {'quality': 'auto:good'}  # Auto optimize
+            ]
+        )
+
+        def url(width, height, crop):
+            return cloudinary_url(
+                result["public_id"], version=result.get("version"), format=result.get("format"),
+                width=width, height=height, crop="fill" if crop else "limit", secure=True,
+            )[0]
+
+        variants = {name: url(*spec) for name, spec in VARIANTS.items()}
+        return {
+            "url": result['secure_url'],
+            "public_id": result['public_id'],
+            "thumbnail": variants["thumbnail"],
+            "variants": variants,
+        }
+
+
+_storage: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    """
+    The backend named by STORAGE_BACKEND ("local" or "cloudinary"). Left
+    empty, Cloudinary is used only when real credentials are configured.
+    """
+    global _storage
+    if _storage is None:
+        backend = settings.STORAGE_BACKEND or ("local" if settings.CLOUDINARY_CLOUD_NAME == "demo" else "cloudinary")
+        _storage = CloudinaryStorage() if backend == "cloudinary" else LocalStorage(settings.MEDIA_ROOT)
+    return _storage
@@ -0,0 +1,89 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from . import listing_events
+from .clusters import mercator_cell
+from ..core.config import settings
+
+# Deepest tile zoom served (the cluster index's finest level)
+MAX_TILE_ZOOM = 18
+
+
+class TileCache:
+    """
+    Bounded LRU of rendered property tiles keyed by (z, x, y).
+    A created/deleted listing only evicts the one tile per zoom that contains it.
+    """
+
+    def __init__(self, max_tiles: int):
+        self.max_tiles = max_tiles
+        self._tiles: "OrderedDict[Tuple[int, int, int], Tuple[bytes, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a tile rendered before a write isn't stored after it
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[int, int, int]) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            entry = self._tiles.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._tiles.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple[int, int, int], body: bytes, generation: int) -> Tuple[bytes, str]:
+        entry = (body, '"' + hashlib.md5(body).hexdigest() + '"')
+        with self._lock:
+            if generation != self.generation:
+                return entry
+            self._tiles[key] = entry
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+        return entry
+
+    def invalidate_point(self, lat: Optional[float], lon: Optional[float]) -> None:
+        if lat is None or lon is None:
+            return
+        with self._lock:
+            self.generation += 1
+            for z in range(MAX_TILE_ZOOM + 1):
+                x, y = mercator_cell(lat, lon, z)
+                self._tiles.pop((z, x, y), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._tiles.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "tiles": len(self._tiles),
+                "bytes": sum(len(body) for body, _ in self._tiles.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+tile_cache = TileCache(settings.TILE_CACHE_MAX_TILES)
+
+
+@listing_events.on_created
+def _invalidate_created(prop):
+    tile_cache.invalidate_point(prop.latitude, prop.longitude)
+
+
+@listing_events.on_deleted
+def _invalidate_deleted(prop):
+    tile_cache.invalidate_point(prop.latitude, prop.longitude)
+
+
+@listing_events.on_bulk_change
+def _invalidate_bulk_change():
+    tile_cache.clear()
@@ -0,0 +1,120 @@
+from typing import BinaryIO, Dict, Optional
+
+from fastapi import HTTPException, Request
+from python_multipart.multipart import create_form_parser
+
+from ..core.config import settings
+
+
+class SpooledUpload:
+    """
+    A multipart upload that has been streamed off the socket. The file part
+    stays in memory up to UPLOAD_MEMORY_BYTES, beyond that in a temp file
+    under UPLOAD_SPOOL_DIR, so per-upload memory is bounded.
+    """
+
+    def __init__(self, file, fields: Dict[str, str]):
+        self._file = file
+        self.fields = fields
+        self.filename: Optional[str] = file.file_name.decode("utf-8", "replace") if file.file_name else None
+        self.content_type: Optional[str] = file.content_type
+        self.size: int = file.size
+
+    @property
+    def path(self) -> Optional[str]:
+        """Temp file path, or None while the upload is small enough to be held in memory."""
+        if self._file.in_memory:
+            return None
+        name = self._file.actual_file_name
+        return name.decode() if isinstance(name, bytes) else name
+
+    def open(self) -> BinaryIO:
+        """The spooled data, rewound to the start."""
+        fileobj = self._file.file_object
+        fileobj.seek(0)
+        return fileobj
+
+    def field(self, name: str) -> str:
+        value = self.fields.get(name)
+        if value is None:
+            raise HTTPException(status_code=422, detail=f"Missing form field '{name}'")
+        return value
+
+    def close(self) -> None:
+        # Closing deletes the temp file
+        self._file.close()
+
+
+def too_large(limit: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Upload larger than {limit / (1024 * 1024):.1f} MB")
+
+
+async def receive_upload(request: Request, file_field: str = "file", max_bytes: Optional[int] = None) -> SpooledUpload:
+    """
+    Streams a multipart/form-data body chunk by chunk and spools its file
+    part. Bodies over max_bytes (MAX_UPLOAD_BYTES) are refused with 413 as
+    soon as the limit is crossed, or up front from Content-Length.
+    """
+    limit = max_bytes or settings.MAX_UPLOAD_BYTES
+    length = request.headers.get("content-length")
+    if length is not None and length.isdigit() and int(length) > limit:
+        raise too_large(limit)
+
+    fields: Dict[str, str] = {}
+    files = []
+
+    def on_field(field) -> None:
+        name = field.field_name.decode("utf-8", "replace")
+        fields[name] = (field.value or b"").decode("utf-8", "replace")
+
+    def on_file(file) -> None:
+        files.append(file)
+
+    try:
+        parser = create_form_parser(
+            {"Content-Type": request.headers.get("content-type", "").encode("latin-1")},
+            on_field,
+            on_file,
+            config={
+                "MAX_MEMORY_FILE_SIZE": settings.UPLOAD_MEMORY_BYTES,
+                "UPLOAD_DIR": settings.UPLOAD_SPOOL_DIR,
+            },
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > limit:
+                raise too_large(limit)
+            parser.write(chunk)
+        parser.finalize()
+    except HTTPException:
+        for file in files:
+            file.close()
+        raise
+    except Exception:
+        for file in files:
+            file.close()
+        raise HTTPException(status_code=400, detail="Malformed multipart upload")
+
+    upload = None
+    for file in files:
+        if upload is None and file.field_name and file.field_name.decode("utf-8", "replace") == file_field:
+            upload = SpooledUpload(file, fields)
+        else:
+            file.close()
+    if upload is None:
+        raise HTTPException(status_code=422, detail=f"Missing file field '{file_field}'")
+    return upload
+
+
+async def spooled_upload(request: Request):
+    """Dependency form of receive_upload for a part named 'file'; the temp file is removed afterwards."""
+    upload = await receive_upload(request)
+    try:
+        yield upload
+    finally:
+        upload.close()
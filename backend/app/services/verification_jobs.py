@@ -0,0 +1,303 @@
+import asyncio
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from ..core.config import settings
+from ..db.base import SessionLocal
+from ..db.models import JobStatus, VerificationJob, VerificationStatus
+from .image_pool import run_image_job_sync
+from .metrics import timed
+from .verification import VerificationEngine
+
+FINISHED = (JobStatus.DONE, JobStatus.FAILED)
+
+
+class JobQueueFull(Exception):
+    """VERIFICATION_QUEUE_LIMIT jobs are already waiting."""
+
+
+def score_document(job: VerificationJob, quality_result: dict) -> dict:
+    """The document check verdict from the quality stage and the submit-time format check."""
+    final_status = VerificationStatus.PENDING
+    rejection_reason = None
+
+    if quality_result["score"] < 50:
+        final_status = VerificationStatus.REJECTED
+        rejection_reason = f"Image Quality too low. {quality_result['details']}"
+    elif not job.format_valid:
+        final_status = VerificationStatus.REJECTED
+        rejection_reason = f"Invalid {job.doc_type} Number Format."
+    else:
+        # High quality and valid format -> Auto Approve for MVP
+        final_status = VerificationStatus.APPROVED
+
+    return {
+        "doc_type": job.doc_type,
+        "masked_id": job.masked_id,
+        "ai_score": quality_result["score"],
+        "quality_details": quality_result,
+        "format_valid": job.format_valid,
+        "status": final_status.value,
+        "rejection_reason": rejection_reason
+    }
+
+
+def job_dict(job: VerificationJob) -> dict:
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status.value,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
+
+
+class VerificationJobQueue:
+    """
+    Bounded queue of verification jobs drained by VERIFICATION_WORKERS
+    threads. Job rows and their results live in verification_jobs, so any
+    API worker can answer a status poll. The CPU-heavy stages run in the
+    image process pool (VERIFICATION_EXECUTOR=processes) or on the worker
+    thread itself (threads). A full queue refuses new jobs instead of
+    letting them wait indefinitely. Jobs left RUNNING by a process that
+    died are failed after job_timeout, by whichever process sweeps first.
+    """
+
+    def __init__(self, workers: int, max_queued: int, job_dir: str, job_timeout: float = 300):
+        self.workers = workers
+        self.job_dir = job_dir
+        self.job_timeout = job_timeout
+        self._next_sweep = 0.0
+        self._queue: "queue.Queue[str]" = queue.Queue(maxsize=max_queued)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        # Long-poll waiters in this process: job id -> [(loop, event)]
+        self._waiters: Dict[str, list] = {}
+        self.completed = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            os.makedirs(self.job_dir, exist_ok=True)
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"verification-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        self._recover()
+
+    def stop(self) -> None:
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            try:
+                self._queue.put(None, timeout=1)
+            except queue.Full:
+                pass
+        for thread in threads:
+            thread.join(timeout=5)
+
+    def _recover(self) -> None:
+        """Re-queues jobs a previous process accepted but never started, and fails abandoned ones."""
+        self._fail_stale()
+        with SessionLocal() as db:
+            rows = (
+                db.query(VerificationJob.id, VerificationJob.input_path)
+                .filter(VerificationJob.status == JobStatus.QUEUED)
+                .order_by(VerificationJob.created_at)
+                .all()
+            )
+        for job_id, input_path in rows:
+            if not input_path or not os.path.exists(input_path):
+                self._finish(job_id, error="Input lost before the job ran")
+                continue
+            try:
+                self._queue.put_nowait(job_id)
+            except queue.Full:
+                break
+
+    def _fail_stale(self) -> None:
+        """
+        Fails jobs RUNNING for longer than job_timeout: the process running
+        them died mid-job, so nothing will ever finish them. Their inputs
+        may have crashed it, so they are not retried.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.job_timeout)
+        with SessionLocal() as db:
+            stale = (
+                db.query(VerificationJob.id, VerificationJob.input_path)
+                .filter(VerificationJob.status == JobStatus.RUNNING, VerificationJob.started_at < cutoff)
+                .all()
+            )
+            for job_id, input_path in stale:
+                # Conditional, so a job that finished meanwhile keeps its result
+                failed = (
+                    db.query(VerificationJob)
+                    .filter(VerificationJob.id == job_id, VerificationJob.status == JobStatus.RUNNING)
+                    .update({
+                        "status": JobStatus.FAILED,
+                        "error": "Interrupted: the worker running this job stopped, please resubmit",
+                        "finished_at": datetime.utcnow(),
+                        "input_path": None,
+                    }, synchronize_session=False)
+                )
+                db.commit()
+                if failed:
+                    self.discard_input(input_path)
+                    self._notify(job_id)
+
+    def _sweep_due(self) -> bool:
+        """True for one caller per sweep interval."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_sweep:
+                return False
+            self._next_sweep = now + min(self.job_timeout, 60)
+            return True
+
+    def spool_path(self, job_id: str) -> str:
+        return os.path.join(self.job_dir, job_id)
+
+    def enqueue(self, job_id: str) -> None:
+        """Queues a job whose row is already committed; raises JobQueueFull."""
+        self.start()
+        try:
+            self._queue.put_nowait(job_id)
+        except queue.Full:
+            raise JobQueueFull()
+
+    @staticmethod
+    def discard_input(path: Optional[str]) -> None:
+        if path and os.path.exists(path):
+            os.unlink(path)
+
+    def has_capacity(self) -> bool:
+        return not self._queue.full()
+
+    def _claim(self, job_id: str) -> Optional[VerificationJob]:
+        """Marks the job RUNNING unless another worker got to it first."""
+        with SessionLocal(expire_on_commit=False) as db:
+            claimed = (
+                db.query(VerificationJob)
+                .filter(VerificationJob.id == job_id, VerificationJob.status == JobStatus.QUEUED)
+                .update({"status": JobStatus.RUNNING, "started_at": datetime.utcnow()}, synchronize_session=False)
+            )
+            db.commit()
+            return db.get(VerificationJob, job_id) if claimed else None
+
+    def _stage(self, fn, *args):
+        with timed(f"verification.{fn.__name__}"):
+            if settings.VERIFICATION_EXECUTOR == "processes":
+                return run_image_job_sync(fn, *args)
+            return fn(*args)
+
+    def _run(self, job: VerificationJob) -> dict:
+        if job.kind == "ocr":
+            return self._stage(VerificationEngine.extract_id_from_image, job.input_path)
+        quality_result = self._stage(VerificationEngine.check_image_quality, job.input_path)
+        return score_document(job, quality_result)
+
+    def _finish(self, job_id: str, result: Optional[dict] = None, error: Optional[str] = None) -> None:
+        with SessionLocal() as db:
+            job = db.get(VerificationJob, job_id)
+            if job is not None:
+                job.status = JobStatus.FAILED if error else JobStatus.DONE
+                job.result = result
+                job.error = error
+                job.finished_at = datetime.utcnow()
+                self.discard_input(job.input_path)
+                job.input_path = None
+                db.commit()
+        self._notify(job_id)
+
+    def _work(self) -> None:
+        while True:
+            try:
+                job_id = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                if self._sweep_due():
+                    try:
+                        self._fail_stale()
+                    except Exception as e:
+                        print(f"Stale verification job sweep failed: {e}")
+                continue
+            if job_id is None:
+                return
+            try:
+                job = self._claim(job_id)
+                if job is None:
+                    continue
+                try:
+                    result = self._run(job)
+                except Exception as e:
+                    self.failed += 1
+                    self._finish(job_id, error=str(e) or type(e).__name__)
+                else:
+                    self.completed += 1
+                    self._finish(job_id, result=result)
+            except Exception as e:
+                print(f"Verification job {job_id} crashed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _notify(self, job_id: str) -> None:
+        with self._lock:
+            waiters = self._waiters.pop(job_id, [])
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    async def wait(self, job_id: str, timeout: float) -> None:
+        """
+        Returns when the job finishes in this process or after timeout.
+        Callers re-read the row: jobs run by another API worker only show
+        up there, so this also wakes every second to let them check.
+        """
+        event = asyncio.Event()
+        with self._lock:
+            self._waiters.setdefault(job_id, []).append((asyncio.get_running_loop(), event))
+        try:
+            await asyncio.wait_for(event.wait(), timeout=min(timeout, 1.0))
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(job_id)
+                if waiters is not None:
+                    waiters[:] = [w for w in waiters if w[1] is not event]
+                    if not waiters:
+                        del self._waiters[job_id]
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self._threads),
+            "queued": self._queue.qsize(),
+            "max_queued": self._queue.maxsize,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+verification_jobs = VerificationJobQueue(
+    settings.VERIFICATION_WORKERS,
+    settings.VERIFICATION_QUEUE_LIMIT,
+    settings.VERIFICATION_JOB_DIR or os.path.join(tempfile.gettempdir(), "verification-jobs"),
+    settings.VERIFICATION_JOB_TIMEOUT_SECONDS,
+)
+
+
+def spool_job_input(job_id: str, src) -> str:
+    """Copies an upload into the job directory (the request's spool file goes away with the request)."""
+    path = verification_jobs.spool_path(job_id)
+    os.makedirs(verification_jobs.job_dir, exist_ok=True)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(src, out, 1024 * 1024)
+    return path
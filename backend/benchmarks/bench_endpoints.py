@@ -0,0 +1,205 @@
+"""
+Load test of the main read paths against a seeded database, in-process
+over ASGI (no server or network needed).
+
+Seeds a fresh SQLite database with benchmarks.seed (or reuses the one at
+--database-url), then sends --requests requests per endpoint from
+--concurrency clients and reports throughput and p50/p95/p99 latency.
+--output saves the results as JSON; --baseline compares p95 against an
+earlier run and exits non-zero when an endpoint got slower than
+--tolerance allows.
+
+    cd backend && python -m benchmarks.bench_endpoints --size 100k --output bench.json
+    cd backend && python -m benchmarks.bench_endpoints --size 100k --baseline bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks import seed as seeding
+
+SCENARIOS = ["all", "nearby", "detail", "similar", "favorites", "login"]
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+class Scenario:
+    """Builds one request at a time: (method, url, json body)."""
+
+    def __init__(self, name: str, data: dict, rng: random.Random):
+        self.name, self.data, self.rng = name, data, rng
+        self.cursors = [None]
+
+    def request(self):
+        rng, data = self.rng, self.data
+        if self.name == "all":
+            cursor = rng.choice(self.cursors)
+            return "GET", "/properties/all?limit=50&fields=card" + (f"&cursor={cursor}" if cursor else ""), None
+        if self.name == "nearby":
+            _, lat, lon, _, _ = rng.choice(seeding.CITIES)
+            lat, lon = seeding.random_point(rng, lat, lon, seeding.CITY_SPREAD_KM)
+            return "GET", f"/properties/nearby?lat={lat}&long={lon}&radius_km=2&limit=50", None
+        if self.name == "detail":
+            return "GET", f"/properties/{rng.choice(data['property_ids'])}", None
+        if self.name == "similar":
+            return "GET", f"/properties/{rng.choice(data['property_ids'])}/similar", None
+        if self.name == "favorites":
+            return "GET", f"/favorites/list?user_email={rng.choice(data['user_emails'])}", None
+        return "POST", "/auth/login", {"email": rng.choice(data["user_emails"]), "password": seeding.PASSWORD}
+
+    async def warm_up(self, client, n: int) -> None:
+        """Loads the lazy indexes; for /all, also collects cursors of the first pages."""
+        if self.name == "all":
+            cursor = None
+            for _ in range(max(n, 1)):
+                r = await client.get("/properties/all?limit=50&fields=card" + (f"&cursor={cursor}" if cursor else ""))
+                cursor = r.headers.get("x-next-cursor")
+                if not cursor:
+                    break
+                self.cursors.append(cursor)
+            return
+        for _ in range(n):
+            method, url, body = self.request()
+            await client.request(method, url, json=body)
+
+
+async def drive(client, scenario: Scenario, requests: int, concurrency: int) -> dict:
+    latencies, errors = [], 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, url, body = scenario.request()
+            start = time.perf_counter()
+            r = await client.request(method, url, json=body)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if r.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+async def run(app, data: dict, args) -> dict:
+    import httpx
+
+    from app.db.base import async_engine
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name in args.scenarios:
+            scenario = Scenario(name, data, random.Random(args.seed))
+            requests = args.login_requests if name == "login" else args.requests
+            await scenario.warm_up(client, args.warmup)
+            results[name] = await drive(client, scenario, requests, args.concurrency)
+    # Pooled connections belong to this event loop
+    if async_engine is not None:
+        await async_engine.dispose()
+    return results
+
+
+def sample_existing(engine, seed: int) -> dict:
+    """Ids to request from a database seeded by an earlier run."""
+    from sqlalchemy import func, select
+
+    from app.db.models import Favorite, Property, User
+
+    with engine.connect() as conn:
+        props = conn.execute(select(func.count()).select_from(Property)).scalar()
+        users = conn.execute(select(func.count()).select_from(User)).scalar()
+        favorites = conn.execute(select(func.count()).select_from(Favorite)).scalar()
+        rng = random.Random(seed)
+        property_ids = conn.execute(
+            select(Property.id).offset(rng.randrange(max(props - 10000, 1))).limit(10000)
+        ).scalars().all()
+        emails = conn.execute(
+            select(User.email).where(User.email.like("%@bench.example")).limit(1000)
+        ).scalars().all()
+    return {"users": users, "properties": props, "favorites": favorites,
+            "property_ids": property_ids, "user_emails": emails}
+
+
+def report(results: dict, baseline: dict, tolerance: float) -> bool:
+    print(f"\n{'endpoint':10s} {'requests':>8s} {'errors':>6s} {'req/s':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}")
+    ok = True
+    for name, r in results.items():
+        line = (f"{name:10s} {r['requests']:8d} {r['errors']:6d} {r['rps']:8.1f}"
+                f" {r['p50_ms']:8.1f} {r['p95_ms']:8.1f} {r['p99_ms']:8.1f}")
+        before = baseline.get(name)
+        if before:
+            change = r["p95_ms"] / before["p95_ms"] - 1
+            line += f"  p95 {change:+.0%} vs baseline"
+            if change > tolerance:
+                line += "  REGRESSION"
+                ok = False
+        print(line)
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=list(seeding.SIZES), default="10k")
+    parser.add_argument("--database-url", help="seeded database to reuse (default: a fresh SQLite file)")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=1000, help="per endpoint")
+    parser.add_argument("--login-requests", type=int, default=50, help="bcrypt makes logins slow by design")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON from an earlier --output to compare p95 against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 slowdown vs baseline")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+
+    from app.main import app
+    from app.db.base import engine
+
+    if args.database_url:
+        data = sample_existing(engine, args.seed)
+        print(f"reusing {data['users']} users, {data['properties']} listings, {data['favorites']} favorites")
+    else:
+        data = seeding.seed(engine, seeding.SIZES[args.size], seed=args.seed)
+        print(f"seeded {data['users']} users, {data['properties']} listings,"
+              f" {data['favorites']} favorites in {data['seconds']:.1f} s")
+
+    results = asyncio.run(run(app, data, args))
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            saved = json.load(f)
+        if saved["size"] != data["properties"] or saved["concurrency"] != args.concurrency:
+            print(f"note: baseline ran with {saved['size']} listings at concurrency {saved['concurrency']}")
+        baseline = saved["results"]
+    ok = report(results, baseline, args.tolerance)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"size": data["properties"], "concurrency": args.concurrency, "results": results}, f, indent=2)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
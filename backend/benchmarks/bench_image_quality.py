@@ -0,0 +1,154 @@
+"""
+Document image quality check: old full-resolution stddev vs reduced
+decode + variance of Laplacian, and serial vs document jobs on the
+verification job queue (VERIFICATION_EXECUTOR=processes, the path
+/verification/upload takes).
+
+The corpus is built from backend/test_doc.jpg. The seed is tiled up to
+phone-camera size (sharp), then blurred and darkened copies are made.
+--corpus adds real images from a directory.
+
+    cd backend && python -m benchmarks.bench_image_quality --megapixels 12 --copies 4
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageStat
+
+SEED = Path(__file__).resolve().parent.parent / "test_doc.jpg"
+
+
+def legacy_check(image_bytes: bytes) -> dict:
+    """The previous implementation: full decode, stddev of grayscale pixels."""
+    gray = Image.open(BytesIO(image_bytes)).convert("L")
+    stat = ImageStat.Stat(gray)
+    return {"is_blurry": stat.stddev[0] < 15, "is_dark": stat.mean[0] < 40}
+
+
+def jpeg(img: Image.Image) -> bytes:
+    buf = BytesIO()
+    img.save(buf, "JPEG", quality=90)
+    return buf.getvalue()
+
+
+def synthetic_corpus(megapixels: float):
+    seed = Image.open(SEED).convert("RGB")
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    sharp = Image.new("RGB", (width, height), "white")
+    for x in range(0, width, seed.width):
+        for y in range(0, height, seed.height):
+            sharp.paste(seed, (x, y))
+    draw = ImageDraw.Draw(sharp)
+    for y in range(0, height, 40):
+        draw.line([(0, y), (width, y)], fill="black", width=2)
+
+    return [
+        ("seed", SEED.read_bytes(), None),
+        ("sharp", jpeg(sharp), False),
+        ("blurred", jpeg(sharp.filter(ImageFilter.GaussianBlur(12))), True),
+        ("dark", jpeg(ImageEnhance.Brightness(sharp).enhance(0.1)), None),
+    ]
+
+
+def load_corpus(directory: str):
+    return [
+        (path.name, path.read_bytes(), None)
+        for path in sorted(Path(directory).iterdir())
+        if path.suffix.lower() in (".jpg", ".jpeg", ".png", ".webp")
+    ]
+
+
+def timed(fn, images, copies: int) -> float:
+    start = time.perf_counter()
+    for _ in range(copies):
+        for _, data, _ in images:
+            fn(data)
+    return time.perf_counter() - start
+
+
+def queued(images, copies: int) -> float:
+    """Wall time for the checks submitted as document jobs and drained by the queue's workers."""
+    from app.db.base import SessionLocal
+    from app.db.models import JobStatus, VerificationJob
+    from app.services.verification_jobs import spool_job_input, verification_jobs
+
+    def submit(data: bytes) -> str:
+        job_id = str(uuid.uuid4())
+        path = spool_job_input(job_id, BytesIO(data))
+        with SessionLocal() as db:
+            db.add(VerificationJob(
+                id=job_id, kind="document", status=JobStatus.QUEUED, input_path=path,
+                doc_type="PAN", masked_id="XXXXXX234F", format_valid=True,
+            ))
+            db.commit()
+        verification_jobs.enqueue(job_id)
+        return job_id
+
+    verification_jobs.start()
+    submit(images[0][1])  # start the workers and the image pool
+    verification_jobs._queue.join()
+    start = time.perf_counter()
+    job_ids = [submit(data) for _ in range(copies) for _, data, _ in images]
+    verification_jobs._queue.join()
+    elapsed = time.perf_counter() - start
+    verification_jobs.stop()
+
+    with SessionLocal() as db:
+        failed = db.query(VerificationJob).filter(
+            VerificationJob.id.in_(job_ids), VerificationJob.status != JobStatus.DONE
+        ).count()
+    assert failed == 0, f"{failed} jobs did not finish"
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megapixels", type=float, default=12.0)
+    parser.add_argument("--copies", type=int, default=4, help="passes over the corpus")
+    parser.add_argument("--corpus", help="directory of extra sample images")
+    args = parser.parse_args()
+
+    # Before the app's settings are read
+    os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+    os.environ.setdefault("VERIFICATION_EXECUTOR", "processes")
+    from app.main import app  # noqa: F401  (creates tables)
+    from app.core.config import settings
+    from app.services.image_pool import shutdown_image_pool
+    from app.services.verification import VerificationEngine
+
+    images = synthetic_corpus(args.megapixels)
+    if args.corpus:
+        images += load_corpus(args.corpus)
+
+    print(f"{'image':12s} {'bytes':>10s}  {'score':>5s} {'blurry':>6s} {'dark':>5s} {'sharpness':>10s}  legacy blurry")
+    for name, data, expect_blurry in images:
+        result = VerificationEngine.check_image_quality(data)
+        legacy = legacy_check(data)
+        print(
+            f"{name:12s} {len(data):10d}  {result['score']:5d} {str(result['is_blurry']):>6s}"
+            f" {str(result['is_dark']):>5s} {result['sharpness']:10.1f}  {legacy['is_blurry']}"
+        )
+        if expect_blurry is not None:
+            assert result["is_blurry"] == expect_blurry, name
+
+    n = len(images) * args.copies
+    legacy_s = timed(legacy_check, images, args.copies)
+    new_s = timed(VerificationEngine.check_image_quality, images, args.copies)
+    queue_s = queued(images, args.copies)
+    shutdown_image_pool()
+
+    print(f"\nimages checked:          {n} ({os.cpu_count()} CPUs)")
+    print(f"legacy full decode:      {legacy_s * 1000 / n:8.1f} ms/image")
+    print(f"draft decode + Laplacian:{new_s * 1000 / n:8.1f} ms/image  ({legacy_s / new_s:.1f}x)")
+    print(f"same, job queue:         {queue_s * 1000 / n:8.1f} ms/image wall"
+          f"  ({settings.VERIFICATION_WORKERS} workers, {settings.VERIFICATION_EXECUTOR})")
+
+
+if __name__ == "__main__":
+    main()
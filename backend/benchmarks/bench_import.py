@@ -0,0 +1,65 @@
+"""
+Bulk import throughput: N synthetic listings as CSV into a fresh SQLite
+database, through the same path as POST /properties/import.
+
+    cd backend && python -m benchmarks.bench_import --n 100000
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from app.main import app  # noqa: F401  (creates tables, FTS index)
+from app.api.endpoints.properties import PropertyCreate
+from app.db.base import SessionLocal, engine
+from app.db.models import Property, User
+from app.services.bulk_import import import_listings
+
+TYPES = ["Flat", "House", "Plot", "Farm", "Commercial"]
+UNITS = ["sqft", "sqyd", "bigha", "acre"]
+
+
+def synthetic_csv(n: int, seed: int = 7) -> bytes:
+    rng = random.Random(seed)
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["title", "description", "property_type", "price", "area", "area_unit", "latitude", "longitude", "image_urls"])
+    for i in range(n):
+        ptype = rng.choice(TYPES)
+        writer.writerow([
+            f"{ptype} #{i}", f"Bulk imported {ptype.lower()} near the market", ptype,
+            rng.randint(500000, 50000000), rng.randint(300, 5000), rng.choice(UNITS),
+            round(rng.uniform(8.0, 35.0), 6), round(rng.uniform(68.0, 97.0), 6),
+            "https://example.com/a.jpg|https://example.com/b.jpg",
+        ])
+    return buf.getvalue().encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        owner = User(email="broker@example.com", full_name="Broker")
+        db.add(owner)
+        db.commit()
+        owner_id = owner.id
+
+    data = synthetic_csv(args.n)
+    result = import_listings(engine, io.BytesIO(data), "csv", owner_id, PropertyCreate, args.batch_size)
+    with SessionLocal() as db:
+        stored = db.query(Property).count()
+
+    print(f"rows:       {args.n} ({len(data) / 1e6:.1f} MB CSV)")
+    print(f"imported:   {result['imported']} (failed {result['failed']}, {stored} in the table)")
+    print(f"time:       {result['seconds']:.2f} s ({result['imported'] / result['seconds']:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Latency of non-auth routes while a login storm is running.
+
+Drives the app in-process over ASGI, so everything shares one event loop
+the way a single uvicorn worker does. Runs the storm twice: once with
+bcrypt on the bounded hasher pool, once with it called inline on the
+event loop (how register/login used to behave).
+
+    cd backend && python -m benchmarks.bench_login_storm --logins 64 --seconds 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+import httpx
+
+from app.core import security
+from app.db.base import async_engine
+from app.main import app
+
+PROBES = ["/", "/properties/all?limit=20"]
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+async def probe(client, stop, latencies):
+    while not stop.is_set():
+        for path in PROBES:
+            start = time.perf_counter()
+            await client.get(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.005)
+
+
+async def storm(client, stop, counts):
+    while not stop.is_set():
+        r = await client.post("/auth/login", json={"email": "storm@example.com", "password": "pw"})
+        counts[r.status_code] = counts.get(r.status_code, 0) + 1
+
+
+async def run(logins: int, seconds: float) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/register", json={"email": "storm@example.com", "password": "pw", "full_name": "Storm"})
+
+        baseline = []
+        stop = asyncio.Event()
+        task = asyncio.create_task(probe(client, stop, baseline))
+        await asyncio.sleep(min(seconds, 2.0))
+        stop.set()
+        await task
+
+        loaded, counts = [], {}
+        stop = asyncio.Event()
+        tasks = [asyncio.create_task(probe(client, stop, loaded))]
+        tasks += [asyncio.create_task(storm(client, stop, counts)) for _ in range(logins)]
+        await asyncio.sleep(seconds)
+        stop.set()
+        await asyncio.gather(*tasks)
+    # Pooled connections belong to this event loop
+    if async_engine is not None:
+        await async_engine.dispose()
+    return {"baseline": baseline, "loaded": loaded, "counts": counts}
+
+
+def report(label: str, result: dict, seconds: float) -> None:
+    print(f"\n{label}")
+    for name in ("baseline", "loaded"):
+        samples = result[name]
+        print(
+            f"  {name:9s} n={len(samples):6d}  p50={statistics.median(samples):8.1f} ms"
+            f"  p95={percentile(samples, 95):8.1f} ms  p99={percentile(samples, 99):8.1f} ms"
+        )
+    ok = result["counts"].get(200, 0)
+    print(f"  logins    {ok / seconds:.1f}/s ok, status counts {result['counts']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=64, help="concurrent login loops")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    report("bcrypt on the bounded hasher pool", asyncio.run(run(args.logins, args.seconds)), args.seconds)
+
+    # The old behaviour: hashing directly on the event loop
+    async def inline(fn, *a):
+        return fn(*a)
+
+    security.password_hasher._run = inline
+    report("bcrypt inline on the event loop", asyncio.run(run(args.logins, args.seconds)), args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Serialization throughput of listing pages: rows already loaded, timed from
+response objects to JSON bytes.
+
+    full/stdlib   PropertyResponse.model_validate -> jsonable_encoder -> json.dumps
+                  (how /properties/all built its body before)
+    full/fast     PropertyResponse.model_validate -> serialization.dumps
+    card/stdlib   per-field getattr dict -> jsonable_encoder -> json.dumps
+                  (how ?fields=card built its body before)
+    card/fast     field_projection -> serialization.dumps (today's ?fields=card)
+
+Pages are read once from a seeded SQLite database (benchmarks.seed), with
+owner and insight fields set, so the numbers cover serialization only, not
+the queries.
+
+    cd backend && python -m benchmarks.bench_serialization --rows 50 --pages 200
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks import seed as seeding
+
+
+def load_pages(db, n_pages: int, rows: int):
+    """Pages of listings with owner and insight fields set, as /properties/all prepares them."""
+    from sqlalchemy.orm import joinedload
+
+    from app.db.models import Property
+    from app.services.insights import attach_insights
+
+    pages = []
+    cursor = None
+    for _ in range(n_pages):
+        query = db.query(Property).options(joinedload(Property.owner), joinedload(Property.insights)).order_by(Property.id)
+        if cursor is not None:
+            query = query.filter(Property.id > cursor)
+        page = query.limit(rows).all()
+        if not page:
+            break
+        cursor = page[-1].id
+        for p in page:
+            if p.owner:
+                p.owner_name = p.owner.full_name
+                p.owner_is_verified = p.owner.is_verified
+        attach_insights(page)
+        pages.append(page)
+    return pages
+
+
+def paths():
+    from fastapi.encoders import jsonable_encoder
+
+    from app.api.endpoints.properties import CARD_FIELDS, PropertyResponse, field_projection
+    from app.services.serialization import dumps
+
+    def stdlib(content) -> bytes:
+        return json.dumps(jsonable_encoder(content), separators=(",", ":")).encode()
+
+    card_defaults = {f: PropertyResponse.model_fields[f].default for f in CARD_FIELDS}
+    card = field_projection(tuple(CARD_FIELDS))
+
+    def card_dicts(page):
+        return [{f: getattr(p, f, default) for f, default in card_defaults.items()} for p in page]
+
+    def models(page):
+        return [PropertyResponse.model_validate(p, from_attributes=True) for p in page]
+
+    return {
+        "full/stdlib": lambda page: stdlib(models(page)),
+        "full/fast": lambda page: dumps(models(page)),
+        "card/stdlib": lambda page: stdlib(card_dicts(page)),
+        "card/fast": lambda page: dumps(card.many(page)),
+    }
+
+
+def measure(fn, pages, repeat: int) -> dict:
+    total_bytes = total_rows = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            total_bytes += len(fn(page))
+            total_rows += len(page)
+    elapsed = time.perf_counter() - started
+    return {
+        "mb_per_s": total_bytes / elapsed / 1e6,
+        "rows_per_s": total_rows / elapsed,
+        "ms_per_page": elapsed * 1000 / (repeat * len(pages)),
+        "bytes_per_row": total_bytes / max(total_rows, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=list(seeding.SIZES), default="10k")
+    parser.add_argument("--database-url", help="seeded database to reuse (default: a fresh SQLite file)")
+    parser.add_argument("--rows", type=int, default=50, help="listings per page")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write results as JSON")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+
+    from app.main import app  # noqa: F401  (creates tables)
+    from app.db.base import SessionLocal, engine
+    from app.services import serialization
+
+    if not args.database_url:
+        seeding.seed(engine, seeding.SIZES[args.size])
+    with SessionLocal() as db:
+        pages = load_pages(db, args.pages, args.rows)
+    print(f"{len(pages)} pages of {args.rows} listings, encoder: {'orjson' if serialization.orjson else 'json'}")
+
+    results = {}
+    for name, fn in paths().items():
+        fn(pages[0])
+        results[name] = measure(fn, pages, args.repeat)
+
+    print(f"\n{'path':12s} {'MB/s':>8s} {'rows/s':>10s} {'ms/page':>8s} {'B/row':>7s}")
+    for name, r in results.items():
+        print(f"{name:12s} {r['mb_per_s']:8.1f} {r['rows_per_s']:10.0f} {r['ms_per_page']:8.2f} {r['bytes_per_row']:7.0f}")
+    for kind in ("full", "card"):
+        before, after = results[f"{kind}/stdlib"], results[f"{kind}/fast"]
+        print(f"{kind}: {before['ms_per_page'] / after['ms_per_page']:.1f}x faster per page")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"rows": args.rows, "pages": len(pages), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
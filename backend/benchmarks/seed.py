@@ -0,0 +1,205 @@
+"""
+Synthetic users, listings and favorites for benchmarks.
+
+Listings cluster around Indian cities (weighted by size, with a wider
+rural spread for plots and farms) and use each type's usual area units.
+Everything is derived from --seed, so a given size always produces the
+same rows. Rows go in with batched Core inserts, insights included, so
+the same code seeds SQLite or PostgreSQL.
+
+    cd backend && DATABASE_URL=sqlite:///./bench.db python -m benchmarks.seed --size 100k
+"""
+import argparse
+import math
+import random
+import time
+import uuid
+from typing import Dict, Iterator, List
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# Every seeded user logs in with this password
+PASSWORD = "bench-password"
+
+# name, latitude, longitude, weight, price multiplier
+CITIES = [
+    ("Mumbai", 19.0760, 72.8777, 12, 2.6),
+    ("Delhi", 28.6139, 77.2090, 12, 2.0),
+    ("Bengaluru", 12.9716, 77.5946, 10, 1.8),
+    ("Hyderabad", 17.3850, 78.4867, 8, 1.5),
+    ("Chennai", 13.0827, 80.2707, 7, 1.4),
+    ("Kolkata", 22.5726, 88.3639, 7, 1.1),
+    ("Pune", 18.5204, 73.8567, 6, 1.5),
+    ("Ahmedabad", 23.0225, 72.5714, 5, 1.0),
+    ("Jaipur", 26.9124, 75.7873, 4, 0.9),
+    ("Lucknow", 26.8467, 80.9462, 4, 0.8),
+    ("Surat", 21.1702, 72.8311, 3, 0.9),
+    ("Chandigarh", 30.7333, 76.7794, 3, 1.2),
+    ("Kochi", 9.9312, 76.2673, 3, 1.0),
+    ("Indore", 22.7196, 75.8577, 3, 0.8),
+    ("Nagpur", 21.1458, 79.0882, 2, 0.7),
+    ("Bhopal", 23.2599, 77.4126, 2, 0.7),
+    ("Patna", 25.5941, 85.1376, 2, 0.6),
+    ("Guwahati", 26.1445, 91.7362, 2, 0.7),
+    ("Bhubaneswar", 20.2961, 85.8245, 2, 0.7),
+    ("Coimbatore", 11.0168, 76.9558, 2, 0.8),
+    ("Visakhapatnam", 17.6868, 83.2185, 2, 0.8),
+    ("Dehradun", 30.3165, 78.0322, 1, 0.8),
+]
+
+# type -> (weight, [(area unit, min area, max area)], base price in INR)
+TYPES = {
+    "Flat": (40, [("sqft", 450, 2500)], 6_000_000),
+    "House": (20, [("sqft", 900, 5000), ("sqyd", 100, 600)], 12_000_000),
+    "Plot": (20, [("sqyd", 100, 1000), ("sqft", 1000, 9000), ("bigha", 1, 5)], 4_000_000),
+    "Farm": (10, [("acre", 1, 25), ("bigha", 2, 40)], 3_000_000),
+    "Commercial": (10, [("sqft", 300, 10000)], 15_000_000),
+}
+
+FEATURES = ["road facing", "gated society", "near metro", "clear title", "corner plot", "park view"]
+
+# Standard deviation of the distance from the city centre, in km
+CITY_SPREAD_KM = 8.0
+RURAL_SPREAD_KM = 35.0
+
+
+def random_point(rng: random.Random, lat: float, lon: float, spread_km: float):
+    distance = abs(rng.gauss(0, spread_km))
+    bearing = rng.uniform(0, 2 * math.pi)
+    dlat = distance * math.cos(bearing) / 111.0
+    dlon = distance * math.sin(bearing) / (111.0 * math.cos(math.radians(lat)))
+    return round(lat + dlat, 6), round(lon + dlon, 6)
+
+
+def users(n: int, password_hash: str, seed: int = 1) -> Iterator[dict]:
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "email": f"user{i}@bench.example",
+            "full_name": f"Bench User {i}",
+            "is_verified": rng.random() < 0.3,
+            "mobile": f"9{rng.randint(100000000, 999999999)}",
+            "hashed_password": password_hash,
+        }
+
+
+def properties(n: int, owner_ids: List[str], seed: int = 2) -> Iterator[dict]:
+    from app.db.models import VerificationStatus
+
+    rng = random.Random(seed)
+    city_weights = [c[3] for c in CITIES]
+    type_names = list(TYPES)
+    type_weights = [TYPES[t][0] for t in type_names]
+    statuses = [VerificationStatus.APPROVED] * 6 + [VerificationStatus.PENDING] * 3 + [VerificationStatus.REJECTED]
+    for _ in range(n):
+        city, lat, lon, _, multiplier = rng.choices(CITIES, city_weights)[0]
+        ptype = rng.choices(type_names, type_weights)[0]
+        _, units, base_price = TYPES[ptype]
+        unit, low, high = rng.choice(units)
+        area = round(rng.uniform(low, high), 1 if unit in ("acre", "bigha") else 0)
+        spread = RURAL_SPREAD_KM if ptype in ("Plot", "Farm") else CITY_SPREAD_KM
+        latitude, longitude = random_point(rng, lat, lon, spread)
+        price = base_price * multiplier * rng.lognormvariate(0, 0.5)
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "owner_id": rng.choice(owner_ids),
+            "title": f"{ptype} in {city}",
+            "description": f"{area:g} {unit} {ptype.lower()} near {city}, {rng.choice(FEATURES)}",
+            "property_type": ptype,
+            "price_fiat": float(round(price, -3)),
+            "area": area,
+            "area_unit": unit,
+            "latitude": latitude,
+            "longitude": longitude,
+            "mobile": None,
+            "image_urls": [f"https://picsum.photos/seed/{rng.getrandbits(32)}/1200/800"],
+            "status": rng.choice(statuses),
+        }
+
+
+def favorites(user_ids: List[str], property_ids: List[str], per_user: int, seed: int = 3) -> Iterator[dict]:
+    rng = random.Random(seed)
+    for user_id in user_ids:
+        for property_id in rng.sample(property_ids, min(per_user, len(property_ids))):
+            yield {"id": str(uuid.UUID(int=rng.getrandbits(128))), "user_id": user_id, "property_id": property_id}
+
+
+def _batches(rows: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(engine, n_properties: int, n_users: int = 0, favorites_per_user: int = 5,
+         batch_size: int = 5000, seed: int = 7) -> Dict[str, object]:
+    """
+    Inserts the synthetic rows into an empty schema. Returns the counts,
+    the seconds taken and a sample of ids for the load driver.
+    """
+    from app.core.security import pwd_context
+    from app.db.models import Favorite, Property, PropertyInsights, User
+    from app.services.insights import insight_mappings
+    from app.services.listing_events import properties_bulk_changed
+
+    n_users = n_users or max(10, n_properties // 20)
+    started = time.perf_counter()
+    password_hash = pwd_context.hash(PASSWORD)
+
+    user_ids: List[str] = []
+    property_ids: List[str] = []
+    with engine.begin() as conn:
+        for batch in _batches(users(n_users, password_hash, seed), batch_size):
+            conn.execute(User.__table__.insert(), batch)
+            user_ids += [u["id"] for u in batch]
+    for batch in _batches(properties(n_properties, user_ids, seed + 1), batch_size):
+        insights = insight_mappings([
+            (r["id"], r["price_fiat"], r["property_type"], r["latitude"], r["longitude"]) for r in batch
+        ])
+        with engine.begin() as conn:
+            conn.execute(Property.__table__.insert(), batch)
+            conn.execute(PropertyInsights.__table__.insert(), insights)
+        property_ids += [p["id"] for p in batch]
+    n_favorites = 0
+    for batch in _batches(favorites(user_ids, property_ids, favorites_per_user, seed + 2), batch_size):
+        with engine.begin() as conn:
+            conn.execute(Favorite.__table__.insert(), batch)
+        n_favorites += len(batch)
+    properties_bulk_changed()
+
+    rng = random.Random(seed)
+    return {
+        "users": n_users,
+        "properties": n_properties,
+        "favorites": n_favorites,
+        "seconds": time.perf_counter() - started,
+        "user_emails": [f"user{i}@bench.example" for i in rng.sample(range(n_users), min(n_users, 1000))],
+        "property_ids": rng.sample(property_ids, min(n_properties, 10000)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=list(SIZES), default="10k")
+    parser.add_argument("--users", type=int, default=0, help="default: one per 20 listings")
+    parser.add_argument("--favorites-per-user", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    from app.main import app  # noqa: F401  (creates tables, FTS index)
+    from app.db.base import engine
+
+    result = seed(engine, SIZES[args.size], args.users, args.favorites_per_user, seed=args.seed)
+    print(
+        f"seeded {result['users']} users, {result['properties']} listings, {result['favorites']} favorites"
+        f" into {engine.url.render_as_string(hide_password=True)} in {result['seconds']:.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import uuid
+
+import pytest
+
+# Before the app (and its engines) are imported
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ.setdefault("VERIFICATION_EXECUTOR", "threads")
+os.environ.setdefault("IMAGE_WORKERS", "0")
+os.environ.setdefault("LISTINGS_SYNC_SECONDS", "0")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.db.base import engine  # noqa: E402
+from app.db.models import Favorite, Property, PropertyInsights, User  # noqa: E402
+from app.services.insights import insight_mappings  # noqa: E402
+from app.services.listing_events import properties_bulk_changed  # noqa: E402
+from app.services.response_cache import response_cache  # noqa: E402
+
+USER_EMAIL = "owner@test.example"
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def listings():
+    """
+    grow(n) brings the table to n listings around one point, all owned and
+    favorited by USER_EMAIL, and drops the in-process indexes and caches.
+    """
+    with engine.begin() as conn:
+        for table in (Favorite, PropertyInsights, Property, User):
+            conn.execute(table.__table__.delete())
+        user_id = str(uuid.uuid4())
+        conn.execute(User.__table__.insert(), [{
+            "id": user_id, "email": USER_EMAIL, "full_name": "Owner", "hashed_password": "x", "is_verified": True,
+        }])
+    ids = []
+
+    def grow(n: int) -> list:
+        rows = [{
+            "id": str(uuid.uuid4()), "owner_id": user_id, "title": f"Flat {i}", "description": "Flat near the park",
+            "property_type": "Flat", "price_fiat": 4_000_000.0 + i * 10_000, "area": 1000.0 + i, "area_unit": "sqft",
+            "latitude": 26.85 + i * 0.0005, "longitude": 80.95, "image_urls": [], "status": "APPROVED",
+        } for i in range(len(ids), n)]
+        if rows:
+            insights = insight_mappings([
+                (r["id"], r["price_fiat"], r["property_type"], r["latitude"], r["longitude"]) for r in rows
+            ])
+            with engine.begin() as conn:
+                conn.execute(Property.__table__.insert(), rows)
+                conn.execute(PropertyInsights.__table__.insert(), insights)
+                conn.execute(Favorite.__table__.insert(), [
+                    {"id": str(uuid.uuid4()), "user_id": user_id, "property_id": r["id"]} for r in rows
+                ])
+            ids.extend(r["id"] for r in rows)
+        properties_bulk_changed()
+        response_cache.clear()
+        return ids
+
+    return grow
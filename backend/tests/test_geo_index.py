@@ -0,0 +1,107 @@
+"""The geo grid must return exactly what a haversine scan of every listing returns."""
+import math
+import random
+import threading
+
+import pytest
+
+from app.services.geo_index import EARTH_RADIUS_KM, GeoGridIndex, haversine_km
+
+
+def brute_force(points, lat, lon, radius_km):
+    return sorted(pid for pid, (plat, plon) in points.items() if haversine_km(lat, lon, plat, plon) <= radius_km)
+
+
+def build(points, cell_deg=0.05):
+    index = GeoGridIndex(cell_deg=cell_deg)
+    index._loaded = True
+    for pid, (lat, lon) in points.items():
+        index.add(pid, lat, lon)
+    return index
+
+
+def due_north(lat, lon, km):
+    return lat + math.degrees(km / EARTH_RADIUS_KM), lon
+
+
+@pytest.mark.parametrize("radius_km", [1, 5, 10, 3000])
+def test_point_just_inside_due_north_and_south(radius_km):
+    lat, lon = 26.85, 80.95
+    north = due_north(lat, lon, radius_km * 0.9995)
+    south = due_north(lat, lon, -radius_km * 0.9995)
+    index = build({"n": north, "s": south}, cell_deg=0.01)
+    assert sorted(pid for pid, _ in index.nearby(lat, lon, radius_km)) == ["n", "s"]
+
+
+@pytest.mark.parametrize("center,spread,radius_km", [
+    ((26.85, 80.95), 0.5, 10),           # city scale
+    ((0.0, 179.95), 0.5, 30),            # across the antimeridian
+    ((89.7, 10.0), 1.0, 60),             # circle containing the north pole
+    ((-60.0, -70.0), 20.0, 1500),        # high latitude, wide radius
+    ((10.0, 20.0), 60.0, 3000),
+])
+def test_matches_brute_force(center, spread, radius_km):
+    rng = random.Random(f"{center}{radius_km}")
+    points = {}
+    for i in range(3000):
+        lat = max(-90.0, min(90.0, center[0] + rng.uniform(-spread, spread)))
+        lon = (center[1] + rng.uniform(-spread, spread) + 180.0) % 360.0 - 180.0
+        points[str(i)] = (lat, lon)
+    index = build(points, cell_deg=0.05 if spread < 5 else 1.0)
+
+    for _ in range(20):
+        lat, lon = points[str(rng.randrange(len(points)))]
+        hits = index.nearby(lat, lon, radius_km)
+        assert sorted(pid for pid, _ in hits) == brute_force(points, lat, lon, radius_km)
+        distances = [d for _, d in hits]
+        assert distances == sorted(distances)
+
+
+def test_limit_keeps_nearest():
+    points = {str(i): (26.85 + i * 0.001, 80.95) for i in range(50)}
+    index = build(points)
+    assert [pid for pid, _ in index.nearby(26.85, 80.95, 10, limit=3)] == ["0", "1", "2"]
+
+
+def test_add_and_remove():
+    index = build({"a": (26.85, 80.95)})
+    index.add("b", 26.851, 80.95)
+    index.add("a", 30.0, 80.95)  # moved out of range
+    index.remove("b")
+    assert index.nearby(26.85, 80.95, 5) == []
+    assert [pid for pid, _ in index.nearby(30.0, 80.95, 1)] == ["a"]
+
+
+class SlowBuild:
+    """Stands in for a Session whose snapshot query blocks until released."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def query(self, *columns):
+        return self
+
+    def all(self):
+        self.started.set()
+        self.release.wait(5)
+        return self.rows
+
+
+def test_create_during_build_is_kept():
+    index = GeoGridIndex()
+    db = SlowBuild([("old", 26.85, 80.95)])
+    build_thread = threading.Thread(target=index.ensure_loaded, args=(db,))
+    build_thread.start()
+    assert db.started.wait(5)
+
+    # Committed after the build's snapshot, announced before the build finishes
+    add_thread = threading.Thread(target=index.add, args=("new", 26.851, 80.95))
+    add_thread.start()
+    add_thread.join(0.1)
+    db.release.set()
+    build_thread.join(5)
+    add_thread.join(5)
+
+    assert sorted(pid for pid, _ in index.nearby(26.85, 80.95, 1)) == ["new", "old"]
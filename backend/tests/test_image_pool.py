@@ -0,0 +1,29 @@
+"""A job that kills its image worker fails; it is never rerun in the API process."""
+import asyncio
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.services import image_pool
+from app.services.image_pool import ImageWorkerCrashed, run_image_job, run_image_job_sync
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_WORKERS", 1)
+    yield
+    image_pool.shutdown_image_pool()
+
+
+def test_crash_fails_the_job_and_recycles_the_pool(pool):
+    with pytest.raises(ImageWorkerCrashed):
+        run_image_job_sync(os._exit, 1)  # would end this process if run inline
+    assert image_pool._pool is None
+    assert run_image_job_sync(abs, -3) == 3
+
+
+def test_crash_fails_the_async_job(pool):
+    with pytest.raises(ImageWorkerCrashed):
+        asyncio.run(run_image_job(os._exit, 1))
+    assert asyncio.run(run_image_job(abs, -3)) == 3
@@ -0,0 +1,86 @@
+"""Listing writes made by another process reach this one's indexes through the change log."""
+import time
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.db.base import engine
+from app.db.models import ListingChange, Property
+from app.services import listing_events
+from app.services.geo_index import geo_index
+
+NEARBY = "/properties/nearby?lat=26.85&long=80.95&radius_km=10"
+
+
+@pytest.fixture
+def sync(monkeypatch, listings):
+    """Turns the replay on; calling the result makes the next request sync."""
+    listings(5)
+    with engine.begin() as conn:
+        conn.execute(ListingChange.__table__.delete())
+    monkeypatch.setattr(settings, "LISTINGS_SYNC_SECONDS", 3600.0)
+    monkeypatch.setattr(listing_events, "_last_seq", None)
+    monkeypatch.setattr(listing_events, "_gaps", {})
+
+    def due():
+        listing_events._next_sync = 0.0
+
+    due()
+    return due
+
+
+def outside_write(kind, prop_id, lat=26.86, lon=80.95, origin="other-process"):
+    with engine.begin() as conn:
+        if kind == "created":
+            row = conn.execute(Property.__table__.select().limit(1)).mappings().first()
+            conn.execute(Property.__table__.insert(), [{**row, "id": prop_id, "latitude": lat, "longitude": lon}])
+        else:
+            conn.execute(Property.__table__.delete().where(Property.id == prop_id))
+        conn.execute(ListingChange.__table__.insert(), [{
+            "kind": kind, "property_id": prop_id, "latitude": lat, "longitude": lon,
+            "origin": origin, "created_at": time.time(),
+        }])
+
+
+def nearby_ids(client):
+    r = client.get(NEARBY)
+    assert r.status_code == 200, r.text
+    return {p["id"] for p in r.json()}
+
+
+def test_outside_create_and_delete_are_replayed(client, sync, monkeypatch):
+    assert len(nearby_ids(client)) == 5
+    resets = []
+    monkeypatch.setattr(geo_index, "reset", lambda: resets.append(1))
+
+    new_id = str(uuid.uuid4())
+    outside_write("created", new_id)
+    assert new_id not in nearby_ids(client)  # not due yet
+    sync()
+    assert new_id in nearby_ids(client)
+
+    outside_write("deleted", new_id)
+    sync()
+    assert new_id not in nearby_ids(client)
+    assert resets == []  # applied incrementally, no rebuild
+
+
+def test_own_entries_are_skipped(client, sync, monkeypatch):
+    nearby_ids(client)
+    replayed = []
+    monkeypatch.setattr(listing_events, "_created", [lambda prop: replayed.append(prop.id)])
+    outside_write("created", str(uuid.uuid4()), origin=listing_events.PROCESS_ID)
+    sync()
+    nearby_ids(client)
+    assert replayed == []
+
+
+def test_too_many_changes_rebuild(client, sync, monkeypatch):
+    nearby_ids(client)
+    monkeypatch.setattr(listing_events, "MAX_REPLAYED_CHANGES", 2)
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+    for prop_id in ids:
+        outside_write("created", prop_id)
+    sync()
+    assert set(ids) <= nearby_ids(client)
@@ -0,0 +1,91 @@
+"""OTP stores: single use, TTL and lockout after too many wrong codes."""
+import time
+
+import pytest
+
+from app.db.base import SessionLocal, engine
+from app.db.models import OTPCode
+from app.services.otp_store import DatabaseOTPStore, MemoryOTPStore, OTPResult
+
+KEY = "123412341234"
+
+
+@pytest.fixture(params=["memory", "database"])
+def make_store(request):
+    with engine.begin() as conn:
+        conn.execute(OTPCode.__table__.delete())
+    cls = MemoryOTPStore if request.param == "memory" else DatabaseOTPStore
+
+    def make(ttl=300.0, max_attempts=3, max_entries=100):
+        return cls(ttl, max_attempts, max_entries)
+
+    return make
+
+
+def test_correct_code_is_consumed(make_store):
+    store = make_store()
+    store.put(KEY, "111111")
+    assert store.verify(KEY, "111111") == OTPResult.OK
+    assert store.verify(KEY, "111111") == OTPResult.MISSING
+
+
+def test_never_sent(make_store):
+    assert make_store().verify(KEY, "111111") == OTPResult.MISSING
+
+
+def test_expires_after_ttl(make_store):
+    store = make_store(ttl=0.05)
+    store.put(KEY, "111111")
+    time.sleep(0.1)
+    assert store.verify(KEY, "111111") == OTPResult.MISSING
+
+
+def test_locked_after_max_attempts(make_store):
+    store = make_store(max_attempts=3)
+    store.put(KEY, "111111")
+    assert store.verify(KEY, "000000") == OTPResult.MISMATCH
+    assert store.verify(KEY, "000000") == OTPResult.MISMATCH
+    assert store.verify(KEY, "000000") == OTPResult.LOCKED
+    # The code is gone; even the right one needs a new OTP
+    assert store.verify(KEY, "111111") == OTPResult.MISSING
+
+
+def test_resend_replaces_code_and_resets_attempts(make_store):
+    store = make_store(max_attempts=3)
+    store.put(KEY, "111111")
+    store.verify(KEY, "000000")
+    store.verify(KEY, "000000")
+    store.put(KEY, "222222")
+    assert store.verify(KEY, "111111") == OTPResult.MISMATCH
+    assert store.verify(KEY, "000000") == OTPResult.MISMATCH
+    assert store.verify(KEY, "222222") == OTPResult.OK
+
+
+def test_keys_are_independent(make_store):
+    store = make_store()
+    store.put(KEY, "111111")
+    store.put("999999999999", "222222")
+    assert store.verify(KEY, "222222") == OTPResult.MISMATCH
+    assert store.verify("999999999999", "222222") == OTPResult.OK
+    assert store.verify(KEY, "111111") == OTPResult.OK
+
+
+def test_memory_store_is_bounded():
+    store = MemoryOTPStore(300.0, 3, max_entries=2)
+    for i in range(3):
+        store.put(f"key-{i}", "111111")
+    assert len(store) == 2
+    assert store.verify("key-0", "111111") == OTPResult.MISSING  # oldest dropped
+    assert store.verify("key-2", "111111") == OTPResult.OK
+
+
+def test_database_store_sweeps_expired_rows():
+    with engine.begin() as conn:
+        conn.execute(OTPCode.__table__.delete())
+    store = DatabaseOTPStore(0.05, 3, 100)
+    for i in range(5):
+        store.put(f"key-{i}", "111111")
+    time.sleep(0.1)
+    store.put(KEY, "111111")
+    with SessionLocal() as db:
+        assert db.query(OTPCode).count() == 1
@@ -0,0 +1,42 @@
+"""List endpoints must not issue a query per row (N+1)."""
+import pytest
+
+from app.db.query_counter import assert_constant_queries
+
+from .conftest import USER_EMAIL
+
+SIZES = (5, 25)
+
+
+@pytest.mark.parametrize("path", [
+    "/properties/all",
+    "/properties/all?limit=50&fields=card",
+    "/properties/nearby?lat=26.85&long=80.95&radius_km=10",
+    "/favorites/list?user_email=" + USER_EMAIL,
+])
+def test_list_queries_constant(client, listings, path):
+    def call():
+        r = client.get(path)
+        assert r.status_code == 200, r.text
+        assert len(r.json()) == len(ids)
+
+    ids = []
+
+    def grow(n):
+        ids[:] = listings(n)
+
+    assert_constant_queries(call, grow, SIZES)
+
+
+def test_similar_queries_constant(client, listings):
+    ids = []
+
+    def call():
+        r = client.get(f"/properties/{ids[0]}/similar?limit=3")
+        assert r.status_code == 200, r.text
+        assert len(r.json()) == 3
+
+    def grow(n):
+        ids[:] = listings(n)
+
+    assert_constant_queries(call, grow, SIZES)
@@ -0,0 +1,71 @@
+"""Cached GET responses: ETags, 304s and tag-based invalidation."""
+from app.services.response_cache import response_cache
+
+from .conftest import USER_EMAIL
+
+
+def test_etag_survives_a_rebuild(client, listings):
+    listings(5)
+    first = client.get("/properties/all")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    # Another worker, or this one after the TTL, builds the body again
+    response_cache.clear()
+    again = client.get("/properties/all", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+
+
+def cached(client, path, **headers):
+    """(response, served from the cache?)"""
+    hits = response_cache.hits
+    r = client.get(path, headers=headers)
+    return r, response_cache.hits > hits
+
+
+def test_if_none_match(client, listings):
+    listings(3)
+    r, hit = cached(client, "/properties/all")
+    assert r.status_code == 200 and not hit
+    etag = r.headers["ETag"]
+
+    r, hit = cached(client, "/properties/all", **{"If-None-Match": etag})
+    assert r.status_code == 304 and hit
+    assert r.content == b""
+    for header in (f"W/{etag}", f'"nope", {etag}', "*"):
+        assert client.get("/properties/all", headers={"If-None-Match": header}).status_code == 304
+    assert client.get("/properties/all", headers={"If-None-Match": '"nope"'}).status_code == 200
+
+
+def test_favorites_write_invalidates_only_that_list(client, listings):
+    ids = listings(3)
+    favorites = "/favorites/list?user_email=" + USER_EMAIL
+    for path in ("/properties/all", f"/properties/{ids[0]}", favorites):
+        cached(client, path)
+
+    r = client.delete(f"/favorites/remove/{ids[1]}", params={"user_email": USER_EMAIL})
+    assert r.status_code == 200, r.text
+
+    r, hit = cached(client, favorites)
+    assert not hit and ids[1] not in {p["id"] for p in r.json()}
+    assert cached(client, "/properties/all")[1]
+    assert cached(client, f"/properties/{ids[0]}")[1]
+
+
+def test_delete_invalidates_lists_and_the_listing(client, listings):
+    ids = listings(3)
+    favorites = "/favorites/list?user_email=" + USER_EMAIL
+    for path in ("/properties/all", f"/properties/{ids[0]}", f"/properties/{ids[1]}", favorites):
+        cached(client, path)
+
+    r = client.delete(f"/properties/{ids[1]}", params={"user_email": USER_EMAIL})
+    assert r.status_code == 200, r.text
+
+    r, hit = cached(client, "/properties/all")
+    assert not hit and ids[1] not in {p["id"] for p in r.json()}
+    r, hit = cached(client, favorites)
+    assert not hit and ids[1] not in {p["id"] for p in r.json()}
+    assert cached(client, f"/properties/{ids[1]}")[0].status_code == 404
+    # Other listings' own pages are unaffected
+    assert cached(client, f"/properties/{ids[0]}")[1]
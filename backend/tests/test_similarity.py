@@ -0,0 +1,92 @@
+"""Neighbour lists stay exact (equal to a brute-force scan) through adds and removes."""
+import random
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.similarity import SimilarityIndex
+
+TYPES = ["Flat", "House", "Plot", "Commercial", None]
+CITIES = [(26.85, 80.95), (28.61, 77.21), (19.07, 72.87)]
+
+
+class Rows:
+    """Stands in for the Session ensure_loaded reads the listings through."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def query(self, *columns):
+        return self
+
+    def filter(self, *criteria):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+def listing(rng, prop_id):
+    lat, lon = rng.choice(CITIES)
+    return SimpleNamespace(
+        id=prop_id, price_fiat=rng.choice([None, rng.uniform(1e6, 5e7)]),
+        area=rng.uniform(300, 5000), area_unit=rng.choice(["sqft", "sqyd", "bigha", None]),
+        latitude=lat + rng.gauss(0, 0.05), longitude=lon + rng.gauss(0, 0.05), property_type=rng.choice(TYPES),
+    )
+
+
+def as_row(p):
+    return (p.id, p.price_fiat, p.area, p.area_unit, p.latitude, p.longitude, p.property_type)
+
+
+def assert_exact(index):
+    rows = np.array(sorted(index._rows.values()))
+    features = index._features[rows]
+    for position, row in enumerate(rows):
+        d = np.sqrt(((features - features[position]) ** 2).sum(axis=1))
+        d[position] = np.inf
+        expected = np.sort(d)[:index.k]
+        got = index._nbr_dist[row][:len(expected)]
+        assert np.allclose(got, expected), index._ids[row]
+        assert all(index._alive[n] for n in index._nbr[row] if n >= 0)
+
+
+def build(n, seed=7, k=5):
+    rng = random.Random(seed)
+    props = [listing(rng, f"p{i}") for i in range(n)]
+    index = SimilarityIndex(k=k, cell_deg=0.02)
+    index.ensure_loaded(Rows([as_row(p) for p in props]))
+    return rng, props, index
+
+
+def test_build_is_exact():
+    _, _, index = build(400)
+    assert len(index) == 400
+    assert_exact(index)
+
+
+def test_exact_after_adds_and_removes():
+    rng, props, index = build(300)
+    for i in range(60):
+        index.add(listing(rng, f"new{i}"))
+    removed = rng.sample([p.id for p in props[1:]], 80)
+    for prop_id in removed:
+        index.remove(prop_id)
+    # Re-adding a live id moves the listing rather than duplicating it
+    index.add(listing(rng, props[0].id))
+
+    assert len(index) == 300 + 60 - 80
+    assert_exact(index)
+    for prop_id in removed:
+        assert index.similar(prop_id, 5) == []
+    for prop_id in list(index._rows)[:50]:
+        assert not {other for other, _ in index.similar(prop_id, 5)} & set(removed)
+
+
+def test_similar_is_nearest_first_and_limited():
+    _, props, index = build(200)
+    hits = index.similar(props[3].id, 3)
+    assert len(hits) == 3
+    assert props[3].id not in [h[0] for h in hits]
+    assert [d for _, d in hits] == sorted(d for _, d in hits)
+    assert index.similar("unknown", 3) == []
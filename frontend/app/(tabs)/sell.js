@@ -127,13 +127,15 @@ export default function SellScreen() {
                 });
 
                 // Note: using /verification/ocr as per backend structure
-                const res = await API.post('/verification/ocr', formData, {
+                // The scan runs as a job; wait up to 15s for its result
+                const res = await API.post('/verification/ocr?wait=15', formData, {
                     headers: { 'Content-Type': 'multipart/form-data' }
                 });
 
-                if (res.data && res.data.id_number) {
-                    setAadhaarNumber(res.data.id_number);
-                    Alert.alert("Scan Success", `Detected Aadhaar: ${res.data.id_number}`);
+                const scan = res.data && res.data.result;
+                if (scan && scan.id_number) {
+                    setAadhaarNumber(scan.id_number);
+                    Alert.alert("Scan Success", `Detected Aadhaar: ${scan.id_number}`);
                 }
             } catch (e) {
                 console.log(e);